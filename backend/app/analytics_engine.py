@@ -0,0 +1,504 @@
+# backend/app/analytics_engine.py
+"""
+Optional columnar engine for analytical queries over long transaction histories.
+
+Each tenant's transactions are mirrored into a Parquet snapshot under
+ANALYTICS_SNAPSHOT_DIR/<tenant> (id, date, month index, dictionary-encoded category,
+amount). Refreshes are incremental: transactions only ever get appended (ids grow) or
+cleared, so a refresh appends one part file with the rows past the last exported id,
+and rebuilds from scratch only if rows below it disappeared. Clearing a tenant drops
+its snapshot outright (clear_snapshot), since SQLite reuses ids once the table is
+empty and a re-upload of as many rows would pass the row count. The snapshot records
+the tenant's data version (data_version.py) it was taken at, and is refreshed on
+read whenever that moved, at most every ANALYTICS_REFRESH_SECONDS.
+
+Several API workers share the snapshot directory, so it is guarded with file locks
+(flock) as well as in-process ones: refreshes take refresh.lock exclusively, one at a
+time; queries hold read.lock shared from reading the manifest until the scan is done.
+Part files dropped by a rebuild are only deleted once read.lock can be taken
+exclusively, i.e. no query is still reading the old manifest; until then they are
+listed under "stale" in the manifest and retried on the next refresh.
+
+Scans and grouping run in DuckDB when it is installed, otherwise in pyarrow compute
+(ANALYTICS_ENGINE=auto|duckdb|arrow). Engines only return monthly per-category totals
+and amount percentiles; rolling averages and month-over-month deltas are computed
+from that small result in Python.
+
+    python -m backend.app.analytics_engine                   # export / update the snapshot now
+    python -m backend.app.analytics_engine --rebuild         # re-export from scratch
+    python -m backend.app.analytics_engine --tenant acme     # another tenant's snapshot
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # not POSIX: in-process locking only
+    fcntl = None
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from backend.app.data_version import read_data_version
+from backend.app.tenancy import DEFAULT_TENANT, validate_tenant
+
+ANALYTICS_ENGINE = os.getenv("ANALYTICS_ENGINE", "auto")
+ANALYTICS_SNAPSHOT_DIR = os.getenv("ANALYTICS_SNAPSHOT_DIR", "backend/data/analytics")
+ANALYTICS_REFRESH_SECONDS = float(os.getenv("ANALYTICS_REFRESH_SECONDS", "0"))
+EXPORT_BATCH_ROWS = 200_000
+# Incremental refreshes add one part file each; past this many the snapshot is re-exported
+MAX_SNAPSHOT_PARTS = 32
+ROLLING_MONTHS = 3
+PERCENTILES = (0.5, 0.9, 0.99)
+MISSING_CATEGORY = "Uncategorized"
+MANIFEST = "manifest.json"
+REFRESH_LOCK = "refresh.lock"
+READ_LOCK = "read.lock"
+
+# One refresh at a time per tenant; different tenants refresh in parallel
+_refresh_locks = {}
+# Queries in flight per tenant in this process
+_readers = {}
+_locks_guard = threading.Lock()
+
+
+class AnalyticsUnavailable(RuntimeError):
+    """Neither DuckDB nor pyarrow is installed."""
+
+
+def engine_name() -> str:
+    wanted = ANALYTICS_ENGINE
+    if wanted in ("auto", "duckdb"):
+        try:
+            import duckdb  # noqa: F401
+            return "duckdb"
+        except ImportError:
+            if wanted == "duckdb":
+                raise AnalyticsUnavailable("ANALYTICS_ENGINE=duckdb but duckdb is not installed")
+    try:
+        import pyarrow.dataset  # noqa: F401
+        return "arrow"
+    except ImportError:
+        raise AnalyticsUnavailable("The analytics engine needs duckdb or pyarrow installed")
+
+
+# --- snapshot ---------------------------------------------------------------
+
+def snapshot_dir(tenant_id: str) -> str:
+    # Tenant ids are validated to be safe directory names
+    return os.path.join(ANALYTICS_SNAPSHOT_DIR, validate_tenant(tenant_id))
+
+
+def _refresh_lock(tenant_id: str):
+    with _locks_guard:
+        return _refresh_locks.setdefault(tenant_id, threading.Lock())
+
+
+@contextmanager
+def _file_lock(directory: str, name: str, shared: bool = False, blocking: bool = True):
+    """
+    flock() on directory/name across processes. Yields whether the lock was taken
+    (always True when blocking; True without locking anything where flock is unavailable).
+    """
+    if fcntl is None:
+        yield True
+        return
+    with open(os.path.join(directory, name), "a") as fh:
+        flags = (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | (0 if blocking else fcntl.LOCK_NB)
+        try:
+            fcntl.flock(fh, flags)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+@contextmanager
+def reading_snapshot(tenant_id: str = DEFAULT_TENANT):
+    """
+    Hold the tenant's snapshot steady: yields the manifest (None if there is no
+    snapshot yet), and no part file it lists is deleted until the block exits.
+    """
+    directory = snapshot_dir(tenant_id)
+    os.makedirs(directory, exist_ok=True)
+    with _locks_guard:
+        _readers[tenant_id] = _readers.get(tenant_id, 0) + 1
+    try:
+        with _file_lock(directory, READ_LOCK, shared=True):
+            yield _read_manifest(directory)
+    finally:
+        with _locks_guard:
+            _readers[tenant_id] -= 1
+
+
+def _remove_stale(directory: str, tenant_id: str, stale) -> list:
+    """
+    Delete part files no manifest lists any more if no query (in any process) can
+    still be reading them. Returns the ones left for a later attempt.
+    """
+    if not stale:
+        return []
+    with _locks_guard:
+        busy = _readers.get(tenant_id, 0) > 0
+    if busy:
+        return list(stale)
+    with _file_lock(directory, READ_LOCK, blocking=False) as idle:
+        if not idle:
+            return list(stale)
+        for name in stale:
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+    return []
+
+
+def _read_manifest(directory: str):
+    path = os.path.join(directory, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def _write_manifest(directory: str, manifest):
+    path = os.path.join(directory, MANIFEST)
+    tmp = f"{path}.{uuid.uuid4().hex}"
+    with open(tmp, "w") as fh:
+        json.dump(manifest, fh)
+    os.replace(tmp, path)
+
+
+def _export_part(db: Session, directory: str, tenant_id: str, after_id: int):
+    """
+    Write the tenant's transactions with id > after_id to a new Parquet part in directory.
+    Returns (file, rows, last_id).
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id", pa.int64()), ("date", pa.date32()), ("month", pa.int32()),
+        ("category", pa.dictionary(pa.int32(), pa.string())), ("amount", pa.float64()),
+    ])
+    name = f"part-{uuid.uuid4().hex}.parquet"
+    path = os.path.join(directory, name)
+    # Untyped textual query: no ORM objects, and dates stay strings for Arrow to cast in bulk.
+    # (tenant_id, id) index: a range scan over this tenant's new rows only
+    result = db.execute(
+        text("SELECT id, date, category, amount FROM transactions WHERE tenant_id = :tenant AND id > :after ORDER BY id"),
+        {"tenant": tenant_id, "after": after_id},
+    )
+    rows, last_id = 0, after_id
+    with pq.ParquetWriter(path, schema) as writer:
+        while True:
+            batch = result.fetchmany(EXPORT_BATCH_ROWS)
+            if not batch:
+                break
+            ids, dates, categories, amounts = zip(*batch)
+            dates = pa.array([str(d) if d is not None else None for d in dates], pa.string()).cast(pa.date32())
+            # year * 12 + month - 1, so queries group on one int column instead of extracting parts
+            months = pc.subtract(pc.add(pc.multiply(pc.year(dates), 12), pc.month(dates)), 1).cast(pa.int32())
+            writer.write_table(pa.table([
+                pa.array(ids, pa.int64()), dates, months,
+                pc.dictionary_encode(pa.array(categories, pa.string())).cast(schema.field("category").type),
+                pa.array(amounts, pa.float64()),
+            ], schema=schema))
+            rows += len(batch)
+            last_id = ids[-1]
+    if not rows:
+        os.remove(path)
+        return None, 0, after_id
+    return name, rows, last_id
+
+
+def refresh_snapshot(db: Session, force: bool = False, tenant_id: str = DEFAULT_TENANT) -> dict:
+    """
+    Bring the tenant's Parquet snapshot up to its current data version. Returns the manifest.
+    """
+    directory = snapshot_dir(tenant_id)
+    os.makedirs(directory, exist_ok=True)
+    with _refresh_lock(tenant_id), _file_lock(directory, REFRESH_LOCK):
+        manifest = _read_manifest(directory)
+        version = read_data_version(db, tenant_id)
+        if manifest and manifest["data_version"] == version and not force:
+            return manifest
+        if manifest and not force and time.time() - manifest["refreshed_at"] < ANALYTICS_REFRESH_SECONDS:
+            return manifest
+
+        # Anything deleted below the last exported id means the snapshot must be rebuilt
+        rebuild = force or manifest is None or len(manifest["files"]) >= MAX_SNAPSHOT_PARTS
+        if not rebuild:
+            still_there = db.execute(
+                text("SELECT COUNT(*) FROM transactions WHERE tenant_id = :tenant AND id <= :last"),
+                {"tenant": tenant_id, "last": manifest["last_id"]},
+            ).scalar()
+            rebuild = still_there != manifest["rows"]
+        stale = manifest.get("stale", []) if manifest else []
+        if rebuild:
+            stale += manifest["files"] if manifest else []
+            manifest = _empty_manifest()
+
+        name, rows, last_id = _export_part(db, directory, tenant_id, manifest["last_id"])
+        if name:
+            manifest["files"].append(name)
+            manifest["rows"] += rows
+            manifest["last_id"] = last_id
+        manifest["data_version"] = version
+        manifest["refreshed_at"] = time.time()
+        # Queries that start from here on see the new manifest; older ones may still
+        # be scanning the parts it dropped
+        _replace_manifest(directory, tenant_id, manifest, stale)
+        return manifest
+
+
+def clear_snapshot(tenant_id: str = DEFAULT_TENANT) -> None:
+    """
+    Drop the tenant's snapshot after its transactions were cleared; call once the
+    clear has committed. The next read re-exports whatever rows exist by then.
+    """
+    directory = snapshot_dir(tenant_id)
+    if not os.path.isdir(directory):
+        return
+    with _refresh_lock(tenant_id), _file_lock(directory, REFRESH_LOCK):
+        manifest = _read_manifest(directory)
+        if manifest is None:
+            return
+        # Version 0 and refreshed_at 0: never current, never inside the refresh throttle
+        empty = {**_empty_manifest(), "data_version": 0, "refreshed_at": 0}
+        _replace_manifest(directory, tenant_id, empty, manifest.get("stale", []) + manifest["files"])
+
+
+def _empty_manifest():
+    return {"files": [], "rows": 0, "last_id": 0}
+
+
+def _replace_manifest(directory: str, tenant_id: str, manifest, stale):
+    manifest["stale"] = stale
+    _write_manifest(directory, manifest)
+    remaining = _remove_stale(directory, tenant_id, stale)
+    if remaining != stale:
+        manifest["stale"] = remaining
+        _write_manifest(directory, manifest)
+
+
+# --- engines ----------------------------------------------------------------
+
+def _duckdb_where(filters):
+    clauses, params = [], []
+    if filters is not None:
+        if filters.date_from is not None:
+            clauses.append("date >= ?")
+            params.append(filters.date_from)
+        if filters.date_to is not None:
+            clauses.append("date <= ?")
+            params.append(filters.date_to)
+        if filters.category is not None:
+            clauses.append("category = ?")
+            params.append(filters.category)
+    return (" AND ".join(clauses) or "TRUE"), params
+
+
+def _duckdb_query(files, filters, percentiles):
+    import duckdb
+
+    where, params = _duckdb_where(filters)
+    source = "read_parquet([" + ", ".join("'" + f.replace("'", "''") + "'" for f in files) + "])"
+    con = duckdb.connect()
+    try:
+        monthly = con.execute(
+            f"""SELECT coalesce(category, ?) AS category, month, sum(amount)
+                FROM {source} WHERE month IS NOT NULL AND {where} GROUP BY 1, 2""",
+            [MISSING_CATEGORY, *params],
+        ).fetchall()
+        qs = list(percentiles)
+        overall = con.execute(
+            f"SELECT quantile_cont(amount, ?), count(*) FROM {source} WHERE {where}", [qs, *params]
+        ).fetchone()
+        by_category = con.execute(
+            f"""SELECT coalesce(category, ?), quantile_cont(amount, ?), count(*)
+                FROM {source} WHERE {where} GROUP BY 1""",
+            [MISSING_CATEGORY, qs, *params],
+        ).fetchall()
+    finally:
+        con.close()
+    return (
+        [(c, int(m), float(t)) for c, m, t in monthly],
+        (overall[0] if overall[1] else None, overall[1]),
+        [(c, q, n) for c, q, n in by_category],
+    )
+
+
+def _arrow_query(files, filters, percentiles):
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    expr = None
+    if filters is not None:
+        for part in (
+            ds.field("date") >= pa.scalar(filters.date_from, pa.date32()) if filters.date_from is not None else None,
+            ds.field("date") <= pa.scalar(filters.date_to, pa.date32()) if filters.date_to is not None else None,
+            ds.field("category") == filters.category if filters.category is not None else None,
+        ):
+            if part is not None:
+                expr = part if expr is None else expr & part
+    # Reading category as a dictionary keeps it as int codes; strings are never materialized
+    fmt = ds.ParquetFileFormat(read_options=ds.ParquetReadOptions(dictionary_columns=["category"]))
+    table = ds.dataset(files, format=fmt).to_table(columns=["month", "category", "amount"], filter=expr)
+    table = table.unify_dictionaries()
+
+    grouped = table.group_by(["category", "month"]).aggregate([("amount", "sum")])
+    # NULL and a literal "Uncategorized" are one group, as with coalesce() in DuckDB
+    merged = {}
+    for c, m, t in zip(*(grouped[col].to_pylist() for col in ("category", "month", "amount_sum"))):
+        if m is not None:
+            key = (c if c is not None else MISSING_CATEGORY, m)
+            merged[key] = merged.get(key, 0.0) + t
+    monthly = [(c, m, t) for (c, m), t in merged.items()]
+
+    if not table.num_rows:
+        return monthly, (None, 0), []
+    qs = list(percentiles)
+    amounts = table["amount"].to_numpy()
+    category = table["category"].combine_chunks()
+    names = category.dictionary.to_pylist()
+    if MISSING_CATEGORY not in names:
+        names.append(MISSING_CATEGORY)
+    codes = category.indices.fill_null(names.index(MISSING_CATEGORY)).to_numpy(zero_copy_only=False).astype(np.int64)
+
+    # One float sort orders rows by (category, amount): offset each category into its own
+    # band wider than the amount range, then slice the bands apart by their counts
+    low = amounts.min()
+    span = amounts.max() - low + 1.0
+    banded = np.sort(codes * span + (amounts - low))
+    counts = np.bincount(codes, minlength=len(names))
+    by_category, start = [], 0
+    for code, count in enumerate(counts):
+        if count:
+            band = banded[start:start + count] - (code * span - low)
+            by_category.append((names[code], _sorted_quantiles(band, qs), int(count)))
+        start += count
+    return monthly, (np.quantile(amounts, qs).tolist(), len(amounts)), by_category
+
+
+def _sorted_quantiles(values, qs):
+    """
+    Linear-interpolation quantiles of an already sorted array (numpy's default method,
+    DuckDB's quantile_cont).
+    """
+    last = len(values) - 1
+    out = []
+    for q in qs:
+        pos = q * last
+        lo = int(pos)
+        hi = min(lo + 1, last)
+        out.append(float(values[lo] + (values[hi] - values[lo]) * (pos - lo)))
+    return out
+
+
+# --- trends -----------------------------------------------------------------
+
+def _rolling(monthly, window: int):
+    """
+    monthly holds (category, year * 12 + month - 1, total). Per category, on a dense
+    month grid (missing months count as 0): total, window-month rolling average, and
+    month-over-month delta / percentage.
+    """
+    if not monthly:
+        return []
+    first = min(month for _, month, _ in monthly)
+    last = max(month for _, month, _ in monthly)
+    totals = {}
+    for category, month, total in monthly:
+        totals.setdefault(category, {})[month] = total
+
+    rows = []
+    for category in sorted(totals):
+        series = [totals[category].get(i, 0.0) for i in range(first, last + 1)]
+        for offset, total in enumerate(series):
+            recent = series[max(0, offset - window + 1):offset + 1]
+            previous = series[offset - 1] if offset else None
+            delta = total - previous if previous is not None else None
+            index = first + offset
+            rows.append({
+                "category": category,
+                "month": f"{index // 12}-{index % 12 + 1:02d}",
+                "total": round(total, 2),
+                "rolling_avg": round(sum(recent) / len(recent), 2),
+                "mom_delta": round(delta, 2) if delta is not None else None,
+                "mom_pct": round(delta / previous * 100, 1) if previous else None,
+            })
+    return rows
+
+
+def _percentile_dict(values, percentiles):
+    if values is None:
+        return None
+    return {f"p{round(q * 100):g}": round(float(v), 2) for q, v in zip(percentiles, values)}
+
+
+def trends(db: Session, filters=None, window: int = ROLLING_MONTHS, percentiles=PERCENTILES,
+           tenant_id: str = DEFAULT_TENANT) -> dict:
+    engine = engine_name()
+    refresh_snapshot(db, tenant_id=tenant_id)
+    directory = snapshot_dir(tenant_id)
+    # Re-read under the read lock: another refresh may have replaced it meanwhile
+    with reading_snapshot(tenant_id) as manifest:
+        files = [os.path.join(directory, name) for name in manifest["files"]]
+        start = time.perf_counter()
+        if not files:
+            monthly, overall, by_category = [], (None, 0), []
+        elif engine == "duckdb":
+            monthly, overall, by_category = _duckdb_query(files, filters, percentiles)
+        else:
+            monthly, overall, by_category = _arrow_query(files, filters, percentiles)
+
+    return {
+        "engine": engine,
+        "snapshot_rows": manifest["rows"],
+        "data_version": manifest["data_version"],
+        "query_ms": round((time.perf_counter() - start) * 1000, 1),
+        "window_months": window,
+        "monthly": _rolling(monthly, window),
+        "amount_percentiles": {
+            "overall": _percentile_dict(overall[0], percentiles),
+            "transactions": overall[1],
+            "by_category": {
+                category: {"transactions": n, **(_percentile_dict(values, percentiles) or {})}
+                for category, values, n in sorted(by_category, key=lambda item: item[0])
+            },
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rebuild", action="store_true", help="re-export the snapshot from scratch")
+    parser.add_argument("--tenant", default=DEFAULT_TENANT)
+    args = parser.parse_args()
+
+    from backend.app.db import SessionLocal, init_db
+
+    init_db()
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        manifest = refresh_snapshot(db, force=args.rebuild, tenant_id=args.tenant)
+        print(json.dumps({**manifest, "seconds": round(time.perf_counter() - start, 3)}, indent=2))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,42 @@
 # backend/app/api/budgets.py
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
-from datetime import datetime
-import io, csv
-from rapidfuzz import process, fuzz
-import pandas as pd
-from typing import List
-from pydantic import BaseModel
-
-from backend.app.db import SessionLocal, engine, Base, get_db  # get_db if present else we provide below
+from sqlalchemy import tuple_
+from datetime import date
+import re
+from typing import List, Optional
+
+from backend.app.db import SessionLocal, get_db, get_read_db, init_db, run_read  # get_db if present else we provide below
+from backend.app.data_version import bump_data_version
+from backend.app.response_cache import cached_read
 from backend.app.models.budget_model import Budget
+from backend.app.models.budget_store import delete_budgets, replace_budgets, upsert_budgets
 from backend.app.models.transaction_model import Transaction
-from backend.app.schemas import BudgetCreate, BudgetOut, TransactionIn as TransactionSchema
+from backend.app.schemas import BudgetCreate, BudgetOut, SpendFilters
 from backend.app.models.category_model import classify_transactions
-import pandas as pd
-from datetime import datetime
-from io import StringIO
-
-# Ensure tables exist
-Base.metadata.create_all(bind=engine)
-
+from backend.app.ingest import CSVFormatError, ingest_csv
+from backend.app.dedupe import DuplicateFileError, check_new_file, clear_files, file_digest, record_file
+from backend.app.budget_matching import match_categories
+from backend.app.spend_summary import (
+    category_monthly_totals as summary_category_monthly_totals,
+    category_totals as summary_category_totals,
+    clear_summary,
+    filter_transactions,
+    month_label,
+    monthly_totals as summary_monthly_totals,
+)
+from backend.app.merchant_tokens import clear_tokens, top_tokens
+from backend.app.analytics_engine import AnalyticsUnavailable, clear_snapshot, trends
+from backend.app.forecast import FORECAST_HISTORY_MONTHS, forecast
+from backend.app.reports import FILENAMES, iter_csv, iter_parquet, iter_report_rows, parquet_available
+from backend.app.jobs import JobQueueFull, get_job, job_to_dict, submit_csv_job
+from backend.app.tenancy import get_tenant
+
+# Ensure tables and indexes exist
+init_db()
+
+# Every route acts on the caller's tenant only (X-Tenant-ID header, see tenancy.py)
 router = APIRouter()
 
 
@@ -39,97 +54,136 @@ _db_dependency = get_db if "get_db" in globals() else _get_db
 
 
 @router.post("/upload-csv")
-def upload_transactions_csv(file: UploadFile = File(...), db: Session = Depends(_db_dependency)):
+def upload_transactions_csv(
+    file: UploadFile = File(...),
+    wait: bool = False,
+    db: Session = Depends(_db_dependency),
+    tenant_id: str = Depends(get_tenant),
+):
     """
     Upload a CSV with columns: description, amount, (optional) date
-    Classify, save to DB, and return a simple summary count.
-    Date format expected: YYYY-MM-DD (if provided). If missing/invalid, uses today's date.
+    The file is queued as a background job and a job id is returned straight away;
+    poll /budgets/jobs/{job_id} for progress. Pass ?wait=true to ingest inline and
+    get the final summary in the response instead.
+    Rows with a missing description or invalid amount are skipped and reported in
+    `errors`. Accepted date formats: YYYY-MM-DD, DD-MM-YYYY, DD/MM/YYYY, YYYY/MM/DD;
+    if missing/invalid, uses today's date.
+    Rows already stored by an earlier upload are skipped and counted in `rows_duplicate`;
+    re-uploading an identical file is refused with 409.
     """
-    try:
-        df = pd.read_csv(file.file)
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Unable to read CSV: {e}")
-
-    if not {"description", "amount"}.issubset(df.columns):
-        raise HTTPException(status_code=400, detail="CSV must have 'description' and 'amount' columns")
-
-    # Build list of rows preserving order and capture optional date column per row
-    rows: List[dict] = []
-    for _, row in df.iterrows():
-        desc = str(row["description"])
-        try:
-            amt = float(row["amount"])
-        except Exception:
-            raise HTTPException(status_code=400, detail=f"Invalid amount for description '{desc}'")
-        # prefer lowercase column 'date' but accept 'Date' too; if neither, set None
-        date_val = None
-        if "date" in df.columns and not pd.isna(row["date"]):
-            date_val = str(row["date"])
-        elif "Date" in df.columns and not pd.isna(row["Date"]):
-            date_val = str(row["Date"])
-        rows.append({"description": desc, "amount": amt, "date": date_val})
-
-    # Validate description + amount with Pydantic
-    validated = []
-    for r in rows:
+    if not wait:
         try:
-            t = TransactionSchema(description=r["description"], amount=r["amount"])
-            validated.append({"schema": t, "date": r["date"]})
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f"Validation error for '{r['description']}': {e}")
+            job_id = submit_csv_job(file.file, file.filename, classify=classify_transactions, tenant_id=tenant_id)
+        except JobQueueFull as e:
+            raise HTTPException(status_code=429, detail=str(e))
+        except DuplicateFileError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        return JSONResponse(
+            {"job_id": job_id, "status": "queued", "message": f"Upload queued as job {job_id}."},
+            status_code=202,
+        )
+
+    sha256 = file_digest(file.file)
+    try:
+        check_new_file(db, sha256, tenant_id)
+    except DuplicateFileError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
-    # Classify descriptions (use your classifier function)
-    descriptions = [v["schema"].description for v in validated]
     try:
-        categories = classify_transactions(descriptions)
+        summary = ingest_csv(file.file, db, classify=classify_transactions, tenant_id=tenant_id)
+        record_file(db, sha256, file.filename, summary, tenant_id)
+    except CSVFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         # classifier failures should not break everything; return an informative error
         raise HTTPException(status_code=500, detail=f"Classification failed: {e}")
 
-    saved = 0
-    # Save each validated row + predicted category
-    for v, cat in zip(validated, categories):
-        schema = v["schema"]
-        date_str = v["date"]
-        # parse category returned by classifier (supports dict or plain string)
-        if isinstance(cat, dict):
-            category_name = cat.get("predicted_category") or cat.get("category") or "Uncategorized"
-        else:
-            category_name = str(cat)
-
-        # Parse date string if present
-        txn_date = None
-        if date_str:
-            # accept common formats; try YYYY-MM-DD first
-            parsed = None
-            for fmt in ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y", "%Y/%m/%d"):
-                try:
-                    parsed = datetime.strptime(date_str, fmt).date()
-                    break
-                except Exception:
-                    parsed = None
-            txn_date = parsed or datetime.utcnow().date()
-        else:
-            txn_date = datetime.utcnow().date()
+    message = f"{summary['rows_saved']} transactions uploaded, classified and saved."
+    if summary["rows_duplicate"]:
+        message += f" {summary['rows_duplicate']} duplicates of earlier uploads skipped."
+    if summary["rows_failed"]:
+        message += f" {summary['rows_failed']} rows skipped due to errors."
+    return {"message": message, **summary}
 
-        db_tx = Transaction(
-            description=schema.description,
-            amount=float(schema.amount),
-            category=category_name,
-            date=txn_date
-        )
-        db.add(db_tx)
-        saved += 1
 
-    db.commit()
-    return {"message": f"{saved} transactions uploaded, classified and saved."}
+@router.get("/jobs/{job_id}")
+def get_upload_job(job_id: str, db: Session = Depends(_db_dependency), tenant_id: str = Depends(get_tenant)):
+    """
+    Status of a background upload: rows done/failed, throughput and row-level errors.
+    """
+    job = get_job(db, job_id, tenant_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_to_dict(job)
+
+
+# next_cursor is "<date>_<id>"; ids are 64-bit, so at most 18 digits get through
+CURSOR_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2})_(\d{1,18})$", re.ASCII)
+
+
+@router.get("/transactions")
+async def list_transactions(
+    filters: SpendFilters = Depends(),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db=Depends(get_read_db),
+    tenant_id: str = Depends(get_tenant),
+):
+    """
+    List transactions newest first with keyset pagination on (date, id).
+    Pass the returned next_cursor to get the following page; each page costs the
+    same however deep it is. Supports date_from, date_to and category filters.
+    Transactions without a date are not listed.
+    """
+    after = None
+    if cursor:
+        match = CURSOR_PATTERN.match(cursor)
+        try:
+            if match is None:
+                raise ValueError(cursor)
+            after = (date.fromisoformat(match.group(1)), int(match.group(2)))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    return await run_read(db, load_transaction_page, tenant_id, filters, limit, after)
+
+
+def load_transaction_page(db: Session, tenant_id: str, filters: SpendFilters, limit: int, after=None):
+    query = filter_transactions(db.query(Transaction), filters, tenant_id).filter(Transaction.date.isnot(None))
+    if after is not None:
+        # Seek past the last row of the previous page instead of OFFSET
+        query = query.filter(tuple_(Transaction.date, Transaction.id) < after)
+    rows = query.order_by(Transaction.date.desc(), Transaction.id.desc()).limit(limit + 1).all()
+
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1]
+        next_cursor = f"{last.date.isoformat()}_{last.id}"
+    return {
+        "items": [
+            {
+                "id": t.id,
+                "date": t.date.isoformat(),
+                "description": t.description,
+                "amount": t.amount,
+                "category": t.category,
+            }
+            for t in page
+        ],
+        "next_cursor": next_cursor,
+    }
 
 
 @router.delete("/transactions/clear")
-def clear_transactions(db: Session = Depends(_db_dependency)):
+def clear_transactions(db: Session = Depends(_db_dependency), tenant_id: str = Depends(get_tenant)):
     try:
-        deleted = db.query(Transaction).delete()
+        deleted = db.query(Transaction).filter(Transaction.tenant_id == tenant_id).delete()
+        clear_summary(db, tenant_id)
+        clear_tokens(db, tenant_id)
+        clear_files(db, tenant_id)
+        bump_data_version(db, tenant_id)
         db.commit()
+        clear_snapshot(tenant_id)
         return {"message": f"Deleted {deleted} transactions successfully."}
     except Exception as e:
         db.rollback()
@@ -137,47 +191,58 @@ def clear_transactions(db: Session = Depends(_db_dependency)):
 
 
 @router.post("/", response_model=BudgetOut)
-def add_budget(budget: BudgetCreate, db: Session = Depends(_db_dependency)):
-    existing = db.query(Budget).filter(Budget.category == budget.category).first()
-    if existing:
-        existing.limit = budget.limit
-        db.add(existing)
-        db.commit()
-        db.refresh(existing)
-        return existing
-    new_budget = Budget(category=budget.category, limit=budget.limit)
-    db.add(new_budget)
+def add_budget(budget: BudgetCreate, db: Session = Depends(_db_dependency), tenant_id: str = Depends(get_tenant)):
+    (saved,) = upsert_budgets(db, [(budget.category, budget.limit)], tenant_id)
     db.commit()
-    db.refresh(new_budget)
-    return new_budget
+    return saved
 
 
 @router.post("/bulk", response_model=List[BudgetOut])
-def create_budgets_bulk(payloads: List[BudgetCreate], db: Session = Depends(_db_dependency)):
-    results = []
-    for payload in payloads:
-        existing = db.query(Budget).filter(Budget.category == payload.category).first()
-        if existing:
-            existing.limit = payload.limit
-            db.add(existing)
-            db.commit()
-            db.refresh(existing)
-            results.append(existing)
-        else:
-            new_budget = Budget(category=payload.category, limit=payload.limit)
-            db.add(new_budget)
-            db.commit()
-            db.refresh(new_budget)
-            results.append(new_budget)
+def create_budgets_bulk(
+    payloads: List[BudgetCreate], db: Session = Depends(_db_dependency), tenant_id: str = Depends(get_tenant)
+):
+    """
+    Create or update many budgets in a single upsert and a single commit.
+    """
+    results = upsert_budgets(db, [(p.category, p.limit) for p in payloads], tenant_id)
+    db.commit()
+    return results
+
+
+@router.put("/bulk", response_model=List[BudgetOut])
+def replace_budgets_bulk(
+    payloads: List[BudgetCreate], db: Session = Depends(_db_dependency), tenant_id: str = Depends(get_tenant)
+):
+    """
+    Replace the whole budget set: categories not in the payload are deleted.
+    """
+    results = replace_budgets(db, [(p.category, p.limit) for p in payloads], tenant_id)
+    db.commit()
     return results
 
 
+@router.delete("/bulk")
+def delete_budgets_bulk(
+    category: List[str] = Query(...), db: Session = Depends(_db_dependency), tenant_id: str = Depends(get_tenant)
+):
+    """
+    Delete several budgets at once: DELETE /budgets/bulk?category=Food&category=Travel
+    """
+    deleted = delete_budgets(db, category, tenant_id)
+    db.commit()
+    return {"message": f"Deleted {deleted} budgets successfully."}
+
+
 @router.get("/view")
-def view_budgets(db: Session = Depends(_db_dependency)):
+async def view_budgets(request: Request, db=Depends(get_read_db), tenant_id: str = Depends(get_tenant)):
     """
     Return the budgets directly as a list of {category, budget_limit}.
     """
-    budgets = db.query(Budget).all()
+    return await cached_read(request, db, tenant_id, load_budgets)
+
+
+def load_budgets(db: Session, tenant_id: str):
+    budgets = db.query(Budget).filter(Budget.tenant_id == tenant_id).all()
     return [
         {
             "category": b.category,
@@ -188,9 +253,10 @@ def view_budgets(db: Session = Depends(_db_dependency)):
 
 
 @router.delete("/clear-limits")
-def clear_budget_limits(db: Session = Depends(get_db)):
+def clear_budget_limits(db: Session = Depends(get_db), tenant_id: str = Depends(get_tenant)):
     try:
-        deleted = db.query(Budget).delete()
+        deleted = db.query(Budget).filter(Budget.tenant_id == tenant_id).delete()
+        bump_data_version(db, tenant_id)
         db.commit()
         return {"message": f"Cleared {deleted} budget limits successfully."}
     except Exception as e:
@@ -199,26 +265,27 @@ def clear_budget_limits(db: Session = Depends(get_db)):
 
 
 @router.get("/compute_spend")
-def compute_spend(db: Session = Depends(_db_dependency)):
+async def compute_spend(
+    request: Request, filters: SpendFilters = Depends(), db=Depends(get_read_db), tenant_id: str = Depends(get_tenant)
+):
     """
     Return computed spend summary comparing persisted transactions to budgets.
+    Optional filters: date_from, date_to (inclusive, YYYY-MM-DD) and category.
     """
-    persisted = db.query(Transaction).all()
-    budgets = db.query(Budget).all()
-    budget_map = {b.category: b.limit for b in budgets}
+    return await cached_read(request, db, tenant_id, load_spend_summary, filters)
 
-    def find_best_match(cat):
-        if not budget_map or not cat:
-            return None
-        match = process.extractOne(cat, list(budget_map.keys()), scorer=fuzz.partial_ratio)
-        if match and match[1] >= 80:
-            return match[0]
-        return None
+
+def load_spend_summary(db: Session, tenant_id: str, filters: SpendFilters = None):
+    # Read the maintained summary: one row per distinct category, however many transactions exist
+    category_totals = summary_category_totals(db, filters=filters, tenant_id=tenant_id)
+    budgets = db.query(Budget).filter(Budget.tenant_id == tenant_id).all()
+    budget_map = {b.category: b.limit for b in budgets}
+    matches = match_categories([cat for cat, _ in category_totals], sorted(budget_map))
 
     spend_summary = {}
-    for txn in persisted:
-        key = find_best_match(txn.category) or txn.category or "Uncategorized"
-        spend_summary[key] = spend_summary.get(key, 0) + (txn.amount or 0.0)
+    for cat, total in category_totals:
+        key = matches.get(cat) or cat or "Uncategorized"
+        spend_summary[key] = spend_summary.get(key, 0) + (total or 0.0)
 
     result = []
     for cat, spent in spend_summary.items():
@@ -249,19 +316,21 @@ def compute_spend(db: Session = Depends(_db_dependency)):
 
 
 @router.get("/insights")
-def get_insights(db: Session = Depends(_db_dependency)):
+async def get_insights(
+    request: Request, filters: SpendFilters = Depends(), db=Depends(get_read_db), tenant_id: str = Depends(get_tenant)
+):
     """
     Get analytics insights about transactions:
     - Total spend
     - Category-wise breakdown
     - Monthly trend
+    Optional filters: date_from, date_to (inclusive, YYYY-MM-DD) and category.
     """
-    category_data = (
-        db.query(Transaction.category, func.sum(Transaction.amount))
-        .group_by(Transaction.category)
-        .all()
-    )
-    category_breakdown = {cat: float(total or 0) for cat, total in category_data}
+    return await cached_read(request, db, tenant_id, load_insights, filters)
+
+
+def load_insights(db: Session, tenant_id: str, filters: SpendFilters = None):
+    category_breakdown = dict(summary_category_totals(db, filters=filters, tenant_id=tenant_id))
     total_spent = sum(category_breakdown.values())
 
     category_percentages = {
@@ -269,19 +338,9 @@ def get_insights(db: Session = Depends(_db_dependency)):
         for k, v in category_breakdown.items()
     }
 
-    monthly_data = (
-        db.query(
-            extract("year", Transaction.date).label("year"),
-            extract("month", Transaction.date).label("month"),
-            func.sum(Transaction.amount).label("total")
-        )
-        .group_by("year", "month")
-        .order_by("year", "month")
-        .all()
-    )
     monthly_summary = {
-        f"{int(y)}-{int(m):02d}": float(t or 0)
-        for y, m, t in monthly_data
+        f"{y}-{m:02d}": total
+        for y, m, total in summary_monthly_totals(db, filters=filters, tenant_id=tenant_id)
         if y and m
     }
 
@@ -301,39 +360,36 @@ def get_insights(db: Session = Depends(_db_dependency)):
 
 
 @router.get("/analytics")
-def get_analytics(db: Session = Depends(_db_dependency)):
+async def get_analytics(
+    request: Request, filters: SpendFilters = Depends(), db=Depends(get_read_db), tenant_id: str = Depends(get_tenant)
+):
     """
     Return analytics data for visualization:
     - Monthly total spend
     - Category spend per month
     - Top merchants/keywords
+    Optional filters: date_from, date_to (inclusive, YYYY-MM-DD) and category.
     """
-    transactions = db.query(Transaction).all()
+    return await cached_read(request, db, tenant_id, load_analytics, filters)
 
-    if not transactions:
-        return {"message": "No transaction data available."}
 
-    monthly_spend = {}
-    category_monthly = {}
-    merchant_count = {}
+def load_analytics(db: Session, tenant_id: str, filters: SpendFilters = None):
+    # Grouped SQL over the maintained summary and keyword index; no transaction scan
+    months = summary_monthly_totals(db, filters=filters, tenant_id=tenant_id)
 
-    for txn in transactions:
-        month = txn.date.strftime("%b %Y") if txn.date else "Unknown"
-        category = txn.category or "Uncategorized"
-        desc = txn.description.lower() if txn.description else ""
-
-        monthly_spend[month] = monthly_spend.get(month, 0) + txn.amount
+    if not months:
+        return {"message": "No transaction data available."}
 
-        if category not in category_monthly:
-            category_monthly[category] = {}
-        category_monthly[category][month] = category_monthly[category].get(month, 0) + txn.amount
+    monthly_spend = {month_label(year, month): total for year, month, total in months}
 
-        for word in desc.split():
-            if len(word) > 3:
-                merchant_count[word] = merchant_count.get(word, 0) + 1
+    category_monthly = {}
+    for year, month, category, total in summary_category_monthly_totals(
+        db, missing_label="Uncategorized", filters=filters, tenant_id=tenant_id
+    ):
+        category_monthly.setdefault(category, {})[month_label(year, month)] = total
 
     sorted_monthly = sorted(monthly_spend.items(), key=lambda x: x[0])
-    sorted_merchants = sorted(merchant_count.items(), key=lambda x: x[1], reverse=True)[:5]
+    sorted_merchants = top_tokens(db, limit=5, filters=filters, tenant_id=tenant_id)
 
     return {
         "monthly_spend": [{"month": m, "total": t} for m, t in sorted_monthly],
@@ -342,33 +398,83 @@ def get_analytics(db: Session = Depends(_db_dependency)):
     }
 
 
+@router.get("/trends")
+async def get_trends(
+    request: Request,
+    filters: SpendFilters = Depends(),
+    window: int = Query(3, ge=1, le=24, description="rolling average window, months"),
+    db: Session = Depends(_db_dependency),
+    tenant_id: str = Depends(get_tenant),
+):
+    """
+    Long-history analytics from the columnar engine (analytics_engine.py):
+    - Monthly spend per category with a rolling average and month-over-month change
+    - Percentiles of transaction amounts, overall and per category
+    Optional filters: date_from, date_to (inclusive, YYYY-MM-DD) and category.
+    """
+    # A plain Session makes cached_read run the scan in the threadpool, off the event loop
+    try:
+        return await cached_read(request, db, tenant_id, load_trends, filters, window,
+                                 version_of=lambda result: result["data_version"])
+    except AnalyticsUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
 
-@router.get("/download-report")
-def download_report(db: Session = Depends(get_db)):
+
+def load_trends(db: Session, tenant_id: str, filters: SpendFilters = None, window: int = 3):
+    return trends(db, filters=filters, window=window, tenant_id=tenant_id)
+
+
+@router.get("/forecast")
+async def get_forecast(
+    request: Request,
+    as_of: Optional[date] = Query(None, description="forecast date, YYYY-MM-DD (default: today)"),
+    history_months: int = Query(FORECAST_HISTORY_MONTHS, ge=0, le=120),
+    db=Depends(get_read_db),
+    tenant_id: str = Depends(get_tenant),
+):
     """
-    Download insights summary (category, total spent, percentage) as CSV
+    Project month-end spend per budget category from this month's daily run rate
+    and the same month in past years, with the date each category is projected to
+    go over its limit (or went over it).
     """
-    # Fetch insights logic from your existing endpoint
-    category_data = (
-        db.query(Transaction.category, func.sum(Transaction.amount))
-        .group_by(Transaction.category)
-        .all()
-    )
+    as_of = as_of or date.today()
+    return await cached_read(request, db, tenant_id, load_forecast, as_of, history_months, vary=as_of.isoformat())
 
-    category_breakdown = {cat: float(total or 0) for cat, total in category_data}
-    total_spent = sum(category_breakdown.values())
 
-    output = StringIO()
-    writer = csv.writer(output)
-    writer.writerow(["Category", "Total Spent", "Percentage"])
+def load_forecast(db: Session, tenant_id: str, as_of: date = None, history_months: int = FORECAST_HISTORY_MONTHS):
+    return forecast(db, as_of=as_of, history_months=history_months, tenant_id=tenant_id)
+
 
-    for cat, total in category_breakdown.items():
-        percent = round((total / total_spent) * 100, 2) if total_spent > 0 else 0
-        writer.writerow([cat, total, f"{percent}%"])
+@router.get("/download-report")
+def download_report(
+    report: str = Query("summary", pattern="^(summary|detailed|pivot)$"),
+    format: str = Query("csv", pattern="^(csv|parquet)$"),
+    gzip: bool = False,
+    filters: SpendFilters = Depends(),
+    tenant_id: str = Depends(get_tenant),
+):
+    """
+    Download a report, streamed as it is read from the database:
+    - summary: category, total spent, percentage (default)
+    - detailed: every transaction
+    - pivot: monthly spend with one column per category
+    format=csv (optionally gzip=true) or format=parquet (gzip=true selects gzip
+    column compression). Supports date_from, date_to and category filters.
+    """
+    rows = iter_report_rows(report, filters, tenant_id=tenant_id)
+    filename = FILENAMES[report]
+    if format == "parquet":
+        if not parquet_available():
+            raise HTTPException(status_code=501, detail="Parquet export needs pyarrow installed")
+        return StreamingResponse(
+            iter_parquet(rows, compression="gzip" if gzip else "snappy"),
+            media_type="application/vnd.apache.parquet",
+            headers={"Content-Disposition": f"attachment; filename={filename}.parquet"},
+        )
 
-    output.seek(0)
+    headers = {"Content-Disposition": f"attachment; filename={filename}.csv{'.gz' if gzip else ''}"}
     return StreamingResponse(
-        output,
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=insights_report.csv"},
+        iter_csv(rows, compress=gzip),
+        media_type="application/gzip" if gzip else "text/csv",
+        headers=headers,
     )
@@ -0,0 +1,48 @@
+# backend/app/budget_matching.py
+"""
+Resolve transaction categories to budget categories with fuzzy matching.
+
+Categories come from the classifier's small closed label set, so each distinct
+category is scored once against all budget names with rapidfuzz.process.cdist and
+the result is cached per set of budget names. A budget write that changes the names
+simply looks up a different set, so tenants sharing the process never invalidate
+each other; the least recently used sets beyond BUDGET_MATCH_CACHE_SIZE are dropped.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+from rapidfuzz import fuzz, process
+
+MATCH_THRESHOLD = 80
+BUDGET_MATCH_CACHE_SIZE = int(os.getenv("BUDGET_MATCH_CACHE_SIZE", "1024"))
+
+# {tuple(budget names): {category: budget name or None}}, least recently used first
+_matches = OrderedDict()
+_lock = threading.Lock()
+
+
+def match_categories(categories, budget_names) -> dict:
+    """
+    Map each category to its best-matching budget name (partial_ratio >= MATCH_THRESHOLD),
+    or None when nothing matches.
+    """
+    names = tuple(budget_names)
+    with _lock:
+        known = _matches.setdefault(names, {})
+        _matches.move_to_end(names)
+        while len(_matches) > BUDGET_MATCH_CACHE_SIZE:
+            _matches.popitem(last=False)
+        todo = [c for c in dict.fromkeys(categories) if c and c not in known]
+        if todo and names:
+            scores = process.cdist(todo, names, scorer=fuzz.partial_ratio)
+            best = scores.argmax(axis=1)
+            for row, cat in enumerate(todo):
+                col = best[row]
+                known[cat] = names[col] if scores[row, col] >= MATCH_THRESHOLD else None
+        else:
+            for cat in todo:
+                known[cat] = None
+        return {c: known.get(c) for c in categories}
+
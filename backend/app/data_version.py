@@ -0,0 +1,26 @@
+# backend/app/data_version.py
+"""
+A per-tenant data version: every write that can change a tenant's dashboard reads
+bumps it inside its own transaction, so readers never see new data with an old version.
+The response cache (response_cache.py) keys ETags on it; because it lives in the
+database, all workers agree on it, and a write by one tenant leaves the others cached.
+"""
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.app.db import dialect_insert
+from backend.app.models.data_version_model import DataVersion
+from backend.app.tenancy import DEFAULT_TENANT
+
+
+def bump_data_version(db: Session, tenant_id: str = DEFAULT_TENANT) -> None:
+    """
+    Does not commit; call inside the transaction that writes the data.
+    """
+    stmt = dialect_insert(db, DataVersion.__table__).values(tenant_id=tenant_id, version=1)
+    db.execute(stmt.on_conflict_do_update(index_elements=["tenant_id"], set_={"version": DataVersion.version + 1}))
+
+
+def read_data_version(db: Session, tenant_id: str = DEFAULT_TENANT) -> int:
+    return db.execute(select(DataVersion.version).where(DataVersion.tenant_id == tenant_id)).scalar() or 0
@@ -1,15 +1,101 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
 import os
 
-# Make sure folder exists for database
-os.makedirs("backend/data", exist_ok=True)
+# Database location; override with DATABASE_URL (any SQLAlchemy URL)
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///backend/data/app.db")
+
+# Connection pool sizing. SQLite allows one writer at a time but, in WAL mode, many
+# concurrent readers, so the pool should cover the threadpool's concurrent requests.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+# How long a SQLite connection waits on a lock before failing with "database is locked"
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_WAL = os.getenv("SQLITE_WAL", "1") != "0"
+
+SQLITE_PRAGMAS = {
+    "synchronous": "NORMAL",   # safe with WAL; fsync at checkpoints instead of every commit
+    "temp_store": "MEMORY",
+    "cache_size": "-65536",    # 64 MB page cache per connection
+    "mmap_size": "268435456",  # 256 MB memory-mapped reads
+    "foreign_keys": "ON",
+}
+
+
+def make_engine(url: str = DATABASE_URL, wal: bool = SQLITE_WAL):
+    """
+    Create an engine with storage settings applied: WAL and pragmas for SQLite,
+    sized connection pool for everything file/server backed.
+    """
+    parsed = make_url(url)
+    kwargs = {"pool_pre_ping": True}
+    if parsed.get_backend_name() == "sqlite":
+        database = parsed.database
+        if database and database != ":memory:":
+            # Make sure folder exists for database
+            os.makedirs(os.path.dirname(database) or ".", exist_ok=True)
+        kwargs["connect_args"] = {"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000}
+    if not (parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")):
+        kwargs.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT)
+
+    new_engine = create_engine(url, **kwargs)
+    if parsed.get_backend_name() == "sqlite":
+        _apply_sqlite_pragmas(new_engine, wal)
+    return new_engine
+
+
+def _apply_sqlite_pragmas(sync_engine, wal: bool):
+    @event.listens_for(sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        # WAL lets readers keep reading while an upload is writing
+        cursor.execute(f"PRAGMA journal_mode={'WAL' if wal else 'DELETE'}")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+# Async drivers for the read-heavy dashboard endpoints
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+# auto: use the async path when its driver is installed; 0/1 force it off/on
+DB_ASYNC = os.getenv("DB_ASYNC", "auto")
+
+
+def async_url_for(url: str) -> str:
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {parsed.get_backend_name()}")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def make_async_engine(url: str = None, wal: bool = SQLITE_WAL):
+    """
+    Async counterpart of make_engine(); returns None if the async driver is not installed.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = url or os.getenv("ASYNC_DATABASE_URL") or async_url_for(DATABASE_URL)
+    parsed = make_url(url)
+    kwargs = {"pool_pre_ping": True}
+    if parsed.get_backend_name() == "sqlite":
+        kwargs["connect_args"] = {"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000}
+    if not (parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")):
+        kwargs.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT)
+    try:
+        new_engine = create_async_engine(url, **kwargs)
+    except ImportError:
+        return None
+    if parsed.get_backend_name() == "sqlite":
+        _apply_sqlite_pragmas(new_engine.sync_engine, wal)
+    return new_engine
 
-# Path to your database file
-DATABASE_URL = "sqlite:///backend/data/app.db"
 
 # Create engine and session
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+engine = make_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -19,9 +105,162 @@ def get_db():
         yield db
     finally:
         db.close()
-# ✅ Import models *AFTER* Base is defined
-from backend.app.models.transaction_model import Transaction
-from backend.app.models.budget_model import Budget
 
-# ✅ Create all tables (only needs to run once at startup)
-Base.metadata.create_all(bind=engine)
+
+async_engine = make_async_engine() if DB_ASYNC != "0" else None
+if DB_ASYNC == "1" and async_engine is None:
+    raise RuntimeError("DB_ASYNC=1 but no async driver is installed (pip install aiosqlite)")
+AsyncSessionLocal = None
+if async_engine is not None:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_read_db():
+    """
+    Session for read-only dashboard routes: an AsyncSession when the async driver is
+    available, otherwise a regular Session. Pair with run_read().
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+    else:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+
+async def run_read(db, fn, *args, **kwargs):
+    """
+    Run fn(session, *args) against a session from get_read_db() without blocking the
+    event loop: via the async driver if db is an AsyncSession, else in the threadpool.
+    """
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    from starlette.concurrency import run_in_threadpool
+
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+def dialect_insert(db, table):
+    """
+    INSERT into table with on_conflict_do_update() available: the PostgreSQL or SQLite
+    construct, whichever database db (a Session or Connection) is bound to.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(table)
+
+
+def ensure_columns(bind=None):
+    """
+    create_all() never alters existing tables; ALTER TABLE ... ADD COLUMN any model
+    column an existing database is missing. Added columns must be nullable or have
+    a server default, since existing rows get no value.
+    """
+    from sqlalchemy import inspect, text
+
+    bind = bind or engine
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            present = {col["name"] for col in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in present:
+                    continue
+                if not column.nullable and column.server_default is None:
+                    raise RuntimeError(f"Cannot add NOT NULL column {table.name}.{column.name} without a server default")
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=bind.dialect)}"
+                if column.server_default is not None:
+                    ddl += f" DEFAULT {column.server_default.arg}"
+                conn.execute(text(ddl))
+
+
+def ensure_primary_keys(bind=None):
+    """
+    Rebuild tables whose primary key changed (e.g. gained tenant_id), which no
+    database can ALTER in place: rename the old table, create the new one, copy the
+    shared columns across and drop the old one. Columns the old table lacks get
+    their server default.
+    """
+    from sqlalchemy import inspect, text
+
+    bind = bind or engine
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        current = set(inspector.get_pk_constraint(table.name)["constrained_columns"])
+        if current == {column.name for column in table.primary_key.columns}:
+            continue
+        old = f"{table.name}__old"
+        present = {col["name"] for col in inspector.get_columns(table.name)}
+        shared = ", ".join(column.name for column in table.columns if column.name in present)
+        with bind.begin() as conn:
+            # Index names are global; free them for the new table's indexes
+            for index in inspector.get_indexes(table.name):
+                conn.execute(text(f"DROP INDEX {index['name']}"))
+            conn.execute(text(f"ALTER TABLE {table.name} RENAME TO {old}"))
+            if bind.dialect.name == "postgresql":
+                conn.execute(text(f"ALTER INDEX {table.name}_pkey RENAME TO {old}_pkey"))
+            table.create(bind=conn)
+            conn.execute(text(f"INSERT INTO {table.name} ({shared}) SELECT {shared} FROM {old}"))
+            conn.execute(text(f"DROP TABLE {old}"))
+
+
+# Indexes replaced by tenant-prefixed ones; dropped from existing databases
+RETIRED_INDEXES = (
+    "ix_transactions_date_category",
+    "ix_transactions_category_date_id",
+    "ix_transactions_date_id",
+    "ux_transactions_fingerprint",
+    "ix_budgets_category",
+)
+
+
+def drop_retired_indexes(bind=None):
+    from sqlalchemy import text
+
+    bind = bind or engine
+    with bind.begin() as conn:
+        for name in RETIRED_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+def ensure_indexes(bind=None):
+    """
+    create_all() only creates indexes together with new tables; add any index that
+    an existing database is missing.
+    """
+    bind = bind or engine
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+
+
+def init_db(bind=None):
+    """
+    Create all tables and indexes (only needs to run once at startup).
+    """
+    # ✅ Import models *AFTER* Base is defined
+    from backend.app.models import transaction_model, budget_model, job_model  # noqa: F401
+    from backend.app.models import spend_summary_model, merchant_token_model, data_version_model  # noqa: F401
+    from backend.app.models import uploaded_file_model  # noqa: F401
+
+    bind = bind or engine
+    Base.metadata.create_all(bind=bind)
+    ensure_primary_keys(bind)
+    ensure_columns(bind)
+    drop_retired_indexes(bind)
+    ensure_indexes(bind)
@@ -0,0 +1,110 @@
+# backend/app/dedupe.py
+"""
+Idempotent statement uploads.
+
+Row level: each row gets a fingerprint, a hash of its normalized description, amount
+(2 dp), date and occurrence number. The date is the one in the file: the parsed day,
+else the raw text, or "" when missing; never the upload day substituted for it. The
+occurrence number is how many identical (description, amount, date) rows came before
+it in the same file, so two genuine identical purchases on one day are both kept,
+while re-uploading an overlapping statement reproduces the same fingerprints. They
+are stored with a unique index, and rows whose fingerprint already exists are
+dropped before classification.
+
+File level: the SHA-256 of a statement ingested to completion is recorded, and an
+identical file is refused with a single primary-key lookup.
+
+Both are per tenant: two users may upload the same statement.
+"""
+
+import hashlib
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from backend.app.models.prediction_cache import normalize_description
+from backend.app.models.transaction_model import Transaction
+from backend.app.models.uploaded_file_model import UploadedFile
+from backend.app.tenancy import DEFAULT_TENANT
+
+# Bound parameters per IN (...) lookup
+LOOKUP_BATCH = 5000
+
+
+class DuplicateFileError(ValueError):
+    """This exact file was already ingested."""
+
+    def __init__(self, uploaded: UploadedFile):
+        self.uploaded = uploaded
+        when = uploaded.created_at.strftime("%Y-%m-%d %H:%M") if uploaded.created_at else "earlier"
+        super().__init__(
+            f"This file was already uploaded ({uploaded.filename or 'unnamed'}, {when}, "
+            f"{uploaded.rows_saved} rows saved); nothing to do."
+        )
+
+
+def file_digest(fileobj, block_size: int = 1024 * 1024) -> str:
+    """
+    SHA-256 of a seekable file object; leaves it rewound.
+    """
+    digest = hashlib.sha256()
+    fileobj.seek(0)
+    for block in iter(lambda: fileobj.read(block_size), b""):
+        digest.update(block)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def check_new_file(db: Session, sha256: str, tenant_id: str = DEFAULT_TENANT) -> None:
+    uploaded = db.get(UploadedFile, (tenant_id, sha256))
+    if uploaded is not None:
+        raise DuplicateFileError(uploaded)
+
+
+def record_file(db: Session, sha256: str, filename: str, summary: dict, tenant_id: str = DEFAULT_TENANT) -> None:
+    """
+    Remember a fully ingested file. Commits.
+    """
+    db.merge(UploadedFile(
+        tenant_id=tenant_id,
+        sha256=sha256,
+        filename=filename,
+        rows_saved=summary.get("rows_saved", 0),
+        rows_duplicate=summary.get("rows_duplicate", 0),
+        created_at=datetime.utcnow(),
+    ))
+    db.commit()
+
+
+def clear_files(db: Session, tenant_id: str = DEFAULT_TENANT) -> None:
+    db.query(UploadedFile).filter(UploadedFile.tenant_id == tenant_id).delete()
+
+
+def fingerprint_rows(clean: pd.DataFrame, occurrences: dict) -> list:
+    """
+    Fingerprints for clean (description, amount, date_key) rows. occurrences carries
+    the per-key counts across the chunks of one file and is updated in place.
+    """
+    blake2b = hashlib.blake2b
+    fingerprints = []
+    for desc, amount, date_key in zip(clean["description"].tolist(), clean["amount"].tolist(), clean["date_key"].tolist()):
+        text = "%s|%.2f|%s" % (normalize_description(desc), amount, date_key)
+        # Count by a 16-byte digest so memory per distinct row stays small on huge files
+        key = blake2b(text.encode(), digest_size=16).digest()
+        n = occurrences.get(key, 0)
+        occurrences[key] = n + 1
+        fingerprints.append(blake2b(key + b"%d" % n, digest_size=16).hexdigest())
+    return fingerprints
+
+
+def existing_fingerprints(db: Session, fingerprints, tenant_id: str = DEFAULT_TENANT) -> set:
+    fingerprints = list(fingerprints)
+    found = set()
+    for start in range(0, len(fingerprints), LOOKUP_BATCH):
+        batch = fingerprints[start:start + LOOKUP_BATCH]
+        query = db.query(Transaction.fingerprint).filter(
+            Transaction.tenant_id == tenant_id, Transaction.fingerprint.in_(batch)
+        )
+        found.update(fp for (fp,) in query)
+    return found
@@ -0,0 +1,119 @@
+# backend/app/export_classifier.py
+"""
+Export optimized CPU inference artifacts for the trained classifier and check them.
+
+    python -m backend.app.export_classifier            # write model_int8.pt and model.onnx
+    python -m backend.app.export_classifier --check    # + accuracy parity and rows/sec per backend
+
+Artifacts are written next to the fp32 weights in backend/app/models/txn_classifier,
+where CLASSIFIER_BACKEND=int8 / CLASSIFIER_BACKEND=onnx pick them up.
+"""
+
+import argparse
+import json
+import os
+import time
+
+import joblib
+import pandas as pd
+import torch
+from sklearn.model_selection import train_test_split
+from transformers import DistilBertForSequenceClassification, DistilBertTokenizerFast
+
+from backend.app.models.category_model import build_classifier, model_path, predict_label_ids
+from backend.app.models.inference_backends import BACKENDS, INT8_FILE, ONNX_FILE, quantize_dynamic_int8
+
+
+def export_int8():
+    model = DistilBertForSequenceClassification.from_pretrained(model_path)
+    model.eval()
+    quantized = quantize_dynamic_int8(model)
+    out = os.path.join(model_path, INT8_FILE)
+    torch.save(quantized, out)
+    print(f"✅ int8 model saved to {out}")
+
+
+def export_onnx():
+    tokenizer = DistilBertTokenizerFast.from_pretrained(model_path)
+    model = DistilBertForSequenceClassification.from_pretrained(model_path)
+    model.eval()
+    # Keep the model's default (eager) attention so the graph traces cleanly
+    sample = tokenizer(["UBER TRIP", "SWIGGY ORDER 1234"], padding=True, return_tensors="pt")
+    out = os.path.join(model_path, ONNX_FILE)
+    torch.onnx.export(
+        model,
+        (sample["input_ids"], sample["attention_mask"]),
+        out,
+        input_names=["input_ids", "attention_mask"],
+        output_names=["logits"],
+        # Batch size and sequence length vary per micro-batch
+        dynamic_axes={
+            "input_ids": {0: "batch", 1: "sequence"},
+            "attention_mask": {0: "batch", 1: "sequence"},
+            "logits": {0: "batch"},
+        },
+        opset_version=17,
+    )
+    print(f"✅ ONNX model saved to {out}")
+
+
+def held_out_split(csv_path):
+    """
+    Rebuild the exact test split train_classifier.py evaluates on.
+    """
+    df = pd.read_csv(csv_path)
+    label_encoder = joblib.load(os.path.join(model_path, "label_encoder.pkl"))
+    df = df[df["category"].isin(label_encoder.classes_)].copy()
+    df["label"] = label_encoder.transform(df["category"])
+    _, test_df = train_test_split(df, test_size=0.2, random_state=42, stratify=df["label"])
+    return test_df
+
+
+def check_backends(csv_path, bench_rows, batch_size):
+    test_df = held_out_split(csv_path)
+    descriptions = test_df["description"].astype(str).tolist()
+    labels = test_df["label"].tolist()
+    # Repeat the held-out set up to bench_rows for a steadier throughput number
+    bench_descriptions = (descriptions * (bench_rows // max(len(descriptions), 1) + 1))[:bench_rows]
+
+    reference = None
+    report = []
+    for backend in BACKENDS:
+        try:
+            clf = build_classifier(backend)
+        except Exception as e:
+            report.append({"backend": backend, "error": str(e)})
+            continue
+        preds = predict_label_ids(descriptions, batch_size=batch_size, clf=clf)
+        if reference is None:
+            reference = preds
+        start = time.perf_counter()
+        predict_label_ids(bench_descriptions, batch_size=batch_size, clf=clf)
+        elapsed = time.perf_counter() - start
+        report.append({
+            "backend": backend,
+            "accuracy": round(sum(p == y for p, y in zip(preds, labels)) / len(labels), 4),
+            "agreement_with_fp32": round(sum(p == r for p, r in zip(preds, reference)) / len(preds), 4),
+            "rows_per_sec": round(len(bench_descriptions) / elapsed, 1),
+        })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--check", action="store_true", help="run accuracy parity and throughput checks")
+    parser.add_argument("--skip-export", action="store_true", help="only run the checks")
+    parser.add_argument("--data", default="backend/data/transactions.csv")
+    parser.add_argument("--bench-rows", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    if not args.skip_export:
+        export_int8()
+        export_onnx()
+    if args.check or args.skip_export:
+        print(json.dumps(check_backends(args.data, args.bench_rows, args.batch_size), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+# backend/app/forecast.py
+"""
+Month-end spend projection per budget category.
+
+Everything is read from grouped aggregates, never from individual transactions:
+
+  spent to date   category totals from the 1st of the month to as_of (one small
+                  range-limited grouped query, or the spend summary on the last day)
+  history         one row per category summarising the FORECAST_HISTORY_MONTHS whole
+                  months before: first month with spend, total, last-12-months total
+                  and same-calendar-month total, grouped in SQL over the tenant's
+                  range of the spend summary's primary key, so only O(categories)
+                  rows reach Python
+
+Categories are folded into budget names with the same fuzzy matching as
+/budgets/compute_spend, then projected together as NumPy arrays:
+
+  run rate        spent to date / days elapsed, carried to the end of the month
+  seasonal        typical month (mean of the last 12 active months) scaled by how this
+                  calendar month compares with the category's average month; what is
+                  left of it after the spend to date is the expected rest of the month
+  projection      spent to date + a blend of the two remainders, trusting the run
+                  rate more as the month goes on (a rent paid on the 1st then does
+                  not get extrapolated at full weight)
+
+Months before a category's first spend in the window do not count towards its
+averages. A category over its limit gets the day it crossed (estimated from its run
+rate) or the day it is projected to cross, as overspend_date.
+"""
+
+import calendar
+import os
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from backend.app.budget_matching import match_categories
+from backend.app.models.budget_model import Budget
+from backend.app.models.spend_summary_model import SpendSummary
+from backend.app.schemas import SpendFilters
+from backend.app.spend_summary import NO_CATEGORY, category_totals
+from backend.app.tenancy import DEFAULT_TENANT
+
+FORECAST_HISTORY_MONTHS = int(os.getenv("FORECAST_HISTORY_MONTHS", "36"))
+# Months averaged for a category's typical month
+BASELINE_MONTHS = 12
+# Bounds on the seasonal factor, so one odd month cannot dominate a projection
+SEASONAL_CLIP = (0.25, 4.0)
+MISSING_CATEGORY = "Uncategorized"
+
+
+def _month_index(year, month):
+    return year * 12 + month - 1
+
+
+def _history(db: Session, tenant_id: str, first: int, current: int, calendar_month: int) -> pd.DataFrame:
+    """
+    Per category over month indexes first <= idx < current: first_idx, total,
+    recent (last BASELINE_MONTHS) and same_month (this calendar month in past years).
+    """
+    columns = ["category", "first_idx", "total", "recent", "same_month"]
+    if current <= first:
+        return pd.DataFrame(columns=columns)
+    idx = _month_index(SpendSummary.year, SpendSummary.month)
+    stmt = (
+        select(
+            SpendSummary.category,
+            func.min(idx),
+            func.sum(SpendSummary.total),
+            func.sum(case((idx >= current - BASELINE_MONTHS, SpendSummary.total), else_=0.0)),
+            func.sum(case((SpendSummary.month == calendar_month, SpendSummary.total), else_=0.0)),
+        )
+        .where(SpendSummary.tenant_id == tenant_id, idx >= first, idx < current)
+        .group_by(SpendSummary.category)
+    )
+    history = pd.DataFrame(db.connection().execute(stmt).all(), columns=columns)
+    history["category"] = history["category"].replace(NO_CATEGORY, MISSING_CATEGORY)
+    return history
+
+
+def _months_matching(start, stop: int, calendar_month: int):
+    """
+    How many month indexes in [start, stop) fall in calendar_month (start is an array).
+    """
+    offset = calendar_month - 1
+    return (stop - 1 - offset) // 12 - (start - 1 - offset) // 12
+
+
+def _seasonal_totals(history: pd.DataFrame, current: int, calendar_month: int):
+    """
+    Expected total for calendar_month per row of _history() (already summed per key),
+    NaN for rows without history.
+    """
+    first_idx = history["first_idx"].to_numpy(dtype=float)
+    has_history = ~np.isnan(first_idx)
+    first_idx = np.where(has_history, first_idx, current).astype(np.int64)
+    n_active = current - first_idx
+    n_recent = current - np.maximum(first_idx, current - BASELINE_MONTHS)
+    n_same = _months_matching(first_idx, current, calendar_month)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = history["total"].to_numpy(dtype=float) / n_active
+        baseline = history["recent"].to_numpy(dtype=float) / n_recent
+        same_mean = history["same_month"].to_numpy(dtype=float) / n_same
+        factor = np.where((mean > 0) & (same_mean > 0), same_mean / mean, 1.0)
+
+    factor = np.clip(factor, *SEASONAL_CLIP)
+    return np.where(has_history, baseline * factor, np.nan)
+
+
+def forecast(db: Session, as_of: date = None, history_months: int = FORECAST_HISTORY_MONTHS,
+             tenant_id: str = DEFAULT_TENANT) -> dict:
+    as_of = as_of or date.today()
+    month_start = as_of.replace(day=1)
+    days_in_month = calendar.monthrange(as_of.year, as_of.month)[1]
+    days_elapsed = as_of.day
+    current = _month_index(as_of.year, as_of.month)
+    first = current - history_months
+
+    spent = pd.DataFrame(
+        category_totals(db, filters=SpendFilters(date_from=month_start, date_to=as_of), tenant_id=tenant_id),
+        columns=["category", "total"],
+    )
+    spent["category"] = spent["category"].fillna(MISSING_CATEGORY)
+    history = _history(db, tenant_id, first, current, as_of.month)
+
+    budget_map = dict(db.connection().execute(
+        select(Budget.category, Budget.limit).where(Budget.tenant_id == tenant_id)
+    ).all())
+    categories = pd.unique(pd.concat([spent["category"], history["category"]], ignore_index=True))
+    matches = match_categories(list(categories), sorted(budget_map))
+    key_of = {cat: matches.get(cat) or cat for cat in categories}
+
+    # One row per budget key
+    spent_by_key = spent.groupby(spent["category"].map(key_of))["total"].sum()
+    history = history.groupby(history["category"].map(key_of)).agg(
+        first_idx=("first_idx", "min"), total=("total", "sum"), recent=("recent", "sum"), same_month=("same_month", "sum"),
+    )
+    keys = spent_by_key.index.union(history.index)
+    history = history.reindex(keys)
+
+    spent_to_date = spent_by_key.reindex(keys, fill_value=0.0).to_numpy(dtype=float)
+    limits = np.array([float(budget_map.get(key) or 0.0) for key in keys])
+    days_left = days_in_month - days_elapsed
+
+    run_rate = spent_to_date / days_elapsed
+    seasonal = _seasonal_totals(history, current, as_of.month)
+    weight = days_elapsed / days_in_month
+    run_rate_rest = run_rate * days_left
+    seasonal_rest = np.maximum(seasonal - spent_to_date, 0.0)
+    rest = np.where(np.isnan(seasonal), run_rate_rest, weight * run_rate_rest + (1 - weight) * seasonal_rest)
+    projected = spent_to_date + rest
+
+    has_limit = limits > 0
+    overspent = has_limit & (spent_to_date > limits)
+    will_overspend = has_limit & ~overspent & (projected > limits)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crossed_day = np.clip(np.ceil(limits / run_rate), 1, days_elapsed)
+        crossing_day = days_elapsed + np.ceil((limits - spent_to_date) / (rest / days_left))
+    over_day = np.where(overspent, crossed_day, np.where(will_overspend, np.minimum(crossing_day, days_in_month), 0))
+    status = np.select(
+        [~has_limit, overspent, will_overspend],
+        ["no budget set", "overspent", "projected to overspend"],
+        default="on track",
+    )
+
+    order = np.argsort(-projected, kind="stable")
+    keys = keys.tolist()
+    seasonal = np.round(seasonal, 2)
+    result = []
+    for i in order.tolist():
+        limit = limits[i]
+        result.append({
+            "category": keys[i],
+            "budget_limit": float(limit),
+            "spent_to_date": round(float(spent_to_date[i]), 2),
+            "daily_run_rate": round(float(run_rate[i]), 2),
+            "seasonal_month_total": None if np.isnan(seasonal[i]) else float(seasonal[i]),
+            "projected_month_end": round(float(projected[i]), 2),
+            "projected_remaining": round(float(limit - projected[i]), 2) if limit > 0 else None,
+            "projected_percent": round(float(projected[i] / limit * 100), 1) if limit > 0 else None,
+            "overspend_date": (month_start + timedelta(days=int(over_day[i]) - 1)).isoformat() if over_day[i] else None,
+            "status": str(status[i]),
+        })
+
+    return {
+        "as_of": as_of.isoformat(),
+        "month": f"{as_of.year}-{as_of.month:02d}",
+        "days_elapsed": days_elapsed,
+        "days_in_month": days_in_month,
+        "history_months": history_months,
+        "forecast": result,
+    }
@@ -0,0 +1,210 @@
+# backend/app/inference_server.py
+"""
+Shared local inference server with dynamic request batching.
+
+One process loads the classifier; every uvicorn worker talks to it over a local
+socket instead of holding its own copy of the weights. Requests arriving within
+INFERENCE_BATCH_WINDOW_MS of each other are concatenated and classified in one call,
+so concurrent /categorize and upload requests share forward passes.
+
+    python -m backend.app.inference_server --address 127.0.0.1:8799
+    INFERENCE_SERVER_ADDRESS=127.0.0.1:8799 uvicorn backend.app.main:app --workers 4
+
+The address may also be a filesystem path for a Unix socket. Messages are pickled,
+so anyone who can connect can run code in the server: both sides refuse to start
+unless INFERENCE_SERVER_AUTHKEY is set to a shared secret, e.g.
+
+    export INFERENCE_SERVER_AUTHKEY=$(python -c "import secrets; print(secrets.token_hex(32))")
+"""
+
+import argparse
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing.connection import Client, Listener
+
+logger = logging.getLogger(__name__)
+
+INFERENCE_BATCH_WINDOW_MS = float(os.getenv("INFERENCE_BATCH_WINDOW_MS", "5"))
+INFERENCE_MAX_BATCH_ROWS = int(os.getenv("INFERENCE_MAX_BATCH_ROWS", "4096"))
+
+
+def authkey() -> bytes:
+    """
+    The shared connection secret; there is deliberately no default.
+    """
+    key = os.getenv("INFERENCE_SERVER_AUTHKEY", "")
+    if not key:
+        raise RuntimeError(
+            "INFERENCE_SERVER_AUTHKEY is not set; the inference server and its clients "
+            "need the same secret to authenticate connections"
+        )
+    return key.encode()
+
+
+def parse_address(address: str):
+    """
+    "host:port" -> (host, port); anything else is a Unix socket path.
+    """
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit():
+        return host or "127.0.0.1", int(port)
+    return address
+
+
+class DynamicBatcher:
+    """
+    Collects classify requests for a short window and runs them as one call.
+    """
+    def __init__(self, classify, window_ms: float = INFERENCE_BATCH_WINDOW_MS,
+                 max_rows: int = INFERENCE_MAX_BATCH_ROWS):
+        self.classify = classify
+        self.window = window_ms / 1000
+        self.max_rows = max_rows
+        self._queue = queue.Queue()
+        self.batches = 0
+        self.requests = 0
+        self.rows = 0
+        threading.Thread(target=self._loop, name="inference-batcher", daemon=True).start()
+
+    def submit(self, descriptions) -> Future:
+        future = Future()
+        self._queue.put((list(descriptions), future))
+        return future
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "rows": self.rows,
+            "avg_requests_per_batch": round(self.requests / self.batches, 2) if self.batches else None,
+        }
+
+    def _loop(self):
+        while True:
+            pending = [self._queue.get()]
+            rows = len(pending[0][0])
+            deadline = time.perf_counter() + self.window
+            while rows < self.max_rows:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                pending.append(item)
+                rows += len(item[0])
+            self._run(pending)
+
+    def _run(self, pending):
+        merged = [desc for descriptions, _ in pending for desc in descriptions]
+        try:
+            results = self.classify(merged) if merged else []
+        except Exception as e:
+            for _, future in pending:
+                future.set_exception(e)
+            return
+        self.batches += 1
+        self.requests += len(pending)
+        self.rows += len(merged)
+        start = 0
+        for descriptions, future in pending:
+            future.set_result(results[start:start + len(descriptions)])
+            start += len(descriptions)
+
+
+def _serve_connection(conn, batcher: DynamicBatcher, status):
+    try:
+        while True:
+            try:
+                message = conn.recv()
+            except EOFError:
+                return
+            op = message[0]
+            try:
+                if op == "classify":
+                    reply = ("ok", batcher.submit(message[1]).result())
+                elif op == "ping":
+                    reply = ("ok", {**status(), **batcher.stats()})
+                else:
+                    reply = ("error", f"unknown op {op!r}")
+            except Exception as e:
+                reply = ("error", str(e))
+            conn.send(reply)
+    finally:
+        conn.close()
+
+
+def serve(address: str):
+    from backend.app.models import category_model
+
+    key = authkey()
+    # Load before accepting connections so the first request doesn't pay for it
+    category_model.load_classifier()
+    batcher = DynamicBatcher(category_model.classify_locally)
+
+    with Listener(parse_address(address), backlog=128, authkey=key) as listener:
+        logger.info("inference server listening on %s", address)
+        print(f"✅ Inference server ready on {address} (pid {os.getpid()})", flush=True)
+        while True:
+            try:
+                conn = listener.accept()
+            except Exception as e:
+                # Bad authkey or a client that hung up during the handshake
+                logger.warning("rejected inference connection: %s", e)
+                continue
+            threading.Thread(
+                target=_serve_connection, args=(conn, batcher, category_model.readiness), daemon=True
+            ).start()
+
+
+class InferenceClient:
+    """
+    Thread-safe client: each thread keeps its own connection to the server.
+    """
+    def __init__(self, address: str):
+        self.address = parse_address(address)
+        self._authkey = authkey()
+        self._local = threading.local()
+
+    def _call(self, *message):
+        conn = getattr(self._local, "conn", None)
+        for attempt in (1, 2):
+            if conn is None:
+                conn = Client(self.address, authkey=self._authkey)
+                self._local.conn = conn
+            try:
+                conn.send(message)
+                status, payload = conn.recv()
+                break
+            except (EOFError, OSError):
+                # Server restarted; reconnect once
+                conn.close()
+                conn = self._local.conn = None
+                if attempt == 2:
+                    raise
+        if status != "ok":
+            raise RuntimeError(f"Inference server error: {payload}")
+        return payload
+
+    def classify(self, descriptions):
+        return self._call("classify", list(descriptions))
+
+    def ping(self) -> dict:
+        return self._call("ping")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--address", default=os.getenv("INFERENCE_SERVER_ADDRESS", "127.0.0.1:8799"))
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    serve(args.address)
+
+
+if __name__ == "__main__":
+    main()
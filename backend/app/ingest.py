@@ -0,0 +1,201 @@
+# backend/app/ingest.py
+"""
+Streaming CSV ingestion: read -> parse -> classify -> persist, one chunk at a time.
+
+Only one chunk (CSV_CHUNK_ROWS rows) is held in memory at once, amounts and dates are
+parsed with vectorized pandas operations, and each chunk is classified and committed
+before the next one is read, so memory stays flat regardless of the file size.
+"""
+
+import logging
+import os
+import time
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.app import metrics
+from backend.app.dedupe import existing_fingerprints, fingerprint_rows
+from backend.app.models.transaction_store import bulk_insert_transactions
+from backend.app.tenancy import DEFAULT_TENANT
+
+logger = logging.getLogger(__name__)
+
+CSV_CHUNK_ROWS = int(os.getenv("CSV_CHUNK_ROWS", "20000"))
+# Row-level errors are counted in full but only the first few are returned
+MAX_REPORTED_ERRORS = 100
+DATE_FORMATS = ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y", "%Y/%m/%d")
+
+
+class CSVFormatError(ValueError):
+    """The upload is not a CSV we can ingest at all (as opposed to a bad row)."""
+
+
+def parse_dates(values: pd.Series, default) -> pd.Series:
+    """
+    Parse a column of date strings trying each accepted format in turn, vectorized.
+    Missing or unparseable dates fall back to `default`.
+    """
+    parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    text = values.astype("string").str.strip()
+    for fmt in DATE_FORMATS:
+        todo = parsed.isna() & text.notna()
+        if not todo.any():
+            break
+        parsed[todo] = pd.to_datetime(text[todo], format=fmt, errors="coerce")
+    return parsed.dt.date.where(parsed.notna(), default)
+
+
+def parse_chunk(chunk: pd.DataFrame, first_row: int, today):
+    """
+    Turn a raw CSV chunk into clean (description, amount, date, date_key) rows plus
+    row-level errors. Rows without a usable date get `today`; date_key keeps what the
+    file actually said. first_row is the 1-based data row number of the chunk's first line.
+    """
+    row_numbers = pd.RangeIndex(first_row, first_row + len(chunk))
+    chunk = chunk.set_axis(row_numbers, axis=0)
+
+    descriptions = chunk["description"].astype("string").str.strip()
+    amounts = pd.to_numeric(chunk["amount"], errors="coerce")
+    # prefer lowercase column 'date' but accept 'Date' too
+    date_col = "date" if "date" in chunk.columns else ("Date" if "Date" in chunk.columns else None)
+    if date_col:
+        parsed = parse_dates(chunk[date_col], None)
+        dates = parsed.where(parsed.notna(), today)
+        # What the row says about its date, for fingerprinting: the parsed day, or the
+        # raw text ("" when missing) so the upload day never makes a row look new
+        date_keys = parsed.map(str).where(parsed.notna(), chunk[date_col].astype("string").str.strip().fillna(""))
+    else:
+        dates = pd.Series(today, index=row_numbers, dtype="object")
+        date_keys = pd.Series("", index=row_numbers, dtype="object")
+
+    bad_desc = descriptions.isna() | (descriptions == "")
+    bad_amount = amounts.isna() & ~bad_desc
+    errors = [{"row": int(n), "error": "missing description"} for n in row_numbers[bad_desc.to_numpy()]]
+    errors += [
+        {"row": int(n), "error": f"invalid amount {chunk.at[n, 'amount']!r}"}
+        for n in row_numbers[bad_amount.to_numpy()]
+    ]
+    errors.sort(key=lambda e: e["row"])
+
+    ok = ~(bad_desc | bad_amount)
+    clean = pd.DataFrame({
+        "description": descriptions[ok].astype(str),
+        "amount": amounts[ok].astype(float),
+        "date": dates[ok],
+        "date_key": date_keys[ok].astype(str),
+    })
+    return clean, errors
+
+
+def _category_name(cat):
+    # parse category returned by classifier (supports dict or plain string)
+    if isinstance(cat, dict):
+        return cat.get("predicted_category") or cat.get("category") or "Uncategorized"
+    return str(cat)
+
+
+def _drop_known(db: Session, clean: pd.DataFrame, tenant_id: str):
+    """
+    Rows of clean whose fingerprint the tenant does not have yet, and how many were dropped.
+    """
+    known = existing_fingerprints(db, clean["fingerprint"], tenant_id)
+    if not known:
+        return clean, 0
+    fresh = clean[~clean["fingerprint"].isin(known)]
+    return fresh, len(clean) - len(fresh)
+
+
+def _persist(db: Session, clean: pd.DataFrame, categories, tenant_id: str) -> int:
+    return bulk_insert_transactions(db, (
+        {"description": desc, "amount": amt, "category": _category_name(cat), "date": txn_date, "fingerprint": fp}
+        for desc, amt, txn_date, fp, cat in zip(
+            clean["description"], clean["amount"], clean["date"], clean["fingerprint"], categories
+        )
+    ), commit=True, tenant_id=tenant_id)
+
+
+def ingest_csv(fileobj, db: Session, classify, chunk_rows: int = None, on_progress=None,
+               tenant_id: str = DEFAULT_TENANT) -> dict:
+    """
+    Stream a CSV with columns description, amount and optional date/Date into the
+    database as transactions of tenant_id.
+
+    Rows already stored (same fingerprint, see dedupe.py) are skipped before classification
+    and counted in rows_duplicate. classify is called once per chunk with the list of new
+    descriptions. on_progress, if given, receives the running summary after every
+    committed chunk.
+    """
+    chunk_rows = chunk_rows or CSV_CHUNK_ROWS
+    try:
+        reader = pd.read_csv(fileobj, chunksize=chunk_rows, dtype=str, keep_default_na=True)
+    except Exception as e:
+        raise CSVFormatError(f"Unable to read CSV: {e}")
+
+    summary = {"rows_total": 0, "rows_saved": 0, "rows_duplicate": 0, "rows_failed": 0, "chunks": 0, "errors": []}
+    start = time.perf_counter()
+    today = datetime.utcnow().date()
+    occurrences = {}
+
+    try:
+        chunks = iter(reader)
+        while True:
+            # pandas tokenizes the next CSV slice lazily, so the read itself is the parse stage
+            with metrics.stage("parse") as timing:
+                chunk = next(chunks, None)
+                timing.rows = 0 if chunk is None else len(chunk)
+            if chunk is None:
+                break
+            if summary["chunks"] == 0 and not {"description", "amount"}.issubset(chunk.columns):
+                raise CSVFormatError("CSV must have 'description' and 'amount' columns")
+
+            with metrics.stage("validate", rows=len(chunk)):
+                clean, errors = parse_chunk(chunk, summary["rows_total"] + 1, today)
+            summary["rows_total"] += len(chunk)
+            summary["rows_failed"] += len(errors)
+            room = MAX_REPORTED_ERRORS - len(summary["errors"])
+            summary["errors"].extend(errors[:max(room, 0)])
+
+            if len(clean):
+                with metrics.stage("dedupe", rows=len(clean)):
+                    clean["fingerprint"] = fingerprint_rows(clean, occurrences)
+                    clean, duplicates = _drop_known(db, clean, tenant_id)
+                summary["rows_duplicate"] += duplicates
+            if len(clean):
+                with metrics.stage("classify", rows=len(clean)):
+                    categories = classify(clean["description"].tolist())
+                try:
+                    summary["rows_saved"] += _persist(db, clean, categories, tenant_id)
+                except IntegrityError:
+                    # A concurrent upload stored some of these rows after our lookup; skip them too
+                    db.rollback()
+                    keep = ~clean["fingerprint"].isin(existing_fingerprints(db, clean["fingerprint"], tenant_id))
+                    summary["rows_duplicate"] += int((~keep).sum())
+                    categories = [cat for cat, k in zip(categories, keep) if k]
+                    summary["rows_saved"] += _persist(db, clean[keep], categories, tenant_id)
+
+            summary["chunks"] += 1
+            elapsed = time.perf_counter() - start
+            summary["seconds"] = round(elapsed, 3)
+            summary["rows_per_sec"] = round(summary["rows_total"] / elapsed, 1) if elapsed else None
+            logger.info("ingest chunk %d: %d rows done, %d failed",
+                        summary["chunks"], summary["rows_total"], summary["rows_failed"])
+            if on_progress:
+                on_progress(summary)
+    except pd.errors.ParserError as e:
+        db.rollback()
+        raise CSVFormatError(f"Unable to read CSV after row {summary['rows_total']}: {e}")
+    except CSVFormatError:
+        raise
+    except Exception:
+        db.rollback()
+        raise
+
+    if summary["chunks"] == 0:
+        raise CSVFormatError("CSV must have 'description' and 'amount' columns")
+    elapsed = time.perf_counter() - start
+    summary["seconds"] = round(elapsed, 3)
+    summary["rows_per_sec"] = round(summary["rows_total"] / elapsed, 1) if elapsed else None
+    return summary
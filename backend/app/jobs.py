@@ -0,0 +1,196 @@
+# backend/app/jobs.py
+"""
+Background ingestion jobs.
+
+Uploads are spooled to a temp file and handed to a bounded thread pool; the request
+returns a job id immediately. Threads (not processes) are used because tokenization
+and the torch forward pass release the GIL and the loaded model can be shared, while
+keeping all of it off the event loop. Job status lives in the ingest_jobs table so it
+is still queryable after a restart.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from backend.app.db import SessionLocal
+from backend.app.dedupe import check_new_file, record_file
+from backend.app.ingest import CSVFormatError, ingest_csv
+from backend.app.models.job_model import IngestJob
+from backend.app.tenancy import DEFAULT_TENANT
+
+logger = logging.getLogger(__name__)
+
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "2"))
+# Jobs accepted but not finished; beyond this new uploads are refused rather than queued
+INGEST_MAX_PENDING = int(os.getenv("INGEST_MAX_PENDING", "16"))
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR", "backend/data/uploads")
+
+_executor = ThreadPoolExecutor(max_workers=INGEST_WORKERS, thread_name_prefix="ingest")
+_slots = threading.BoundedSemaphore(INGEST_MAX_PENDING)
+
+
+class JobQueueFull(RuntimeError):
+    pass
+
+
+def job_to_dict(job: IngestJob) -> dict:
+    elapsed = None
+    if job.started_at:
+        elapsed = round(((job.finished_at or datetime.utcnow()) - job.started_at).total_seconds(), 3)
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "filename": job.filename,
+        "rows_total": job.rows_total,
+        "rows_done": job.rows_done,
+        "rows_failed": job.rows_failed,
+        "rows_duplicate": job.rows_duplicate or 0,
+        "rows_per_sec": job.rows_per_sec,
+        "elapsed_seconds": elapsed,
+        "errors": json.loads(job.errors) if job.errors else [],
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+def submit_csv_job(fileobj, filename: str, classify, tenant_id: str = DEFAULT_TENANT) -> str:
+    """
+    Spool fileobj to disk, record a queued job for tenant_id and schedule it. Returns the job id.
+    Raises JobQueueFull when INGEST_MAX_PENDING jobs are already in flight and
+    DuplicateFileError when this exact file was ingested before.
+    """
+    if not _slots.acquire(blocking=False):
+        raise JobQueueFull(f"{INGEST_MAX_PENDING} uploads already in progress, try again later")
+    try:
+        os.makedirs(UPLOAD_SPOOL_DIR, exist_ok=True)
+        job_id = uuid.uuid4().hex
+        path = os.path.join(UPLOAD_SPOOL_DIR, f"{job_id}.csv")
+        # Hash while spooling so the file is read only once here
+        digest = hashlib.sha256()
+        try:
+            with open(path, "wb") as out:
+                for block in iter(lambda: fileobj.read(1024 * 1024), b""):
+                    digest.update(block)
+                    out.write(block)
+            sha256 = digest.hexdigest()
+
+            db = SessionLocal()
+            try:
+                check_new_file(db, sha256, tenant_id)
+            finally:
+                db.close()
+        except Exception:
+            os.remove(path)
+            raise
+
+        db = SessionLocal()
+        try:
+            db.add(IngestJob(
+                id=job_id, tenant_id=tenant_id, status="queued", filename=filename,
+                worker_pid=os.getpid(), created_at=datetime.utcnow(),
+            ))
+            db.commit()
+        finally:
+            db.close()
+
+        _executor.submit(_run_job, job_id, path, classify, sha256, filename, tenant_id)
+    except Exception:
+        _slots.release()
+        raise
+    return job_id
+
+
+def _run_job(job_id: str, path: str, classify, sha256: str = None, filename: str = None,
+             tenant_id: str = DEFAULT_TENANT):
+    db = SessionLocal()
+    try:
+        job = db.get(IngestJob, job_id)
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        db.commit()
+
+        def on_progress(summary):
+            job.rows_total = summary["rows_total"]
+            job.rows_done = summary["rows_saved"]
+            job.rows_failed = summary["rows_failed"]
+            job.rows_duplicate = summary["rows_duplicate"]
+            job.rows_per_sec = summary.get("rows_per_sec")
+            job.errors = json.dumps(summary["errors"])
+            db.commit()
+
+        with open(path, "rb") as fh:
+            summary = ingest_csv(fh, db, classify=classify, on_progress=on_progress, tenant_id=tenant_id)
+        on_progress(summary)
+        if sha256:
+            record_file(db, sha256, filename, summary, tenant_id)
+        job.status = "completed"
+    except Exception as e:
+        if isinstance(e, CSVFormatError):
+            logger.warning("ingest job %s rejected: %s", job_id, e)
+        else:
+            logger.exception("ingest job %s failed", job_id)
+        db.rollback()
+        job = db.get(IngestJob, job_id)
+        if job is not None:
+            job.status = "failed"
+            job.error = str(e)
+    finally:
+        job = db.get(IngestJob, job_id)
+        if job is not None:
+            job.finished_at = datetime.utcnow()
+            db.commit()
+        db.close()
+        _slots.release()
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def get_job(db, job_id: str, tenant_id: str = DEFAULT_TENANT):
+    """
+    The job, or None if it does not exist or belongs to another tenant.
+    """
+    job = db.get(IngestJob, job_id)
+    return job if job is not None and job.tenant_id == tenant_id else None
+
+
+def _pid_alive(pid) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def mark_interrupted_jobs() -> int:
+    """
+    On startup, flag jobs whose worker process is gone so pollers don't wait forever.
+    Jobs still owned by a live sibling worker are left alone.
+    """
+    db = SessionLocal()
+    try:
+        stale = db.query(IngestJob).filter(IngestJob.status.in_(["queued", "running"])).all()
+        count = 0
+        for job in stale:
+            if job.worker_pid != os.getpid() and _pid_alive(job.worker_pid):
+                continue
+            job.status = "interrupted"
+            job.error = "Server restarted before the job finished; please upload again."
+            job.finished_at = datetime.utcnow()
+            count += 1
+        db.commit()
+        return count
+    finally:
+        db.close()
@@ -1,10 +1,41 @@
 # backend/app/main.py
-from fastapi import FastAPI
+import os
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel
-from backend.app.models.category_model import classify_transactions
+from backend.app.models import category_model
+from backend.app.models.category_model import classify_transactions, prediction_cache
 from backend.app.api import budgets
+from backend.app import jobs, metrics
+from backend.app.db import SessionLocal
+from backend.app.merchant_tokens import bootstrap_tokens
+from backend.app.spend_summary import bootstrap_summary
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Jobs left queued/running by a previous process will never finish; say so
+    jobs.mark_interrupted_jobs()
+    # Databases created before the spend summary / keyword index existed get them built once
+    db = SessionLocal()
+    try:
+        bootstrap_summary(db)
+        bootstrap_tokens(db)
+    finally:
+        db.close()
+    # Fail now, not on the first upload, if the inference server can't be authenticated to
+    if category_model.INFERENCE_SERVER_ADDRESS:
+        category_model.remote_client()
+    # Load the classifier off the request path; CLASSIFIER_WARMUP=0 defers it to first use
+    if os.getenv("CLASSIFIER_WARMUP", "1") != "0":
+        category_model.warm_up_in_background()
+    yield
 
-app = FastAPI(title="Smart Shopper Agent")
+
+app = FastAPI(title="Smart Shopper Agent", lifespan=lifespan)
 
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -17,6 +48,31 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    # Latency is measured to the response headers; streamed bodies finish later
+    sampler = metrics.maybe_start_profiler()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        elapsed = time.perf_counter() - start
+        route = metrics.route_label(request.scope)
+        metrics.observe_request(request.method, route, status, elapsed)
+        metrics.finish_profiler(sampler, route, elapsed)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """
+    Stage timings, row counters and per-route latency histograms (Prometheus text format).
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 class Transactions(BaseModel):
     descriptions: list[str]
 
@@ -25,6 +81,25 @@ def categorize(transactions: Transactions):
     results = classify_transactions(transactions.descriptions)
     return {"categories": results}
 
+@app.get("/categorize/cache-stats")
+def categorize_cache_stats():
+    return prediction_cache.stats()
+
+@app.get("/categorize/stats")
+def categorize_stats():
+    """
+    Rows answered by each tier (keyword rules / prediction cache / model) since startup.
+    """
+    return category_model.classifier_stats()
+
+@app.get("/ready")
+def ready():
+    """
+    Readiness probe: 200 once the classifier is loaded, 503 while it is still loading.
+    """
+    state = category_model.readiness()
+    return JSONResponse(state, status_code=200 if state["ready"] else 503)
+
 @app.get("/")
 def root():
     return {"message": "Smart Shopper API is running 🚀"}
@@ -32,4 +107,4 @@ app.include_router(budgets.router, prefix="/budgets", tags=["budgets"])
 
 @app.get("/")
 def root():
-    return {"message": "Smart Shopper Agent is running!"}
\ No newline at end of file
+    return {"message": "Smart Shopper Agent is running!"}
@@ -0,0 +1,95 @@
+# backend/app/merchant_tokens.py
+"""
+Keyword index behind the "top merchants" analytics, maintained on write.
+
+Counts use the same rule /analytics always applied to descriptions: lowercase,
+split on whitespace, keep words longer than 3 characters, count every occurrence.
+Each tenant has its own counts.
+"""
+
+from collections import Counter
+
+from sqlalchemy.orm import Session
+
+from backend.app.data_version import bump_data_version
+from backend.app.db import dialect_insert
+from backend.app.models.merchant_token_model import MerchantToken
+from backend.app.models.transaction_model import Transaction
+from backend.app.spend_summary import filter_transactions
+from backend.app.tenancy import DEFAULT_TENANT
+
+MIN_TOKEN_LENGTH = 4
+
+
+def description_tokens(description):
+    return [word for word in (description or "").lower().split() if len(word) >= MIN_TOKEN_LENGTH]
+
+
+def apply_tokens(db: Session, rows, tenant_id: str = DEFAULT_TENANT) -> None:
+    """
+    Add the keywords of inserted transaction mappings of tenant_id to the index. Does not commit.
+    """
+    counts = Counter()
+    for row in rows:
+        counts.update(description_tokens(row.get("description")))
+    if not counts:
+        return
+    stmt = dialect_insert(db, MerchantToken.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["tenant_id", "token"],
+        set_={"count": MerchantToken.count + stmt.excluded.count},
+    )
+    db.execute(stmt, [{"tenant_id": tenant_id, "token": token, "count": n} for token, n in counts.items()])
+
+
+def clear_tokens(db: Session, tenant_id: str = DEFAULT_TENANT) -> None:
+    db.query(MerchantToken).filter(MerchantToken.tenant_id == tenant_id).delete()
+
+
+def rebuild_tokens(db: Session, batch_size: int = 10000) -> int:
+    """
+    Recompute the index of every tenant from raw descriptions. Commits; returns
+    distinct (tenant, token) pairs.
+    """
+    tenants = {tenant for (tenant,) in db.query(MerchantToken.tenant_id).distinct()}
+    db.query(MerchantToken).delete()
+    counts = Counter()
+    for tenant, description in db.query(Transaction.tenant_id, Transaction.description).yield_per(batch_size):
+        counts.update((tenant, token) for token in description_tokens(description))
+    if counts:
+        db.execute(MerchantToken.__table__.insert(), [
+            {"tenant_id": tenant, "token": token, "count": n} for (tenant, token), n in counts.items()
+        ])
+    for tenant in tenants | {tenant for tenant, _ in counts}:
+        bump_data_version(db, tenant)
+    db.commit()
+    return len(counts)
+
+
+def bootstrap_tokens(db: Session) -> bool:
+    if db.query(MerchantToken.token).first() is None and db.query(Transaction.id).first() is not None:
+        rebuild_tokens(db)
+        return True
+    return False
+
+
+def top_tokens(db: Session, limit: int = 5, filters=None, tenant_id: str = DEFAULT_TENANT):
+    """
+    Most frequent keywords of a tenant. With filters, counts are taken from the matching
+    transactions only (an indexed range scan) instead of the tenant's index.
+    """
+    if filters is not None and (filters.date_from or filters.date_to or filters.category is not None):
+        counts = Counter()
+        query = filter_transactions(db.query(Transaction.description), filters, tenant_id)
+        for (description,) in query.yield_per(10000):
+            counts.update(description_tokens(description))
+        return sorted(counts.items(), key=lambda x: (-x[1], x[0]))[:limit]
+
+    rows = (
+        db.query(MerchantToken.token, MerchantToken.count)
+        .filter(MerchantToken.tenant_id == tenant_id, MerchantToken.count > 0)
+        .order_by(MerchantToken.count.desc(), MerchantToken.token)
+        .limit(limit)
+        .all()
+    )
+    return [(token, int(count)) for token, count in rows]
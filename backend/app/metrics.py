@@ -0,0 +1,216 @@
+# backend/app/metrics.py
+"""
+In-process counters and latency histograms, rendered in the Prometheus text format.
+
+  stage(name)        times one hot-path stage (parse, validate, dedupe, classify,
+                     tokenize, infer, persist, aggregate) and counts the rows it handled
+  record(name, ...)  the same for timings accumulated by hand (e.g. across micro-batches)
+  observe_request()  per-route request latency, called by the middleware in main.py
+  render()           text for GET /metrics
+
+Kept dependency-free (no prometheus_client); with several uvicorn workers each
+process exposes its own numbers.
+
+Slow-request profiling is opt-in: with PROFILE_SLOW_MS > 0, a PROFILE_SAMPLE_RATE
+fraction of requests is stack-sampled every PROFILE_INTERVAL_MS, and requests slower
+than PROFILE_SLOW_MS get their folded stacks written to PROFILE_DIR (flamegraph.pl
+input). The sampler sees every thread, so concurrent requests show up too.
+"""
+
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from types import SimpleNamespace
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("parse", "validate", "dedupe", "classify", "tokenize", "infer", "persist", "aggregate")
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", "0"))
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0.05"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "backend/data/profiles")
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labels: tuple, buckets: tuple):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["buckets"][i] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label_values, series in sorted(self._series.items()):
+                base = _labels(self.labels, label_values)
+                for bound, count in zip(self.buckets, series["buckets"]):
+                    lines.append(f"{self.name}_bucket{_labels(self.labels + ('le',), label_values + (bound,))} {count}")
+                lines.append(f"{self.name}_bucket{_labels(self.labels + ('le',), label_values + ('+Inf',))} {series['count']}")
+                lines.append(f"{self.name}_sum{base} {series['sum']:.6f}")
+                lines.append(f"{self.name}_count{base} {series['count']}")
+        return lines
+
+
+class CounterMetric:
+    def __init__(self, name: str, help_text: str, labels: tuple):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values = Counter()
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float, *label_values):
+        with self._lock:
+            self._values[label_values] += amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labels, label_values)} {value}")
+        return lines
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+stage_seconds = Histogram("smartbudget_stage_duration_seconds", "Time spent in a hot-path stage.",
+                          ("stage",), STAGE_BUCKETS)
+stage_rows = CounterMetric("smartbudget_stage_rows_total", "Rows processed by a hot-path stage.", ("stage",))
+request_seconds = Histogram("smartbudget_http_request_duration_seconds", "HTTP request latency by route.",
+                            ("method", "route", "status"), REQUEST_BUCKETS)
+slow_profiles = CounterMetric("smartbudget_slow_request_profiles_total", "Slow requests profiled to disk.",
+                              ("route",))
+REGISTRY = [stage_seconds, stage_rows, request_seconds, slow_profiles]
+
+
+def record(name: str, seconds: float, rows: int = 0):
+    stage_seconds.observe(seconds, name)
+    if rows:
+        stage_rows.inc(rows, name)
+
+
+@contextmanager
+def stage(name: str, rows: int = 0):
+    """
+    Time the block as stage `name`; set .rows on the yielded object if the count is only known inside.
+    """
+    timing = SimpleNamespace(rows=rows)
+    start = time.perf_counter()
+    try:
+        yield timing
+    finally:
+        record(name, time.perf_counter() - start, timing.rows)
+
+
+def route_label(scope) -> str:
+    """
+    Templated path for the matched route ("/budgets/jobs/{job_id}"), so ids don't explode series.
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    # Routes of included routers only know their own part of the path; take the prefix from the URL
+    template = [part for part in getattr(route, "path_format", route.path).split("/") if part]
+    actual = [part for part in scope["path"].split("/") if part]
+    return "/" + "/".join(actual[:max(len(actual) - len(template), 0)] + template)
+
+
+def observe_request(method: str, route: str, status: int, seconds: float):
+    request_seconds.observe(seconds, method, route, str(status))
+
+
+def render() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+class StackSampler:
+    """
+    Samples every thread's stack on a background thread until stop(); folded output.
+    """
+
+    def __init__(self, interval_ms: float = PROFILE_INTERVAL_MS):
+        self.interval = interval_ms / 1000
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(f"{frame.f_code.co_name} ({os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def maybe_start_profiler():
+    """
+    A started StackSampler for a sampled request, or None when profiling is off / not sampled.
+    """
+    if PROFILE_SLOW_MS <= 0 or random.random() >= PROFILE_SAMPLE_RATE:
+        return None
+    return StackSampler().start()
+
+
+def finish_profiler(sampler, route: str, seconds: float):
+    if sampler is None:
+        return None
+    sampler.stop()
+    if seconds * 1000 < PROFILE_SLOW_MS:
+        return None
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    safe_route = route.strip("/").replace("/", "_").replace("{", "").replace("}", "") or "root"
+    path = os.path.join(PROFILE_DIR, f"{datetime.utcnow():%Y%m%dT%H%M%S%f}_{safe_route}.folded")
+    with open(path, "w") as fh:
+        fh.write(sampler.folded())
+    slow_profiles.inc(1, route)
+    logger.warning("slow request %s took %.0f ms; stack samples written to %s", route, seconds * 1000, path)
+    return path
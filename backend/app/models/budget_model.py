@@ -1,9 +1,17 @@
-from sqlalchemy import Column, Integer, String, Float
+from sqlalchemy import Column, Integer, String, Float, Index, text
 from backend.app.db import Base
+from backend.app.tenancy import DEFAULT_TENANT
 
 class Budget(Base):
     __tablename__ = "budgets"
 
     id = Column(Integer, primary_key=True, index=True)
-    category = Column(String, unique=True, index=True, nullable=False)
+    # Owner; see tenancy.py
+    tenant_id = Column(String, nullable=False, default=DEFAULT_TENANT, server_default=text(f"'{DEFAULT_TENANT}'"))
+    category = Column(String, nullable=False)
     limit = Column(Float, nullable=False)
+
+    __table_args__ = (
+        # One limit per category per tenant; also the upsert conflict target
+        Index("ux_budgets_tenant_category", "tenant_id", "category", unique=True),
+    )
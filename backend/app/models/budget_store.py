@@ -0,0 +1,70 @@
+# backend/app/models/budget_store.py
+"""
+Set-based budget writes: one INSERT ... ON CONFLICT(tenant_id, category) DO UPDATE per
+batch instead of a SELECT/commit/refresh round trip per budget. Every function acts on
+one tenant's budgets only.
+"""
+
+from sqlalchemy.orm import Session
+
+from backend.app.data_version import bump_data_version
+from backend.app.db import dialect_insert
+from backend.app.models.budget_model import Budget
+from backend.app.tenancy import DEFAULT_TENANT
+
+
+def upsert_budgets(db: Session, items, tenant_id: str = DEFAULT_TENANT) -> list:
+    """
+    Insert or update (category, limit) pairs in one statement; the last limit wins
+    for repeated categories. Does not commit. Returns the Budget rows in input order.
+    """
+    limits = {}
+    for category, limit in items:
+        limits[category] = limit
+    if not limits:
+        return []
+
+    stmt = dialect_insert(db, Budget.__table__)
+    stmt = stmt.on_conflict_do_update(index_elements=["tenant_id", "category"], set_={"limit": stmt.excluded.limit})
+    db.execute(stmt, [{"tenant_id": tenant_id, "category": c, "limit": l} for c, l in limits.items()])
+    bump_data_version(db, tenant_id)
+
+    rows = (
+        db.query(Budget)
+        .filter(Budget.tenant_id == tenant_id, Budget.category.in_(list(limits)))
+        .populate_existing()
+        .all()
+    )
+    by_category = {b.category: b for b in rows}
+    return [by_category[category] for category, _ in items]
+
+
+def delete_budgets(db: Session, categories, tenant_id: str = DEFAULT_TENANT) -> int:
+    """
+    Delete the given categories in one statement. Does not commit.
+    """
+    categories = list(set(categories))
+    if not categories:
+        return 0
+    deleted = (
+        db.query(Budget)
+        .filter(Budget.tenant_id == tenant_id, Budget.category.in_(categories))
+        .delete(synchronize_session=False)
+    )
+    bump_data_version(db, tenant_id)
+    return deleted
+
+
+def replace_budgets(db: Session, items, tenant_id: str = DEFAULT_TENANT) -> list:
+    """
+    Make the tenant's budgets exactly `items`: delete every other category, upsert these.
+    Does not commit.
+    """
+    items = list(items)
+    keep = {category for category, _ in items}
+    query = db.query(Budget).filter(Budget.tenant_id == tenant_id)
+    if keep:
+        query = query.filter(Budget.category.notin_(keep))
+    query.delete(synchronize_session=False)
+    bump_data_version(db, tenant_id)
+    return upsert_budgets(db, items, tenant_id)
@@ -1,42 +1,261 @@
-from transformers import DistilBertTokenizerFast, DistilBertForSequenceClassification
-import torch
-import joblib
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
 import os
-from transformers import DistilBertTokenizerFast, DistilBertForSequenceClassification
+import threading
+import time
+from types import SimpleNamespace
+
+from backend.app import metrics
+from backend.app.models.inference_backends import load_backend, stub_classifier
+from backend.app.models.merchant_rules import load_rules
+from backend.app.models.prediction_cache import cache_from_env, normalize_description, read_model_version
 model_path = "backend/app/models/txn_classifier"
 
-#def keyword_override(text):
-#    s = text.lower()
-#    if any(k in s for k in ["zomato", "swiggy", #"dominos", "pizza", "restaurant", "eat", "meal"]):
-#        return "Food & Beverage"
-#    if any(k in s for k in ["netflix", "hotstar", #"prime", "spotify", "pvr", "movie", "cinema", "youtube #premium"]):
-#        return "Entertainment"
-#    if any(k in s for k in ["uber", "ola", "cab", "taxi", #"metro", "bus", "fuel", "petrol", "parking"]):
-#        return "Transport"
-#    return None
-
-
-tokenizer = DistilBertTokenizerFast.from_pretrained(model_path)
-model = DistilBertForSequenceClassification.from_pretrained(model_path)
-label_encoder = joblib.load(os.path.join(model_path, "label_encoder.pkl"))
-
-# 🔹 Ensure the model runs on CPU (or GPU if available)
-device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-model.to(device)
-model.eval()
-
-def classify_transactions(descriptions: list[str]):
-    # apply keyword override first
-    #kw = keyword_override(description)
-    #if kw:
-    #     use kw as category (skip model)
-
-    inputs = tokenizer(descriptions, padding=True, truncation=True, return_tensors="pt")
-    inputs = {key: val.to(device) for key, val in inputs.items()}
-    with torch.no_grad():
-        outputs = model(**inputs)
-        preds = torch.argmax(outputs.logits, dim=-1)
-    predicted_labels = label_encoder.inverse_transform(preds)
-    results = [{"description": desc, "predicted_category": cat} for desc, cat in zip(descriptions, predicted_labels)]
+# Rows per forward pass. Descriptions are sorted by token length before batching,
+# so each micro-batch is padded only to its own longest row and peak memory stays
+# bounded by batch_size x max_length no matter how big the upload is.
+INFERENCE_BATCH_SIZE = int(os.getenv("INFERENCE_BATCH_SIZE", "64"))
+
+# torch (fp32), int8 (dynamic quantization), onnx (onnxruntime) or stub (benchmarks);
+# see inference_backends.py
+CLASSIFIER_BACKEND = os.getenv("CLASSIFIER_BACKEND", "torch")
+
+# When set, classification is delegated to a shared inference server
+# (backend/app/inference_server.py) instead of loading the model in this process
+INFERENCE_SERVER_ADDRESS = os.getenv("INFERENCE_SERVER_ADDRESS")
+
+prediction_cache = cache_from_env()
+merchant_rules = load_rules()
+
+# Rows answered by each tier: keyword rules, prediction cache, model
+tier_counts = {"rules": 0, "cache": 0, "model": 0}
+_tier_lock = threading.Lock()
+
+
+def _count_tier(tier: str, rows: int):
+    with _tier_lock:
+        tier_counts[tier] += rows
+
+
+def classifier_stats() -> dict:
+    total = sum(tier_counts.values())
+    return {
+        "rows": total,
+        "tiers": dict(tier_counts),
+        "tier_fractions": {k: round(v / total, 4) for k, v in tier_counts.items()} if total else None,
+        "merchant_keywords": len(merchant_rules),
+        "cache": prediction_cache.stats(),
+    }
+
+
+# The model is loaded lazily: importing this module must stay cheap so the API can
+# answer budget/analytics requests while torch and the weights are still loading.
+_classifier = None
+_load_lock = threading.Lock()
+_load_state = {"loading": False, "error": None, "load_seconds": None}
+
+
+def build_classifier(backend: str = "torch"):
+    """
+    Load tokenizer, label encoder and the given inference backend (no module-level caching).
+    """
+    if backend == "stub":
+        return stub_classifier()
+
+    import joblib
+    from transformers import DistilBertTokenizerFast
+
+    tokenizer = DistilBertTokenizerFast.from_pretrained(model_path)
+    label_encoder = joblib.load(os.path.join(model_path, "label_encoder.pkl"))
+    runner = load_backend(backend, model_path)
+    return SimpleNamespace(
+        tokenizer=tokenizer,
+        runner=runner,
+        label_encoder=label_encoder,
+        # Predictions are cached per model version and backend, so retraining or
+        # switching to a quantized model never serves another model's labels
+        version=f"{read_model_version(model_path)}:{runner.name}",
+    )
+
+
+def load_classifier():
+    """
+    Load tokenizer, model and label encoder once; later calls return the same objects.
+    Concurrent callers block until the first load finishes.
+    """
+    global _classifier
+    if _classifier is not None:
+        return _classifier
+    with _load_lock:
+        if _classifier is not None:
+            return _classifier
+        _load_state["loading"] = True
+        start = time.perf_counter()
+        try:
+            _classifier = build_classifier(CLASSIFIER_BACKEND)
+            _load_state["error"] = None
+        except Exception as e:
+            _load_state["error"] = str(e)
+            raise
+        finally:
+            _load_state["loading"] = False
+            _load_state["load_seconds"] = round(time.perf_counter() - start, 3)
+    return _classifier
+
+
+_remote_client = None
+
+
+def remote_client():
+    global _remote_client
+    if _remote_client is None:
+        from backend.app.inference_server import InferenceClient
+
+        _remote_client = InferenceClient(INFERENCE_SERVER_ADDRESS)
+    return _remote_client
+
+
+def warm_up_in_background():
+    """
+    Start loading the classifier on a daemon thread; failures are reported by readiness().
+    Nothing to load when an inference server is configured.
+    """
+    if INFERENCE_SERVER_ADDRESS:
+        return None
+
+    def _warm():
+        try:
+            load_classifier()
+        except Exception:
+            pass
+
+    thread = threading.Thread(target=_warm, name="classifier-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def is_ready() -> bool:
+    return _classifier is not None
+
+
+def readiness() -> dict:
+    if INFERENCE_SERVER_ADDRESS:
+        try:
+            server = remote_client().ping()
+            return {"ready": bool(server.get("ready")), "mode": "remote", "server": server, "error": None}
+        except Exception as e:
+            return {"ready": False, "mode": "remote", "server": None, "error": str(e)}
+    return {
+        "ready": is_ready(),
+        "loading": _load_state["loading"],
+        "load_seconds": _load_state["load_seconds"],
+        "mode": "local",
+        "error": _load_state["error"],
+        "backend": CLASSIFIER_BACKEND,
+        "model_version": _classifier.version if _classifier is not None else None,
+    }
+
+
+def _length_bucketed_batches(encodings, batch_size):
+    """
+    Yield lists of row indices, grouped so rows of similar token length share a batch.
+    """
+    order = sorted(range(len(encodings["input_ids"])), key=lambda i: len(encodings["input_ids"][i]))
+    for start in range(0, len(order), batch_size):
+        yield order[start:start + batch_size]
+
+
+def predict_label_ids(descriptions: list[str], batch_size: int = None, clf=None):
+    """
+    Run the classifier over descriptions in length-sorted micro-batches.
+    Returns predicted label ids in the original input order.
+    """
+    clf = clf or load_classifier()
+    batch_size = batch_size or INFERENCE_BATCH_SIZE
+    # Tokenize once without padding; each micro-batch is padded on its own below
+    start = time.perf_counter()
+    encodings = clf.tokenizer(descriptions, truncation=True)
+    tokenize_seconds = time.perf_counter() - start
+    infer_seconds = 0.0
+    label_ids = [0] * len(descriptions)
+
+    for indices in _length_bucketed_batches(encodings, batch_size):
+        start = time.perf_counter()
+        batch = clf.tokenizer.pad(
+            {
+                "input_ids": [encodings["input_ids"][i] for i in indices],
+                "attention_mask": [encodings["attention_mask"][i] for i in indices],
+            },
+            return_tensors=clf.runner.tensor_type,
+        )
+        padded = time.perf_counter()
+        preds = clf.runner.run(dict(batch))
+        tokenize_seconds += padded - start
+        infer_seconds += time.perf_counter() - padded
+        # Scatter predictions back to where each row came from
+        for i, pred in zip(indices, preds):
+            label_ids[i] = pred
+    metrics.record("tokenize", tokenize_seconds, len(descriptions))
+    metrics.record("infer", infer_seconds, len(descriptions))
+    return label_ids
+
+
+def classify_transactions(descriptions: list[str], batch_size: int = None, use_rules: bool = True):
+    """
+    Keyword rules first; only unmatched descriptions go to the cache/model tier,
+    locally or on the shared inference server.
+    """
+    if not descriptions:
+        return []
+
+    results = [None] * len(descriptions)
+    unmatched = []
+    if use_rules:
+        for i, desc in enumerate(descriptions):
+            category = merchant_rules.match(desc)
+            if category is None:
+                unmatched.append(i)
+            else:
+                results[i] = {"description": desc, "predicted_category": category}
+        _count_tier("rules", len(descriptions) - len(unmatched))
+    else:
+        unmatched = list(range(len(descriptions)))
+    if not unmatched:
+        return results
+
+    remaining = [descriptions[i] for i in unmatched]
+    if INFERENCE_SERVER_ADDRESS:
+        predicted = remote_client().classify(remaining)
+    else:
+        predicted = classify_locally(remaining, batch_size=batch_size)
+    for i, result in zip(unmatched, predicted):
+        results[i] = result
+    return results
+
+
+def classify_locally(descriptions: list[str], batch_size: int = None):
+    """
+    Cache + model tier. Used directly by the inference server.
+    """
+    if not descriptions:
+        return []
+
+    clf = load_classifier()
+    keys = [normalize_description(desc) for desc in descriptions]
+    known = prediction_cache.get_many(clf.version, keys)
+
+    # Only distinct cache misses reach the model
+    missing = {}
+    for key, desc in zip(keys, descriptions):
+        if key not in known and key not in missing:
+            missing[key] = desc
+    model_rows = sum(1 for key in keys if key in missing)
+    _count_tier("cache", len(descriptions) - model_rows)
+    _count_tier("model", model_rows)
+    if missing:
+        label_ids = predict_label_ids(list(missing.values()), batch_size=batch_size)
+        predicted_labels = [str(label) for label in clf.label_encoder.inverse_transform(label_ids)]
+        fresh = dict(zip(missing.keys(), predicted_labels))
+        prediction_cache.put_many(clf.version, fresh.items())
+        known.update(fresh)
+
+    results = [{"description": desc, "predicted_category": known[key]} for desc, key in zip(descriptions, keys)]
     return results
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, text
+from backend.app.db import Base
+from backend.app.tenancy import DEFAULT_TENANT
+
+class DataVersion(Base):
+    """
+    One row per tenant whose version goes up with every write that can change that tenant's dashboard reads.
+    """
+    __tablename__ = "data_version"
+
+    tenant_id = Column(String, primary_key=True, default=DEFAULT_TENANT, server_default=text(f"'{DEFAULT_TENANT}'"))
+    version = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,133 @@
+# backend/app/models/inference_backends.py
+"""
+Interchangeable CPU inference backends for the transaction classifier.
+
+  torch  - fp32 DistilBertForSequenceClassification (the original path)
+  int8   - dynamically quantized Linear layers (torch.ao.quantization.quantize_dynamic)
+  onnx   - ONNX export of the fp32 model run with onnxruntime
+  stub   - weightless stand-in (see stub_classifier) for benchmarks and CI; never for real data
+
+Each backend exposes run(batch) -> list of label ids, where batch is the output of
+tokenizer.pad(..., return_tensors=backend.tensor_type). Artifacts for int8 and onnx
+are produced by backend/app/export_classifier.py.
+"""
+
+import os
+import zlib
+from types import SimpleNamespace
+
+BACKENDS = ("torch", "int8", "onnx")
+INT8_FILE = "model_int8.pt"
+ONNX_FILE = "model.onnx"
+
+
+def load_backend(name: str, model_path: str):
+    if name == "stub":
+        return _load_stub()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown classifier backend '{name}', expected one of {BACKENDS}")
+    if name == "onnx":
+        return _load_onnx(model_path)
+    return _load_torch(model_path, quantized=(name == "int8"))
+
+
+def quantize_dynamic_int8(model):
+    import torch
+
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _load_torch(model_path, quantized):
+    import torch
+    from transformers import DistilBertForSequenceClassification
+
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    int8_path = os.path.join(model_path, INT8_FILE)
+    if quantized:
+        # Quantized kernels are CPU-only
+        device = torch.device("cpu")
+        if os.path.exists(int8_path):
+            model = torch.load(int8_path, map_location=device, weights_only=False)
+        else:
+            model = quantize_dynamic_int8(DistilBertForSequenceClassification.from_pretrained(model_path))
+    else:
+        model = DistilBertForSequenceClassification.from_pretrained(model_path)
+    model.to(device)
+    model.eval()
+
+    def run(batch):
+        batch = {key: val.to(device) for key, val in batch.items()}
+        with torch.no_grad():
+            return torch.argmax(model(**batch).logits, dim=-1).tolist()
+
+    return SimpleNamespace(name="int8" if quantized else "torch", tensor_type="pt", run=run, model=model, device=device)
+
+
+def _load_onnx(model_path):
+    import onnxruntime as ort
+
+    onnx_path = os.path.join(model_path, ONNX_FILE)
+    if not os.path.exists(onnx_path):
+        raise FileNotFoundError(f"{onnx_path} not found; run python -m backend.app.export_classifier first")
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    session = ort.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+    input_names = {i.name for i in session.get_inputs()}
+
+    def run(batch):
+        feeds = {key: val.astype("int64") for key, val in batch.items() if key in input_names}
+        (logits,) = session.run(["logits"], feeds)
+        return logits.argmax(axis=-1).tolist()
+
+    return SimpleNamespace(name="onnx", tensor_type="np", run=run, model=None, device=None)
+
+
+STUB_LABELS = ("Bills", "Entertainment", "Food & Beverage", "Groceries", "Health", "Shopping", "Transport")
+
+
+class _StubTokenizer:
+    """
+    Just enough of the tokenizer interface for predict_label_ids and the single-shot
+    benchmark: hashed whitespace tokens.
+    """
+
+    def __call__(self, texts, padding=False, truncation=True, max_length=64, return_tensors=None):
+        input_ids = [[zlib.crc32(word.encode()) % 30522 for word in str(text).lower().split()][:max_length] or [0]
+                     for text in texts]
+        encodings = {"input_ids": input_ids, "attention_mask": [[1] * len(ids) for ids in input_ids]}
+        # padding=True pads to the longest text, as the real tokenizer does
+        return self.pad(encodings) if padding else encodings
+
+    def pad(self, features, return_tensors=None):
+        width = max(len(ids) for ids in features["input_ids"])
+        return {
+            "input_ids": [ids + [0] * (width - len(ids)) for ids in features["input_ids"]],
+            "attention_mask": [mask + [0] * (width - len(mask)) for mask in features["attention_mask"]],
+        }
+
+
+class _StubLabelEncoder:
+    classes_ = STUB_LABELS
+
+    def inverse_transform(self, label_ids):
+        return [STUB_LABELS[i] for i in label_ids]
+
+
+def _load_stub():
+    def run(batch):
+        # Same first word -> same label, so merchants get consistent categories
+        return [ids[0] % len(STUB_LABELS) for ids in batch["input_ids"]]
+
+    return SimpleNamespace(name="stub", tensor_type=None, run=run, model=None, device=None)
+
+
+def stub_classifier():
+    """
+    Tokenizer, runner and label encoder that need neither transformers nor the weights.
+    """
+    return SimpleNamespace(
+        tokenizer=_StubTokenizer(),
+        runner=_load_stub(),
+        label_encoder=_StubLabelEncoder(),
+        version="stub",
+    )
@@ -0,0 +1,24 @@
+# backend/app/models/job_model.py
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, text
+from backend.app.db import Base
+from backend.app.tenancy import DEFAULT_TENANT
+
+class IngestJob(Base):
+    __tablename__ = "ingest_jobs"
+
+    id = Column(String, primary_key=True, index=True)
+    # Owner; see tenancy.py
+    tenant_id = Column(String, nullable=False, default=DEFAULT_TENANT, server_default=text(f"'{DEFAULT_TENANT}'"))
+    status = Column(String, nullable=False, default="queued")  # queued | running | completed | failed | interrupted
+    filename = Column(String, nullable=True)
+    rows_total = Column(Integer, nullable=False, default=0)
+    rows_done = Column(Integer, nullable=False, default=0)
+    rows_failed = Column(Integer, nullable=False, default=0)
+    rows_duplicate = Column(Integer, nullable=True, default=0)
+    rows_per_sec = Column(Float, nullable=True)
+    errors = Column(Text, nullable=True)  # JSON list of row-level errors
+    error = Column(Text, nullable=True)
+    worker_pid = Column(Integer, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
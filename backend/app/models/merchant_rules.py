@@ -0,0 +1,53 @@
+# backend/app/models/merchant_rules.py
+"""
+First classification tier: merchant keywords -> category, checked before the model.
+
+All keywords from the table are compiled into one alternation regex (longest first,
+whole words, case-insensitive), so a description is scanned once no matter how many
+merchants are configured. The table is a JSON object {category: [keywords]} read
+from MERCHANT_RULES_PATH; set it to an empty string to disable the tier.
+"""
+
+import json
+import os
+import re
+
+DEFAULT_RULES_PATH = "backend/app/models/merchant_rules.json"
+
+
+class MerchantRules:
+    def __init__(self, table: dict):
+        self.keyword_to_category = {}
+        for category, keywords in table.items():
+            for keyword in keywords:
+                self.keyword_to_category[" ".join(keyword.lower().split())] = category
+        self._pattern = None
+        if self.keyword_to_category:
+            # Longest first so "prime video" wins over a shorter overlapping keyword
+            alternation = "|".join(
+                re.escape(k).replace(r"\ ", r"\s+")
+                for k in sorted(self.keyword_to_category, key=len, reverse=True)
+            )
+            self._pattern = re.compile(rf"\b(?:{alternation})\b", re.IGNORECASE)
+
+    def match(self, description):
+        """
+        Category for the first keyword found in description, or None.
+        """
+        if self._pattern is None or not description:
+            return None
+        found = self._pattern.search(description)
+        if found is None:
+            return None
+        return self.keyword_to_category[" ".join(found.group(0).lower().split())]
+
+    def __len__(self):
+        return len(self.keyword_to_category)
+
+
+def load_rules(path: str = None) -> MerchantRules:
+    path = os.getenv("MERCHANT_RULES_PATH", DEFAULT_RULES_PATH) if path is None else path
+    if not path or not os.path.exists(path):
+        return MerchantRules({})
+    with open(path) as fh:
+        return MerchantRules(json.load(fh))
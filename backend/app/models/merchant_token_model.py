@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, Index, text
+from backend.app.db import Base
+from backend.app.tenancy import DEFAULT_TENANT
+
+class MerchantToken(Base):
+    """
+    Occurrence count of each description keyword (> 3 chars, lowercased) across a tenant's transactions.
+    """
+    __tablename__ = "merchant_tokens"
+
+    tenant_id = Column(String, primary_key=True, default=DEFAULT_TENANT, server_default=text(f"'{DEFAULT_TENANT}'"))
+    token = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # Top keywords of one tenant without sorting all of its tokens
+        Index("ix_merchant_tokens_tenant_count", "tenant_id", "count"),
+    )
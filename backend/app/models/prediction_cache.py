@@ -0,0 +1,157 @@
+# backend/app/models/prediction_cache.py
+"""
+Two-tier cache of classifier predictions keyed on (model version, normalized description).
+
+Tier 1 is an in-process LRU with a size limit; tier 2 is an optional SQLite table
+that survives restarts and is shared by every worker on the box. A new model written
+by train_classifier.py gets a new version stamp, so stale predictions never match.
+"""
+
+import os
+import sqlite3
+import threading
+import uuid
+from collections import OrderedDict
+
+VERSION_FILE = "model_version"
+DEFAULT_DISK_PATH = "backend/data/prediction_cache.db"
+
+
+def normalize_description(text: str) -> str:
+    # The tokenizer is uncased and splits on whitespace, so these forms predict identically
+    return " ".join(str(text).lower().split())
+
+
+def read_model_version(model_path: str) -> str:
+    """
+    Return the version stamp of the model in model_path.
+    Falls back to file mtimes for models trained before stamps were written.
+    """
+    stamp = os.path.join(model_path, VERSION_FILE)
+    if os.path.exists(stamp):
+        with open(stamp) as fh:
+            return fh.read().strip()
+    parts = []
+    for name in ("config.json", "model.safetensors", "pytorch_model.bin", "label_encoder.pkl"):
+        path = os.path.join(model_path, name)
+        if os.path.exists(path):
+            parts.append(f"{name}:{os.path.getmtime(path):.0f}")
+    return "|".join(parts) or "unversioned"
+
+
+def write_model_version(model_path: str) -> str:
+    version = uuid.uuid4().hex
+    with open(os.path.join(model_path, VERSION_FILE), "w") as fh:
+        fh.write(version)
+    return version
+
+
+class PredictionCache:
+    def __init__(self, max_size: int = 50000, disk_path: str = None):
+        self.max_size = max_size
+        self.disk_path = disk_path
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if disk_path:
+            os.makedirs(os.path.dirname(disk_path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(disk_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS prediction_cache ("
+                " model_version TEXT NOT NULL,"
+                " description TEXT NOT NULL,"
+                " category TEXT NOT NULL,"
+                " PRIMARY KEY (model_version, description))"
+            )
+            self._conn.commit()
+
+    def get_many(self, version: str, keys) -> dict:
+        """
+        Look up normalized descriptions; returns {key: category} for every hit.
+        """
+        found = {}
+        pending = []
+        with self._lock:
+            for key in keys:
+                if key in found:
+                    continue
+                hit = self._lru.get((version, key))
+                if hit is not None:
+                    self._lru.move_to_end((version, key))
+                    found[key] = hit
+                    self.memory_hits += 1
+                else:
+                    pending.append(key)
+
+            if pending and self._conn is not None:
+                pending = list(dict.fromkeys(pending))
+                # Stay under SQLite's bound-parameter limit
+                for start in range(0, len(pending), 500):
+                    chunk = pending[start:start + 500]
+                    marks = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        f"SELECT description, category FROM prediction_cache"
+                        f" WHERE model_version = ? AND description IN ({marks})",
+                        [version, *chunk],
+                    ).fetchall()
+                    for key, category in rows:
+                        found[key] = category
+                        self._remember(version, key, category)
+                        self.disk_hits += 1
+
+            self.misses += sum(1 for key in set(pending) if key not in found)
+        return found
+
+    def put_many(self, version: str, items) -> None:
+        items = list(items)
+        with self._lock:
+            for key, category in items:
+                self._remember(version, key, category)
+            if self._conn is not None and items:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO prediction_cache (model_version, description, category)"
+                    " VALUES (?, ?, ?)",
+                    [(version, key, category) for key, category in items],
+                )
+                self._conn.commit()
+
+    def invalidate(self, keep_version: str = None) -> None:
+        """
+        Drop every cached prediction not produced by keep_version (all of them if None).
+        """
+        with self._lock:
+            self._lru.clear()
+            if self._conn is not None:
+                self._conn.execute(
+                    "DELETE FROM prediction_cache WHERE model_version IS NOT ?", (keep_version,)
+                )
+                self._conn.commit()
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else None,
+            "memory_entries": len(self._lru),
+            "max_size": self.max_size,
+            "disk_path": self.disk_path,
+        }
+
+    def _remember(self, version, key, category):
+        self._lru[(version, key)] = category
+        self._lru.move_to_end((version, key))
+        while len(self._lru) > self.max_size:
+            self._lru.popitem(last=False)
+
+
+def cache_from_env() -> PredictionCache:
+    # PREDICTION_CACHE_DB="" disables the on-disk tier
+    return PredictionCache(
+        max_size=int(os.getenv("PREDICTION_CACHE_SIZE", "50000")),
+        disk_path=os.getenv("PREDICTION_CACHE_DB", DEFAULT_DISK_PATH) or None,
+    )
@@ -0,0 +1,18 @@
+# backend/app/models/spend_summary_model.py
+from sqlalchemy import Column, Integer, String, Float, text
+from backend.app.db import Base
+from backend.app.tenancy import DEFAULT_TENANT
+
+class SpendSummary(Base):
+    """
+    Running totals per (tenant, year, month, category), maintained on every transaction write.
+    Rows with no date use year=month=0; a NULL category is stored as "".
+    """
+    __tablename__ = "spend_summary"
+
+    tenant_id = Column(String, primary_key=True, default=DEFAULT_TENANT, server_default=text(f"'{DEFAULT_TENANT}'"))
+    year = Column(Integer, primary_key=True)
+    month = Column(Integer, primary_key=True)
+    category = Column(String, primary_key=True)
+    total = Column(Float, nullable=False, default=0.0)
+    count = Column(Integer, nullable=False, default=0)
@@ -1,13 +1,31 @@
 # backend/app/models/transaction_model.py
-from sqlalchemy import Column, Integer, String, Float,Date
+from sqlalchemy import Column, Integer, String, Float, Date, Index, text
 from backend.app.db import Base
+from backend.app.tenancy import DEFAULT_TENANT
 from datetime import datetime
 
 class Transaction(Base):
     __tablename__ = "transactions"
 
     id = Column(Integer, primary_key=True, index=True)
+    # Owner; see tenancy.py
+    tenant_id = Column(String, nullable=False, default=DEFAULT_TENANT, server_default=text(f"'{DEFAULT_TENANT}'"))
     description = Column(String, nullable=False)
     category = Column(String, nullable=True)
     amount = Column(Float, nullable=False)
-    date = Column(Date, nullable=True) 
\ No newline at end of file
+    date = Column(Date, nullable=True)
+    # Hash of normalized description, amount, date and occurrence number; see dedupe.py
+    fingerprint = Column(String, nullable=True)
+
+    # Every index leads with tenant_id, so each tenant's queries range-scan its own slice
+    __table_args__ = (
+        # Date-range scans and per-category monthly grouping
+        Index("ix_transactions_tenant_date_category", "tenant_id", "date", "category"),
+        # Category-scoped range scans and keyset pagination on (date, id)
+        Index("ix_transactions_tenant_category_date_id", "tenant_id", "category", "date", "id"),
+        Index("ix_transactions_tenant_date_id", "tenant_id", "date", "id"),
+        # Incremental analytics export (id > last exported id)
+        Index("ix_transactions_tenant_id", "tenant_id", "id"),
+        # Re-uploaded rows are rejected here; rows from before fingerprinting stay NULL
+        Index("ux_transactions_tenant_fingerprint", "tenant_id", "fingerprint", unique=True),
+    )
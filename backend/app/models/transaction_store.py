@@ -0,0 +1,62 @@
+# backend/app/models/transaction_store.py
+"""
+Bulk persistence for Transaction rows.
+
+Goes through a Core INSERT with a parameter list (executemany) instead of one ORM
+object per row, skipping the unit-of-work bookkeeping that dominates large inserts.
+Each batch also updates the spend summary and the merchant keyword index in the same
+transaction, and the data version is bumped once per call. One call writes one
+tenant's rows.
+"""
+
+import os
+
+from sqlalchemy.orm import Session
+
+from backend.app import metrics
+from backend.app.data_version import bump_data_version
+from backend.app.models.transaction_model import Transaction
+from backend.app.merchant_tokens import apply_tokens
+from backend.app.spend_summary import apply_transactions
+from backend.app.tenancy import DEFAULT_TENANT
+
+INSERT_BATCH_SIZE = int(os.getenv("INSERT_BATCH_SIZE", "5000"))
+
+
+def bulk_insert_transactions(db: Session, rows, batch_size: int = None, commit: bool = False,
+                             tenant_id: str = DEFAULT_TENANT) -> int:
+    """
+    Insert an iterable of mappings with keys description, amount, category, date
+    (and optionally fingerprint) as transactions of tenant_id.
+
+    Rows are sent in batches of batch_size inside the session's current transaction;
+    nothing is committed unless commit=True, so callers can group several calls
+    into one transaction. Returns the number of rows inserted.
+    """
+    batch_size = batch_size or INSERT_BATCH_SIZE
+    # A constant in values() is bound once and applies to every row of the executemany
+    stmt = Transaction.__table__.insert().values(tenant_id=tenant_id)
+    inserted = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            inserted += _write_batch(db, stmt, batch, tenant_id)
+            batch = []
+    if batch:
+        inserted += _write_batch(db, stmt, batch, tenant_id)
+    if inserted:
+        bump_data_version(db, tenant_id)
+    if commit:
+        with metrics.stage("persist"):
+            db.commit()
+    return inserted
+
+
+def _write_batch(db: Session, stmt, batch: list, tenant_id: str) -> int:
+    with metrics.stage("persist", rows=len(batch)):
+        db.execute(stmt, batch)
+    with metrics.stage("aggregate", rows=len(batch)):
+        apply_transactions(db, batch, tenant_id)
+        apply_tokens(db, batch, tenant_id)
+    return len(batch)
@@ -0,0 +1,17 @@
+# backend/app/models/uploaded_file_model.py
+from sqlalchemy import Column, Integer, String, DateTime, text
+from backend.app.db import Base
+from backend.app.tenancy import DEFAULT_TENANT
+
+class UploadedFile(Base):
+    """
+    SHA-256 of every statement a tenant ingested to completion, so an identical re-upload is refused up front.
+    """
+    __tablename__ = "uploaded_files"
+
+    tenant_id = Column(String, primary_key=True, default=DEFAULT_TENANT, server_default=text(f"'{DEFAULT_TENANT}'"))
+    sha256 = Column(String, primary_key=True)
+    filename = Column(String, nullable=True)
+    rows_saved = Column(Integer, nullable=False, default=0)
+    rows_duplicate = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False)
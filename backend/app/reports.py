@@ -0,0 +1,192 @@
+# backend/app/reports.py
+"""
+Generator-based report exports.
+
+Rows are produced straight from the database cursor (yield_per) and encoded in small
+batches, so memory stays constant and the first bytes go out before the query has
+finished. Reports:
+
+  summary  - category, total spent, percentage (from the spend summary)
+  detailed - one row per transaction, ordered by date then id
+  pivot    - one row per month, one column per category
+
+Formats are CSV (optionally gzip-compressed) and Parquet (needs pyarrow).
+"""
+
+import csv
+import io
+import zlib
+
+from backend.app.db import SessionLocal
+from backend.app.tenancy import DEFAULT_TENANT
+from backend.app.models.transaction_model import Transaction
+from backend.app.spend_summary import (
+    category_monthly_totals,
+    category_totals,
+    filter_transactions,
+)
+
+REPORT_TYPES = ("summary", "detailed", "pivot")
+FORMATS = ("csv", "parquet")
+# Rows fetched from the cursor and encoded per output chunk
+STREAM_BATCH_ROWS = 5000
+
+FILENAMES = {
+    "summary": "insights_report",
+    "detailed": "transactions_report",
+    "pivot": "monthly_category_report",
+}
+
+
+def _summary_rows(db, filters, tenant_id):
+    yield ["Category", "Total Spent", "Percentage"]
+    breakdown = category_totals(db, filters=filters, tenant_id=tenant_id)
+    total_spent = sum(total for _, total in breakdown)
+    for cat, total in breakdown:
+        percent = round((total / total_spent) * 100, 2) if total_spent > 0 else 0
+        yield [cat, total, f"{percent}%"]
+
+
+def _detailed_rows(db, filters, tenant_id):
+    yield ["Date", "Description", "Category", "Amount", "ID"]
+    query = filter_transactions(
+        db.query(Transaction.date, Transaction.description, Transaction.category, Transaction.amount, Transaction.id),
+        filters,
+        tenant_id,
+    ).order_by(Transaction.date, Transaction.id)
+    # stream_results keeps the driver from buffering the full result set
+    for txn_date, description, category, amount, txn_id in (
+        query.execution_options(stream_results=True).yield_per(STREAM_BATCH_ROWS)
+    ):
+        yield [txn_date.isoformat() if txn_date else "", description, category, amount, txn_id]
+
+
+def _pivot_rows(db, filters, tenant_id):
+    cells = category_monthly_totals(db, missing_label="Uncategorized", filters=filters, tenant_id=tenant_id)
+    categories = sorted({cat for _, _, cat, _ in cells})
+    yield ["Month"] + categories
+    by_month = {}
+    for year, month, cat, total in cells:
+        by_month.setdefault((year, month), {})[cat] = total
+    for (year, month) in sorted(by_month):
+        label = f"{year}-{month:02d}" if year else "Unknown"
+        yield [label] + [by_month[(year, month)].get(cat, 0.0) for cat in categories]
+
+
+ROW_SOURCES = {"summary": _summary_rows, "detailed": _detailed_rows, "pivot": _pivot_rows}
+
+
+def iter_report_rows(report: str, filters=None, session_factory=SessionLocal, tenant_id: str = DEFAULT_TENANT):
+    """
+    Yield report rows (header first) of one tenant. The generator owns its session because a
+    StreamingResponse keeps iterating after the request's dependencies are closed.
+    """
+    db = session_factory()
+    try:
+        yield from ROW_SOURCES[report](db, filters, tenant_id)
+    finally:
+        db.close()
+
+
+def iter_csv(rows, compress: bool = False):
+    """
+    Encode rows as CSV bytes in STREAM_BATCH_ROWS batches, optionally gzip-compressed.
+    """
+    gz = zlib.compressobj(wbits=31) if compress else None  # wbits=31 -> gzip container
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= STREAM_BATCH_ROWS:
+            data = buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+            data = gz.compress(data) if gz else data
+            if data:
+                yield data
+    data = buffer.getvalue().encode()
+    if gz:
+        data = gz.compress(data) + gz.flush()
+    if data:
+        yield data
+
+
+class _DrainableSink(io.RawIOBase):
+    """
+    Write-only file object whose contents can be taken out as they are written.
+    """
+    def __init__(self):
+        self._chunks = []
+        self._pos = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._pos
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_parquet(rows, compression: str = "snappy"):
+    """
+    Encode rows as Parquet, one row group per STREAM_BATCH_ROWS rows, yielding bytes
+    as each row group is written.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rows = iter(rows)
+    header = [str(name) for name in next(rows)]
+    sink = _DrainableSink()
+    writer = None
+    batch = []
+
+    def flush(batch):
+        nonlocal writer
+        columns = list(zip(*batch)) if batch else [[] for _ in header]
+        table = pa.table({name: list(col) for name, col in zip(header, columns)})
+        if writer is None:
+            # A column that is all-null in the first batch would be typed null; use string
+            schema = pa.schema([
+                field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                for field in table.schema
+            ])
+            writer = pq.ParquetWriter(sink, schema, compression=compression)
+        writer.write_table(table.cast(writer.schema))
+        return sink.drain()
+
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= STREAM_BATCH_ROWS:
+            data = flush(batch)
+            batch = []
+            if data:
+                yield data
+    if batch or writer is None:
+        data = flush(batch)
+        if data:
+            yield data
+    writer.close()
+    data = sink.drain()
+    if data:
+        yield data
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
@@ -0,0 +1,91 @@
+# backend/app/response_cache.py
+"""
+Conditional GET for the dashboard reads.
+
+The ETag is derived from the tenant's data version (data_version.py) plus the tenant,
+path and query, so it changes with the first write after a response was produced. A
+request whose If-None-Match still matches gets a bodiless 304 after one single-row
+read; otherwise the rendered body is served from a small per-process LRU shared by
+all tenants, and only computed on a miss. Bodies of superseded versions are never
+requested again and age out of the LRU; RESPONSE_CACHE_SIZE=0 turns it off, so every
+non-304 read computes its body (the benchmarks measure reads that way). Cache-Control: no-cache makes browsers
+revalidate every time instead of reusing a copy that may be stale, and
+Vary: X-Tenant-ID keeps shared caches from serving one tenant's body to another.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+from backend.app.data_version import read_data_version
+from backend.app.db import run_read
+from backend.app.tenancy import TENANT_HEADER
+
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+
+_bodies = OrderedDict()
+_lock = threading.Lock()
+
+
+def etag_for(version: int, tenant_id: str, request: Request, vary: str = "") -> str:
+    query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+    digest = hashlib.sha1(f"{version}|{tenant_id}|{request.url.path}?{query}|{vary}".encode()).hexdigest()[:24]
+    return f'"{version}-{digest}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _remember(etag: str, body: bytes):
+    if RESPONSE_CACHE_SIZE <= 0:
+        return
+    with _lock:
+        _bodies[etag] = body
+        while len(_bodies) > RESPONSE_CACHE_SIZE:
+            _bodies.popitem(last=False)
+
+
+def _cached(etag: str):
+    with _lock:
+        body = _bodies.get(etag)
+        if body is not None:
+            _bodies.move_to_end(etag)
+        return body
+
+
+async def cached_read(request: Request, db, tenant_id: str, load, *args, vary: str = "",
+                      version_of=None) -> Response:
+    """
+    run_read(db, load, tenant_id, *args) as a JSON response with ETag / If-None-Match
+    handling. vary names any input besides the data and the URL that the body
+    depends on (e.g. today's date). version_of, for loads that may answer from a copy
+    older than the current data (the throttled analytics snapshot), gives the data
+    version a result reflects.
+    """
+    # Version first: a write racing with load() can only make the body newer than its tag
+    version = await run_read(db, read_data_version, tenant_id)
+    etag = etag_for(version, tenant_id, request, vary)
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": TENANT_HEADER}
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    body = _cached(etag)
+    if body is None:
+        result = await run_read(db, load, tenant_id, *args)
+        body = JSONResponse(result).body
+        built_from = version_of(result) if version_of is not None else version
+        if built_from < version:
+            # Older than the version: tag it with the one it reflects and keep it out of
+            # the LRU, so the next request after the copy catches up recomputes it
+            headers["ETag"] = etag_for(built_from, tenant_id, request, vary)
+        else:
+            _remember(etag, body)
+    return Response(body, media_type="application/json", headers=headers)
@@ -1,7 +1,7 @@
 # backend/app/schemas.py
 from pydantic import BaseModel
 from typing import Optional
-from datetime import datetime
+from datetime import date, datetime
 
 class BudgetCreate(BaseModel):
     category: str
@@ -25,3 +25,9 @@ class TransactionOut(TransactionIn):
 
     class Config:
         orm_mode = True
+
+# Query filters shared by the dashboard endpoints (use with Depends())
+class SpendFilters(BaseModel):
+    date_from: Optional[date] = None  # inclusive
+    date_to: Optional[date] = None  # inclusive
+    category: Optional[str] = None
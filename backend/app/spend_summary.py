@@ -0,0 +1,262 @@
+# backend/app/spend_summary.py
+"""
+Incrementally maintained spend aggregates keyed by (tenant, year, month, category).
+
+Every transaction write goes through apply_transactions() in the same database
+transaction, so dashboard reads cost O(categories x months) instead of a scan of the
+transactions table. rebuild_summary()/check_consistency() recompute from raw rows.
+
+    python -m backend.app.spend_summary --check      # compare summary with raw rows
+    python -m backend.app.spend_summary --rebuild    # recompute from raw rows
+"""
+
+import argparse
+import json
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import case, func, extract
+from sqlalchemy.orm import Session
+
+from backend.app.data_version import bump_data_version
+from backend.app.db import dialect_insert
+from backend.app.models.spend_summary_model import SpendSummary
+from backend.app.models.transaction_model import Transaction
+from backend.app.tenancy import DEFAULT_TENANT
+
+NO_CATEGORY = ""
+# Totals are currency; rounding on read hides float drift from incremental summing
+DECIMALS = 2
+
+
+def summary_key(txn_date, category):
+    if txn_date is None:
+        return 0, 0, category or NO_CATEGORY
+    return txn_date.year, txn_date.month, category or NO_CATEGORY
+
+
+def apply_transactions(db: Session, rows, tenant_id: str = DEFAULT_TENANT) -> None:
+    """
+    Add already-inserted transaction mappings (date, category, amount) of tenant_id to
+    the summary. Does not commit; call inside the transaction that inserted the rows.
+    """
+    deltas = {}
+    for row in rows:
+        key = summary_key(row.get("date"), row.get("category"))
+        total, count = deltas.get(key, (0.0, 0))
+        deltas[key] = (total + (row.get("amount") or 0.0), count + 1)
+    if not deltas:
+        return
+
+    stmt = dialect_insert(db, SpendSummary.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["tenant_id", "year", "month", "category"],
+        set_={"total": SpendSummary.total + stmt.excluded.total, "count": SpendSummary.count + stmt.excluded.count},
+    )
+    db.execute(stmt, [
+        {"tenant_id": tenant_id, "year": y, "month": m, "category": c, "total": total, "count": count}
+        for (y, m, c), (total, count) in deltas.items()
+    ])
+
+
+def clear_summary(db: Session, tenant_id: str = DEFAULT_TENANT) -> None:
+    db.query(SpendSummary).filter(SpendSummary.tenant_id == tenant_id).delete()
+
+
+def _raw_aggregates(db: Session):
+    year = func.coalesce(extract("year", Transaction.date), 0)
+    month = func.coalesce(extract("month", Transaction.date), 0)
+    category = func.coalesce(Transaction.category, NO_CATEGORY)
+    return (
+        db.query(Transaction.tenant_id, year, month, category, func.sum(Transaction.amount), func.count(Transaction.id))
+        .group_by(Transaction.tenant_id, year, month, category)
+        .all()
+    )
+
+
+def rebuild_summary(db: Session) -> int:
+    """
+    Recompute the whole summary, every tenant, from raw transactions. Commits; returns rows written.
+    """
+    tenants = {tenant for (tenant,) in db.query(SpendSummary.tenant_id).distinct()}
+    db.query(SpendSummary).delete()
+    rows = [
+        {"tenant_id": tenant, "year": int(y), "month": int(m), "category": c, "total": float(t or 0), "count": int(n)}
+        for tenant, y, m, c, t, n in _raw_aggregates(db)
+    ]
+    if rows:
+        db.execute(SpendSummary.__table__.insert(), rows)
+    for tenant in tenants | {row["tenant_id"] for row in rows}:
+        bump_data_version(db, tenant)
+    db.commit()
+    return len(rows)
+
+
+def check_consistency(db: Session, tolerance: float = 0.005) -> dict:
+    """
+    Compare the summary with aggregates recomputed from raw rows.
+    Returns {"consistent": bool, "mismatches": [...]}.
+    """
+    raw = {(tenant, int(y), int(m), c): (float(t or 0), int(n)) for tenant, y, m, c, t, n in _raw_aggregates(db)}
+    stored = {(s.tenant_id, s.year, s.month, s.category): (s.total, s.count) for s in db.query(SpendSummary).all()}
+    mismatches = []
+    for key in sorted(set(raw) | set(stored), key=str):
+        r_total, r_count = raw.get(key, (0.0, 0))
+        s_total, s_count = stored.get(key, (0.0, 0))
+        if r_count != s_count or abs(r_total - s_total) > tolerance:
+            mismatches.append({
+                "tenant_id": key[0], "year": key[1], "month": key[2], "category": key[3],
+                "raw_total": round(r_total, 2), "summary_total": round(s_total, 2),
+                "raw_count": r_count, "summary_count": s_count,
+            })
+    return {"consistent": not mismatches, "groups": len(raw), "mismatches": mismatches}
+
+
+def bootstrap_summary(db: Session) -> bool:
+    """
+    Build the summary for databases that predate it. Returns True if a rebuild ran.
+    """
+    if db.query(SpendSummary.year).first() is None and db.query(Transaction.id).first() is not None:
+        rebuild_summary(db)
+        return True
+    return False
+
+
+# ---- Read helpers used by the dashboard endpoints ----
+#
+# Without filters, or with date bounds on whole months, reads come from the summary.
+# Day-level bounds fall back to grouped queries on transactions, which stay cheap
+# because the (tenant, date, category) and (tenant, category, date) indexes limit them
+# to the range. Every read is scoped to one tenant.
+
+def _category_label(category):
+    return None if category == NO_CATEGORY else category
+
+
+def _month_key(d):
+    return d.year * 100 + d.month
+
+
+def _whole_months(filters) -> bool:
+    if filters is None:
+        return True
+    starts_month = filters.date_from is None or filters.date_from.day == 1
+    ends_month = filters.date_to is None or (filters.date_to + timedelta(days=1)).day == 1
+    return starts_month and ends_month
+
+
+def _source(filters, tenant_id: str):
+    """
+    Columns to aggregate over and a function applying the tenant and filters to a query on them.
+    """
+    if _whole_months(filters):
+        cols = SimpleNamespace(
+            year=SpendSummary.year, month=SpendSummary.month,
+            category=SpendSummary.category, amount=SpendSummary.total,
+        )
+
+        def apply(query):
+            query = query.filter(SpendSummary.tenant_id == tenant_id)
+            if filters is None:
+                return query
+            month_key = SpendSummary.year * 100 + SpendSummary.month
+            if filters.date_from is not None:
+                query = query.filter(month_key >= _month_key(filters.date_from))
+            if filters.date_to is not None:
+                query = query.filter(SpendSummary.year > 0, month_key <= _month_key(filters.date_to))
+            if filters.category is not None:
+                query = query.filter(SpendSummary.category == filters.category)
+            return query
+
+        return cols, apply
+
+    cols = SimpleNamespace(
+        year=func.coalesce(extract("year", Transaction.date), 0),
+        month=func.coalesce(extract("month", Transaction.date), 0),
+        category=func.coalesce(Transaction.category, NO_CATEGORY),
+        amount=Transaction.amount,
+    )
+    return cols, lambda query: filter_transactions(query, filters, tenant_id)
+
+
+def filter_transactions(query, filters, tenant_id: str = DEFAULT_TENANT):
+    """
+    Restrict a query over Transaction to one tenant and apply date range (inclusive)
+    and category filters.
+    """
+    query = query.filter(Transaction.tenant_id == tenant_id)
+    if filters is None:
+        return query
+    if filters.date_from is not None:
+        query = query.filter(Transaction.date >= filters.date_from)
+    if filters.date_to is not None:
+        query = query.filter(Transaction.date <= filters.date_to)
+    if filters.category is not None:
+        query = query.filter(Transaction.category == filters.category)
+    return query
+
+
+def category_totals(db: Session, filters=None, tenant_id: str = DEFAULT_TENANT):
+    """
+    [(category, total)] across all months; NULL categories come back as None.
+    """
+    cols, apply = _source(filters, tenant_id)
+    rows = apply(db.query(cols.category, func.sum(cols.amount))).group_by(cols.category).all()
+    return [(_category_label(c), round(float(t or 0), DECIMALS)) for c, t in rows]
+
+
+def monthly_totals(db: Session, filters=None, tenant_id: str = DEFAULT_TENANT):
+    """
+    [(year, month, total)] in chronological order; undated rows use year=month=0.
+    """
+    cols, apply = _source(filters, tenant_id)
+    rows = (
+        apply(db.query(cols.year, cols.month, func.sum(cols.amount)))
+        .group_by(cols.year, cols.month)
+        .order_by(cols.year, cols.month)
+        .all()
+    )
+    return [(int(y), int(m), round(float(t or 0), DECIMALS)) for y, m, t in rows]
+
+
+def category_monthly_totals(db: Session, missing_label: str = None, filters=None, tenant_id: str = DEFAULT_TENANT):
+    """
+    [(year, month, category, total)] grouped in SQL. NULL categories are reported as
+    missing_label and merged with any real category of that name.
+    """
+    cols, apply = _source(filters, tenant_id)
+    label = cols.category
+    if missing_label is not None:
+        label = case((cols.category == NO_CATEGORY, missing_label), else_=cols.category)
+    rows = (
+        apply(db.query(cols.year, cols.month, label, func.sum(cols.amount)))
+        .group_by(cols.year, cols.month, label)
+        .all()
+    )
+    return [(int(y), int(m), _category_label(c), round(float(t or 0), DECIMALS)) for y, m, c, t in rows]
+
+
+def month_label(year: int, month: int) -> str:
+    return date(year, month, 1).strftime("%b %Y") if year and month else "Unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--rebuild", action="store_true")
+    args = parser.parse_args()
+
+    from backend.app.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        if args.rebuild:
+            print(f"Rebuilt {rebuild_summary(db)} summary rows")
+        if args.check or not args.rebuild:
+            print(json.dumps(check_consistency(db), indent=2))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# backend/app/tenancy.py
+"""
+Tenant scoping: one deployment, one database, many users' data kept apart.
+
+Every owned row carries a tenant_id, and every index on those tables starts with it,
+so each query a route runs is a range scan inside one tenant's slice of the index
+however many tenants share the file. Routes take the tenant from the X-Tenant-ID
+header (DEFAULT_TENANT when absent, which is also where rows from before tenancy
+live). The header is trusted: put authentication in front of it (a proxy that sets
+it from the session) before exposing a shared deployment.
+"""
+
+import re
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+DEFAULT_TENANT = "default"
+TENANT_HEADER = "X-Tenant-ID"
+# Also used as a directory name by the analytics snapshot, so no separators or leading dots
+TENANT_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,63}$")
+
+
+def validate_tenant(tenant_id: str) -> str:
+    if not TENANT_ID_PATTERN.match(tenant_id or ""):
+        raise ValueError(f"Invalid tenant id {tenant_id!r}: use 1-64 letters, digits, '_', '.' or '-'")
+    return tenant_id
+
+
+def get_tenant(x_tenant_id: Optional[str] = Header(None)) -> str:
+    """
+    Route dependency: the caller's tenant id from the X-Tenant-ID header.
+    """
+    if x_tenant_id is None or x_tenant_id == "":
+        return DEFAULT_TENANT
+    try:
+        return validate_tenant(x_tenant_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -2,102 +2,307 @@
 """
 Train a small text classification model on your transaction dataset.
 This uses Hugging Face transformers (DistilBERT) for multi-class classification.
+
+    python -m backend.app.train_classifier                      # full training, dynamic padding
+    python -m backend.app.train_classifier --incremental --data backend/data/new_labels.csv
+    python -m backend.app.train_classifier --mode legacy         # original fixed-length setup
+
+fast mode pads each batch only to its own longest row (DataCollatorWithPadding plus
+group_by_length), caches the tokenized dataset under TOKENIZED_CACHE_DIR keyed on the
+CSV contents, and takes a larger batch with optional gradient accumulation. A cache
+entry is written to a temporary directory and renamed into place with a manifest
+(full key, row counts) last, so an interrupted run never leaves one that gets loaded.
+--incremental fine-tunes the existing txn_classifier checkpoint on newly labeled rows
+instead of starting from distilbert-base-uncased.
 """
 
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+
 import pandas as pd
 from sklearn.model_selection import train_test_split
-from datasets import Dataset
+from datasets import Dataset, load_from_disk
 from transformers import (
+    DataCollatorWithPadding,
     DistilBertTokenizerFast,
     DistilBertForSequenceClassification,
+    TrainerCallback,
     TrainingArguments,
     Trainer,
 )
-import torch
 import joblib
 from sklearn.preprocessing import LabelEncoder
-from transformers import AutoTokenizer, AutoModelForSequenceClassification, Trainer, TrainingArguments
+from backend.app.models.prediction_cache import cache_from_env, write_model_version
 
-# 1️⃣ Load dataset
-df = pd.read_csv("backend/data/transactions.csv")
-  # make sure your CSV is here
-print(f"Loaded {len(df)} rows")
+MODEL_DIR = "backend/app/models/txn_classifier"
+BASE_MODEL = "distilbert-base-uncased"
+MAX_LENGTH = 64
 
-# Expected columns: description, category
-if not {"description", "category"}.issubset(df.columns):
-    raise ValueError("CSV must have columns: description, category")
+TRAIN_BATCH_SIZE = int(os.getenv("TRAIN_BATCH_SIZE", "32"))
+TRAIN_GRAD_ACCUM = int(os.getenv("TRAIN_GRAD_ACCUM", "1"))
+TOKENIZED_CACHE_DIR = os.getenv("TOKENIZED_CACHE_DIR", "backend/data/tokenized")
+CACHE_MANIFEST = "manifest.json"
 
-#2️⃣ Encode labels using LabelEncoder
-label_encoder = LabelEncoder()
-df["label"] = label_encoder.fit_transform(df["category"])
 
-# 3️⃣ Split dataset
-train_df, test_df = train_test_split(df, test_size=0.2, random_state=42, stratify=df["label"])
+def load_labeled_csv(path: str) -> pd.DataFrame:
+    df = pd.read_csv(path)
+    print(f"Loaded {len(df)} rows from {path}")
+    # Expected columns: description, category
+    if not {"description", "category"}.issubset(df.columns):
+        raise ValueError("CSV must have columns: description, category")
+    return df
 
-# 4️⃣ Convert to Hugging Face Dataset
-train_ds = Dataset.from_pandas(train_df)
-test_ds = Dataset.from_pandas(test_df)
 
-# 5️⃣ Load tokenizer and tokenize
-tokenizer = DistilBertTokenizerFast.from_pretrained("distilbert-base-uncased")
+def split(df: pd.DataFrame):
+    # Small incremental batches may have single-row classes that cannot be stratified
+    stratify = df["label"] if df["label"].value_counts().min() >= 2 else None
+    return train_test_split(df, test_size=0.2, random_state=42, stratify=stratify)
 
-def tokenize(batch):
-    return tokenizer(batch["description"], padding="max_length", truncation=True, max_length=64)
 
-train_ds = train_ds.map(tokenize, batched=True)
-test_ds = test_ds.map(tokenize, batched=True)
+def _cache_key(path: str, tokenizer_source: str, mode: str, classes) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    digest.update(json.dumps([tokenizer_source, mode, MAX_LENGTH, list(map(str, classes))]).encode())
+    return digest.hexdigest()
 
-#6️⃣ Define model
-num_labels = len(label_encoder.classes_)
-id2label = {i: label for i, label in enumerate(label_encoder.classes_)}
-label2id = {label: i for i, label in enumerate(label_encoder.classes_)}
 
-model = DistilBertForSequenceClassification.from_pretrained(
-    "distilbert-base-uncased",
-    num_labels=num_labels,
-    id2label=id2label,
-    label2id=label2id,
-)
+def _load_cached(cache_dir: str, key: str):
+    """
+    (train_ds, test_ds) from a complete cache entry for key, else None. Anything
+    else found at cache_dir (an older layout, a foreign key, unreadable data) is removed.
+    """
+    if not os.path.isdir(cache_dir):
+        return None
+    reason = "written for other data or incomplete"
+    try:
+        with open(os.path.join(cache_dir, CACHE_MANIFEST)) as fh:
+            manifest = json.load(fh)
+        if manifest.get("key") == key:
+            train_ds = load_from_disk(os.path.join(cache_dir, "train"))
+            test_ds = load_from_disk(os.path.join(cache_dir, "test"))
+            if (len(train_ds), len(test_ds)) == (manifest["train_rows"], manifest["test_rows"]):
+                return train_ds, test_ds
+    except (OSError, ValueError, KeyError) as e:
+        reason = str(e)
+    print(f"Discarding tokenized cache {cache_dir}: {reason}")
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    return None
+
+
+def _save_cached(cache_dir: str, key: str, train_ds, test_ds):
+    # Build next to the final location, then rename: cache_dir is either absent or complete
+    tmp = f"{cache_dir}.tmp-{uuid.uuid4().hex}"
+    try:
+        train_ds.save_to_disk(os.path.join(tmp, "train"))
+        test_ds.save_to_disk(os.path.join(tmp, "test"))
+        with open(os.path.join(tmp, CACHE_MANIFEST), "w") as fh:
+            json.dump({"key": key, "train_rows": len(train_ds), "test_rows": len(test_ds)}, fh)
+        os.rename(tmp, cache_dir)
+    except OSError as e:
+        # e.g. a concurrent run renamed its copy into place first
+        print(f"Not caching tokenized dataset at {cache_dir}: {e}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def tokenized_datasets(df, tokenizer, mode: str, cache_dir: str = None, cache_key: str = None):
+    """
+    (train_ds, test_ds), loaded from cache_dir when it holds a complete tokenization
+    recorded under cache_key.
+    """
+    if cache_dir:
+        cached = _load_cached(cache_dir, cache_key)
+        if cached is not None:
+            print(f"Using cached tokenized dataset {cache_dir}")
+            return cached
+
+    if mode == "legacy":
+        def tokenize(batch):
+            return tokenizer(batch["description"], padding="max_length", truncation=True, max_length=MAX_LENGTH)
+    else:
+        # No padding here: the collator pads per batch; "length" drives group_by_length
+        def tokenize(batch):
+            return tokenizer(batch["description"], truncation=True, max_length=MAX_LENGTH, return_length=True)
+
+    train_df, test_df = split(df)
+    keep = ["description", "label"]
+    train_ds = Dataset.from_pandas(train_df[keep], preserve_index=False).map(tokenize, batched=True)
+    test_ds = Dataset.from_pandas(test_df[keep], preserve_index=False).map(tokenize, batched=True)
+
+    if cache_dir:
+        os.makedirs(os.path.dirname(cache_dir), exist_ok=True)
+        _save_cached(cache_dir, cache_key, train_ds, test_ds)
+    return train_ds, test_ds
+
+
+class TrainLoopTimer(TrainerCallback):
+    """
+    Wall time spent in the epochs' training steps only. on_epoch_end fires before the
+    per-epoch evaluation and checkpoint save, so those are not counted.
+    """
+
+    def __init__(self):
+        self.seconds = 0.0
+        self._start = None
+
+    def on_epoch_begin(self, args, state, control, **kwargs):
+        self._start = time.perf_counter()
+
+    def on_epoch_end(self, args, state, control, **kwargs):
+        if self._start is not None:
+            self.seconds += time.perf_counter() - self._start
+            self._start = None
 
-# 7️⃣ Training setup
-args = TrainingArguments(
-    output_dir="backend/app/models/txn_classifier",
-    learning_rate=2e-5,
-    eval_strategy="epoch",
-    save_strategy="epoch",
-    per_device_train_batch_size=8,
-    #per_device_eval_batch_size=8,
-    num_train_epochs=5,
-    weight_decay=0.01,
-    save_total_limit=1,
-    logging_dir="backend/app/logs",
-    logging_steps=10,
-    load_best_model_at_end=True,
-    metric_for_best_model="accuracy",
-    
-)
 
 def compute_metrics(pred):
     preds = pred.predictions.argmax(-1)
     acc = (preds == pred.label_ids).mean()
     return {"accuracy": acc}
 
-trainer = Trainer(
-    model=model,
-    args=args,
-    train_dataset=train_ds,
-    eval_dataset=test_ds,
-    tokenizer=tokenizer,
-    compute_metrics=compute_metrics,
-)
 
-# 8️⃣ Train!
-trainer.train()
+def train(data: str, output_dir: str = MODEL_DIR, mode: str = "fast", incremental: bool = False,
+          batch_size: int = None, grad_accum: int = None, epochs: float = 5, learning_rate: float = None,
+          use_cache: bool = True) -> dict:
+    batch_size = batch_size or (8 if mode == "legacy" else TRAIN_BATCH_SIZE)
+    grad_accum = grad_accum or (1 if mode == "legacy" else TRAIN_GRAD_ACCUM)
+    source = MODEL_DIR if incremental else BASE_MODEL
+
+    # 1️⃣ Load dataset
+    df = load_labeled_csv(data)
+
+    #2️⃣ Encode labels; incremental runs must stay on the checkpoint's label set
+    if incremental:
+        label_encoder = joblib.load(os.path.join(MODEL_DIR, "label_encoder.pkl"))
+        unknown = sorted(set(df["category"].astype(str)) - set(map(str, label_encoder.classes_)))
+        if unknown:
+            raise ValueError(f"Categories not in the existing model: {unknown}; retrain without --incremental")
+    else:
+        label_encoder = LabelEncoder()
+        label_encoder.fit(df["category"])
+    df["label"] = label_encoder.transform(df["category"])
+
+    # 3️⃣ Tokenize (or reuse the cached tokenization)
+    tokenizer = DistilBertTokenizerFast.from_pretrained(source)
+    cache_dir = cache_key = None
+    if use_cache and mode != "legacy":
+        cache_key = _cache_key(data, source, mode, label_encoder.classes_)
+        cache_dir = os.path.join(TOKENIZED_CACHE_DIR, cache_key[:16])
+    tokenize_start = time.perf_counter()
+    train_ds, test_ds = tokenized_datasets(df, tokenizer, mode, cache_dir, cache_key)
+    tokenize_seconds = time.perf_counter() - tokenize_start
+
+    # 4️⃣ Define model (fresh head, or the existing fine-tuned checkpoint)
+    num_labels = len(label_encoder.classes_)
+    id2label = {i: label for i, label in enumerate(label_encoder.classes_)}
+    label2id = {label: i for i, label in enumerate(label_encoder.classes_)}
+
+    model = DistilBertForSequenceClassification.from_pretrained(
+        source,
+        num_labels=num_labels,
+        id2label=id2label,
+        label2id=label2id,
+    )
+
+    # 5️⃣ Training setup
+    args = TrainingArguments(
+        output_dir=output_dir,
+        learning_rate=learning_rate or (1e-5 if incremental else 2e-5),
+        eval_strategy="epoch",
+        save_strategy="epoch",
+        per_device_train_batch_size=batch_size,
+        per_device_eval_batch_size=max(batch_size, 8),
+        gradient_accumulation_steps=grad_accum,
+        group_by_length=mode != "legacy",
+        num_train_epochs=epochs,
+        weight_decay=0.01,
+        save_total_limit=1,
+        logging_dir="backend/app/logs",
+        logging_steps=10,
+        load_best_model_at_end=True,
+        metric_for_best_model="accuracy",
+    )
+
+    loop_timer = TrainLoopTimer()
+    trainer = Trainer(
+        model=model,
+        args=args,
+        train_dataset=train_ds,
+        eval_dataset=test_ds,
+        tokenizer=tokenizer,
+        data_collator=None if mode == "legacy" else DataCollatorWithPadding(tokenizer),
+        compute_metrics=compute_metrics,
+        callbacks=[loop_timer],
+    )
+
+    # 6️⃣ Train! (train_seconds includes the per-epoch evaluation and checkpoints)
+    train_start = time.perf_counter()
+    output = trainer.train()
+    train_seconds = time.perf_counter() - train_start
+    metrics = trainer.evaluate()
+
+    # 7️⃣ Save model
+    model.save_pretrained(output_dir)
+    tokenizer.save_pretrained(output_dir)
+    joblib.dump(label_encoder, os.path.join(output_dir, "label_encoder.pkl"))
+
+    # 8️⃣ Stamp a new model version; drop predictions cached for the old one if this is the served model
+    new_version = write_model_version(output_dir)
+    if os.path.abspath(output_dir) == os.path.abspath(MODEL_DIR):
+        cache_from_env().invalidate(keep_version=new_version)
+
+    samples = len(train_ds) * epochs
+    return {
+        "mode": mode,
+        "incremental": incremental,
+        "rows": len(df),
+        "batch_size": batch_size,
+        "grad_accum": grad_accum,
+        "epochs": epochs,
+        "tokenize_seconds": round(tokenize_seconds, 3),
+        "tokenized_cache": cache_dir,
+        "train_seconds": round(train_seconds, 3),
+        "train_loop_seconds": round(loop_timer.seconds, 3),
+        "samples_per_sec": round(samples / loop_timer.seconds, 1) if loop_timer.seconds else None,
+        "trainer_samples_per_sec": output.metrics.get("train_samples_per_second"),
+        "eval_accuracy": metrics.get("eval_accuracy"),
+        "model_version": new_version,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default="backend/data/transactions.csv", help="CSV with description,category")
+    parser.add_argument("--output-dir", default=MODEL_DIR)
+    parser.add_argument("--mode", choices=["fast", "legacy"], default="fast")
+    parser.add_argument("--incremental", action="store_true", help="fine-tune the existing txn_classifier checkpoint")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--grad-accum", type=int, default=None)
+    parser.add_argument("--epochs", type=float, default=5)
+    parser.add_argument("--learning-rate", type=float, default=None)
+    parser.add_argument("--no-cache", action="store_true", help="re-tokenize even if a cached dataset exists")
+    args = parser.parse_args()
 
-# 9️⃣ Save model
-model.save_pretrained("backend/app/models/txn_classifier")
-tokenizer.save_pretrained("backend/app/models/txn_classifier")
+    result = train(
+        args.data,
+        output_dir=args.output_dir,
+        mode=args.mode,
+        incremental=args.incremental,
+        batch_size=args.batch_size,
+        grad_accum=args.grad_accum,
+        epochs=args.epochs,
+        learning_rate=args.learning_rate,
+        use_cache=not args.no_cache,
+    )
+    print(json.dumps(result, indent=2))
+    print(f"✅ Model trained and saved to {args.output_dir}")
 
-joblib.dump(label_encoder, "backend/app/models/txn_classifier/label_encoder.pkl")
 
-print("✅ Model trained and saved to backend/app/models/txn_classifier")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# backend/benchmarks/bench_analytics.py
+"""
+/budgets/analytics: the original hydrate-everything Python loop vs grouped SQL over
+the spend summary and merchant keyword index.
+
+    python -m backend.benchmarks.bench_analytics --rows 1000000
+"""
+
+import argparse
+import json
+import os
+import resource
+import tempfile
+
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.api.budgets import load_analytics
+from backend.app.db import init_db, make_engine
+from backend.app.models.transaction_model import Transaction
+from backend.app.tenancy import DEFAULT_TENANT
+from backend.benchmarks.bench_summary import populate, timed
+
+
+def legacy_analytics(db):
+    monthly_spend, category_monthly, merchant_count = {}, {}, {}
+    for txn in db.query(Transaction).all():
+        month = txn.date.strftime("%b %Y") if txn.date else "Unknown"
+        category = txn.category or "Uncategorized"
+        monthly_spend[month] = monthly_spend.get(month, 0) + txn.amount
+        category_monthly.setdefault(category, {})
+        category_monthly[category][month] = category_monthly[category].get(month, 0) + txn.amount
+        for word in (txn.description or "").lower().split():
+            if len(word) > 3:
+                merchant_count[word] = merchant_count.get(word, 0) + 1
+    return monthly_spend, category_monthly, sorted(merchant_count.items(), key=lambda x: x[1], reverse=True)[:5]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        init_db(engine)
+        db = sessionmaker(bind=engine)()
+        populate(db, args.rows)
+        db.expunge_all()
+
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        sql_ms = timed(lambda session: load_analytics(session, DEFAULT_TENANT), db, args.repeat)
+        rss_sql = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        legacy_ms = timed(legacy_analytics, db, args.repeat)
+        rss_legacy = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        db.close()
+        engine.dispose()
+
+    print(json.dumps({
+        "rows": args.rows,
+        "legacy_ms": legacy_ms,
+        "sql_ms": sql_ms,
+        "speedup": round(legacy_ms / sql_ms, 1) if sql_ms else None,
+        # ru_maxrss only grows, so the SQL path runs first
+        "peak_rss_growth_mb": {"sql": round((rss_sql - rss_before) / 1024, 1),
+                               "legacy": round((rss_legacy - rss_sql) / 1024, 1)},
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# backend/benchmarks/bench_budgets.py
+"""
+1k budget upserts: the old per-item SELECT/commit/refresh loop vs one set-based upsert.
+
+Runs twice over the same categories so both the insert and the update paths are timed.
+
+    python -m backend.benchmarks.bench_budgets --budgets 1000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.db import init_db, make_engine
+from backend.app.models.budget_model import Budget
+from backend.app.models.budget_store import upsert_budgets
+
+
+def legacy_upsert(db, items):
+    for category, limit in items:
+        existing = db.query(Budget).filter(Budget.category == category).first()
+        if existing:
+            existing.limit = limit
+            db.add(existing)
+            db.commit()
+            db.refresh(existing)
+        else:
+            new_budget = Budget(category=category, limit=limit)
+            db.add(new_budget)
+            db.commit()
+            db.refresh(new_budget)
+
+
+def set_based_upsert(db, items):
+    upsert_budgets(db, items)
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budgets", type=int, default=1000)
+    args = parser.parse_args()
+
+    for name, fn in (("legacy", legacy_upsert), ("set-based", set_based_upsert)):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = make_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+            init_db(engine)
+            db = sessionmaker(bind=engine)()
+            timings = {}
+            for phase, offset in (("insert", 0), ("update", 1)):
+                items = [(f"category-{i}", float(i + offset)) for i in range(args.budgets)]
+                start = time.perf_counter()
+                fn(db, items)
+                timings[f"{phase}_ms"] = round((time.perf_counter() - start) * 1000, 2)
+            db.close()
+            engine.dispose()
+        print(json.dumps({"path": name, "budgets": args.budgets, **timings}))
+
+
+if __name__ == "__main__":
+    main()
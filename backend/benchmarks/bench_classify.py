@@ -0,0 +1,83 @@
+# backend/benchmarks/bench_classify.py
+"""
+Compare the old single-shot classifier path with length-bucketed micro-batching.
+
+Each mode runs in its own subprocess so peak RSS is measured independently.
+
+    python -m backend.benchmarks.bench_classify --rows 50000 --batch-size 64
+"""
+
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import time
+
+MERCHANTS = [
+    "UBER TRIP", "SWIGGY ORDER", "ZOMATO", "NETFLIX SUBSCRIPTION", "AMAZON PAY",
+    "BIGBASKET GROCERY", "HP PETROL PUMP", "APOLLO PHARMACY", "AIRTEL RECHARGE",
+    "PVR CINEMAS", "OLA CABS", "DMART SUPERMARKET",
+]
+
+
+def make_descriptions(rows: int, seed: int = 7):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(rows):
+        desc = f"{rng.choice(MERCHANTS)} {rng.randint(1000, 99999)}"
+        # A few long narrations, like real bank exports, to show the padding cost
+        if rng.random() < 0.01:
+            desc += " UPI/P2M/" + "/".join(str(rng.randint(10**5, 10**9)) for _ in range(12))
+        out.append(desc)
+    return out
+
+
+def run_mode(mode: str, rows: int, batch_size: int):
+    from backend.app.models import category_model as cm
+
+    clf = cm.load_classifier()
+    descriptions = make_descriptions(rows)
+    start = time.perf_counter()
+    if mode == "single-shot":
+        # The pre-micro-batching path: one padded tensor for the whole upload
+        inputs = clf.tokenizer(descriptions, padding=True, truncation=True, return_tensors=clf.runner.tensor_type)
+        clf.runner.run(dict(inputs))
+    else:
+        cm.predict_label_ids(descriptions, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({
+        "mode": mode,
+        "backend": clf.runner.name,
+        "rows": rows,
+        "batch_size": batch_size if mode == "micro-batched" else rows,
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(rows / elapsed, 1),
+        "peak_rss_mb": round(peak_kb / 1024, 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--mode", choices=["single-shot", "micro-batched"])
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.rows, args.batch_size)
+        return
+
+    for mode in ("single-shot", "micro-batched"):
+        subprocess.run(
+            [sys.executable, "-m", "backend.benchmarks.bench_classify",
+             "--mode", mode, "--rows", str(args.rows), "--batch-size", str(args.batch_size)],
+            check=False,
+        )
+
+
+if __name__ == "__main__":
+    main()
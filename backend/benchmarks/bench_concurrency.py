@@ -0,0 +1,109 @@
+# backend/benchmarks/bench_concurrency.py
+"""
+Dashboard reads while an upload is writing: WAL vs the default rollback journal.
+
+A writer thread bulk-inserts chunks (like streaming ingestion) while reader threads
+hit /insights-style queries; reports read throughput, latency and lock errors.
+
+    python -m backend.benchmarks.bench_concurrency --seconds 10 --readers 4
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+from datetime import date
+
+from sqlalchemy import func
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.db import init_db, make_engine
+from backend.app.models.transaction_model import Transaction
+from backend.app.models.transaction_store import bulk_insert_transactions
+from backend.app.spend_summary import category_totals, monthly_totals
+from backend.benchmarks.bench_insert import make_rows
+
+
+def read_once(db):
+    category_totals(db)
+    monthly_totals(db)
+    # An indexed date-range scan, as the dashboard filters do
+    db.query(func.count(Transaction.id)).filter(
+        Transaction.date >= date(2023, 3, 1), Transaction.date < date(2023, 4, 1)
+    ).scalar()
+    db.rollback()
+
+
+def run(wal: bool, seconds: float, readers: int, chunk_rows: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}", wal=wal)
+        init_db(engine)
+        Session = sessionmaker(bind=engine)
+        seed = Session()
+        bulk_insert_transactions(seed, make_rows(50_000), commit=True)
+        seed.close()
+
+        stop = threading.Event()
+        latencies, errors, written = [], [0], [0]
+        lock = threading.Lock()
+
+        def writer():
+            db = Session()
+            n = 0
+            while not stop.is_set():
+                n += 1
+                written[0] += bulk_insert_transactions(db, make_rows(chunk_rows, seed=n), commit=True)
+            db.close()
+
+        def reader():
+            db = Session()
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    read_once(db)
+                except Exception:
+                    db.rollback()
+                    with lock:
+                        errors[0] += 1
+                    continue
+                with lock:
+                    latencies.append((time.perf_counter() - start) * 1000)
+            db.close()
+
+        threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(readers)]
+        for t in threads:
+            t.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+        engine.dispose()
+
+    latencies.sort()
+    return {
+        "journal_mode": "wal" if wal else "delete",
+        "rows_written": written[0],
+        "reads": len(latencies),
+        "reads_per_sec": round(len(latencies) / seconds, 1),
+        "read_p50_ms": round(statistics.median(latencies), 2) if latencies else None,
+        "read_p99_ms": round(latencies[int(len(latencies) * 0.99) - 1], 2) if latencies else None,
+        "read_max_ms": round(latencies[-1], 2) if latencies else None,
+        "read_errors": errors[0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--chunk-rows", type=int, default=20000)
+    args = parser.parse_args()
+    for wal in (False, True):
+        print(json.dumps(run(wal, args.seconds, args.readers, args.chunk_rows)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# backend/benchmarks/bench_forecast.py
+"""
+/budgets/forecast latency with many categories and years of history.
+
+Writes one transaction per (category, day) of the current month up to as_of and a
+few per (category, month) before it, through the bulk insert path so the spend
+summary is maintained, gives every other category a budget, then times forecast()
+mid-month and on the last day of the month (summary-only read).
+
+    python -m backend.benchmarks.bench_forecast --categories 5000 --months 60
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.db import init_db, make_engine
+from backend.app.forecast import forecast
+from backend.app.models.budget_store import upsert_budgets
+from backend.app.models.transaction_store import bulk_insert_transactions
+from backend.benchmarks.bench_summary import timed
+
+
+def populate(db, categories: int, months: int, as_of: date):
+    rng = random.Random(7)
+    names = [f"Category {i:05d}" for i in range(categories)]
+    month_start = as_of.replace(day=1)
+    batch = []
+    for name in names:
+        base = rng.uniform(50, 2000)
+        first = month_start
+        for _ in range(months):
+            first = (first - timedelta(days=1)).replace(day=1)
+            seasonal = 1.5 if first.month == 12 else 1.0
+            for day in (3, 14, 25):
+                batch.append({
+                    "description": f"{name} purchase",
+                    "amount": round(base * seasonal / 3 * rng.uniform(0.7, 1.3), 2),
+                    "date": first.replace(day=day),
+                    "category": name,
+                })
+        for day in range(1, as_of.day + 1):
+            batch.append({
+                "description": f"{name} purchase",
+                "amount": round(base / 30 * rng.uniform(0.5, 1.5), 2),
+                "date": month_start.replace(day=day),
+                "category": name,
+            })
+        if len(batch) >= 100_000:
+            bulk_insert_transactions(db, batch, commit=True)
+            batch = []
+    bulk_insert_transactions(db, batch, commit=True)
+    upsert_budgets(db, [(name, rng.uniform(500, 2500)) for name in names[::2]])
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--categories", type=int, default=5000)
+    parser.add_argument("--months", type=int, default=60, help="months of history before the current one")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    as_of = date(2026, 6, 12)
+    month_end = date(2026, 6, 30)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        init_db(engine)
+        db = sessionmaker(bind=engine)()
+
+        start = time.perf_counter()
+        populate(db, args.categories, args.months, as_of)
+        populate_seconds = time.perf_counter() - start
+
+        # The first call also scores every category against every budget name
+        start = time.perf_counter()
+        result = forecast(db, as_of=as_of, history_months=args.months)
+        cold_ms = (time.perf_counter() - start) * 1000
+
+        latency = {
+            "mid_month": timed(lambda session: forecast(session, as_of=as_of, history_months=args.months), db, args.repeat),
+            "month_end": timed(lambda session: forecast(session, as_of=month_end, history_months=args.months), db, args.repeat),
+        }
+        db.close()
+        engine.dispose()
+
+    statuses = {}
+    for row in result["forecast"]:
+        statuses[row["status"]] = statuses.get(row["status"], 0) + 1
+    print(json.dumps({
+        "categories": args.categories,
+        "history_months": args.months,
+        "populate_seconds": round(populate_seconds, 2),
+        "cold_ms": round(cold_ms, 3),
+        "forecast_ms": latency,
+        "statuses": statuses,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
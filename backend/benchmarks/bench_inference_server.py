@@ -0,0 +1,126 @@
+# backend/benchmarks/bench_inference_server.py
+"""
+Per-worker model copies vs one shared inference server with dynamic batching.
+
+Simulates --workers API processes, each with --threads concurrent clients sending
+small /categorize-sized requests. In "per-worker" mode every process loads its own
+model; in "shared" mode they all call one inference server. Reports total rows/sec
+and the resident memory spent on models. The prediction cache is disabled so every
+row reaches the model.
+
+    python -m backend.benchmarks.bench_inference_server --workers 4 --threads 8
+"""
+
+import argparse
+import json
+import os
+import resource
+import secrets
+import subprocess
+import sys
+import threading
+import time
+
+from backend.benchmarks.bench_classify import make_descriptions
+
+CACHE_OFF = {"PREDICTION_CACHE_SIZE": "0", "PREDICTION_CACHE_DB": ""}
+
+
+def _rss_mb(pid) -> float:
+    with open(f"/proc/{pid}/status") as fh:
+        for line in fh:
+            if line.startswith("VmRSS:"):
+                return round(int(line.split()[1]) / 1024, 1)
+    return 0.0
+
+
+def run_worker(threads: int, requests: int, rows_per_request: int, seed: int):
+    from backend.app.models import category_model
+
+    if not category_model.INFERENCE_SERVER_ADDRESS:
+        category_model.load_classifier()
+    descriptions = make_descriptions(threads * requests * rows_per_request, seed=seed)
+
+    def client(t):
+        for r in range(requests):
+            start = (t * requests + r) * rows_per_request
+            category_model.classify_transactions(descriptions[start:start + rows_per_request])
+
+    start = time.perf_counter()
+    pool = [threading.Thread(target=client, args=(t,)) for t in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "rows": len(descriptions),
+        "seconds": elapsed,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }), flush=True)
+
+
+def run_mode(mode, args):
+    env = dict(os.environ, **CACHE_OFF)
+    server = None
+    if mode == "shared":
+        env.setdefault("INFERENCE_SERVER_AUTHKEY", secrets.token_hex(32))
+        env["INFERENCE_SERVER_ADDRESS"] = f"127.0.0.1:{args.port}"
+        server = subprocess.Popen(
+            [sys.executable, "-m", "backend.app.inference_server", "--address", env["INFERENCE_SERVER_ADDRESS"]],
+            env=env, stdout=subprocess.PIPE, text=True,
+        )
+        server.stdout.readline()  # "ready" line
+    else:
+        env.pop("INFERENCE_SERVER_ADDRESS", None)
+
+    try:
+        workers = [
+            subprocess.Popen(
+                [sys.executable, "-m", "backend.benchmarks.bench_inference_server", "--role", "worker",
+                 "--threads", str(args.threads), "--requests", str(args.requests),
+                 "--rows-per-request", str(args.rows_per_request), "--seed", str(i)],
+                env=env, stdout=subprocess.PIPE, text=True,
+            )
+            for i in range(args.workers)
+        ]
+        results = [json.loads(w.communicate()[0].strip().splitlines()[-1]) for w in workers]
+        server_rss = _rss_mb(server.pid) if server else 0.0
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    rows = sum(r["rows"] for r in results)
+    seconds = max(r["seconds"] for r in results)
+    return {
+        "mode": mode,
+        "workers": args.workers,
+        "threads_per_worker": args.threads,
+        "rows_per_request": args.rows_per_request,
+        "rows_per_sec": round(rows / seconds, 1),
+        "worker_rss_mb_total": round(sum(r["peak_rss_mb"] for r in results), 1),
+        "server_rss_mb": server_rss,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--rows-per-request", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--role", choices=["driver", "worker"], default="driver")
+    args = parser.parse_args()
+
+    if args.role == "worker":
+        run_worker(args.threads, args.requests, args.rows_per_request, args.seed)
+        return
+    for mode in ("per-worker", "shared"):
+        print(json.dumps(run_mode(mode, args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# backend/benchmarks/bench_ingest.py
+"""
+Rows/sec and peak RSS of streaming CSV ingestion at 10k, 100k and 1M rows.
+
+Each size runs in its own subprocess against a throwaway SQLite file. By default a
+stub classifier is used so the numbers isolate parse + persist cost; pass
+--classifier model to include the real DistilBERT classifier.
+
+    python -m backend.benchmarks.bench_ingest --sizes 10000 100000 1000000
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from backend.benchmarks.bench_classify import MERCHANTS
+
+
+def write_csv(path: str, rows: int, seed: int = 7):
+    rng = random.Random(seed)
+    start = date(2023, 1, 1)
+    with open(path, "w", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["description", "amount", "date"])
+        for _ in range(rows):
+            writer.writerow([
+                f"{rng.choice(MERCHANTS)} {rng.randint(1000, 99999)}",
+                f"{rng.uniform(10, 5000):.2f}",
+                (start + timedelta(days=rng.randint(0, 700))).isoformat(),
+            ])
+
+
+def stub_classify(descriptions):
+    return ["Uncategorized"] * len(descriptions)
+
+
+def run_one(rows: int, classifier: str, chunk_rows: int):
+    from sqlalchemy.orm import sessionmaker
+    from backend.app.db import init_db, make_engine
+    from backend.app.ingest import ingest_csv
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "upload.csv")
+        write_csv(csv_path, rows)
+        engine = make_engine(f"sqlite:///{tmp}/bench.db")
+        init_db(engine)
+        db = sessionmaker(bind=engine)()
+
+        if classifier == "model":
+            from backend.app.models.category_model import classify_transactions as classify
+        else:
+            classify = stub_classify
+
+        start = time.perf_counter()
+        with open(csv_path, "rb") as fh:
+            summary = ingest_csv(fh, db, classify=classify, chunk_rows=chunk_rows)
+        elapsed = time.perf_counter() - start
+        db.close()
+        engine.dispose()
+
+    print(json.dumps({
+        "rows": rows,
+        "classifier": classifier,
+        "chunk_rows": chunk_rows,
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(summary["rows_saved"] / elapsed, 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--classifier", choices=["stub", "model"], default="stub")
+    parser.add_argument("--chunk-rows", type=int, default=20000)
+    parser.add_argument("--one", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.one:
+        run_one(args.one, args.classifier, args.chunk_rows)
+        return
+    for rows in args.sizes:
+        subprocess.run(
+            [sys.executable, "-m", "backend.benchmarks.bench_ingest", "--one", str(rows),
+             "--classifier", args.classifier, "--chunk-rows", str(args.chunk_rows)],
+            check=False,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# backend/benchmarks/bench_insert.py
+"""
+Per-object ORM inserts vs bulk Core inserts of Transaction rows on SQLite.
+
+    python -m backend.benchmarks.bench_insert --rows 100000
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.db import init_db, make_engine
+from backend.app.models.transaction_model import Transaction
+from backend.app.models.transaction_store import bulk_insert_transactions
+from backend.benchmarks.bench_classify import MERCHANTS
+
+
+def make_rows(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    start = date(2023, 1, 1)
+    return [
+        {
+            "description": f"{rng.choice(MERCHANTS)} {rng.randint(1000, 99999)}",
+            "amount": round(rng.uniform(10, 5000), 2),
+            "category": "Uncategorized",
+            "date": start + timedelta(days=rng.randint(0, 700)),
+        }
+        for _ in range(n)
+    ]
+
+
+def per_object(db, rows):
+    for row in rows:
+        db.add(Transaction(**row))
+    db.commit()
+
+
+def bulk(db, rows):
+    bulk_insert_transactions(db, rows, commit=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+    rows = make_rows(args.rows)
+
+    for name, fn in (("per-object", per_object), ("bulk-core", bulk)):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = make_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+            init_db(engine)
+            db = sessionmaker(bind=engine)()
+            start = time.perf_counter()
+            fn(db, rows)
+            elapsed = time.perf_counter() - start
+            db.close()
+            engine.dispose()
+        print(json.dumps({
+            "path": name,
+            "rows": args.rows,
+            "seconds": round(elapsed, 3),
+            "rows_per_sec": round(args.rows / elapsed, 1),
+        }))
+
+
+if __name__ == "__main__":
+    main()
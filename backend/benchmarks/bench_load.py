@@ -0,0 +1,120 @@
+# backend/benchmarks/bench_load.py
+"""
+Load test the dashboard read endpoints on a local server, sync vs async DB path.
+
+Seeds a throwaway database, then for DB_ASYNC=0 and DB_ASYNC=1 starts one uvicorn
+worker and drives it with --concurrency clients hitting /view, /insights,
+/compute_spend and /analytics. Reports requests/sec and p50/p99 latency. Needs httpx.
+The data never changes during a run, so the server's response cache is off unless
+--response-cache is given; with it on, nearly every request is an LRU hit.
+
+    python -m backend.benchmarks.bench_load --rows 100000 --concurrency 64 --seconds 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.db import init_db, make_engine
+from backend.benchmarks.bench_summary import populate
+
+PATHS = ["/budgets/view", "/budgets/insights", "/budgets/compute_spend", "/budgets/analytics"]
+
+
+async def _drive(base: str, concurrency: int, seconds: float):
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + seconds
+
+    async def client(i):
+        nonlocal errors
+        async with httpx.AsyncClient(base_url=base, timeout=30) as http:
+            n = i
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    resp = await http.get(PATHS[n % len(PATHS)])
+                    resp.raise_for_status()
+                    latencies.append((time.perf_counter() - start) * 1000)
+                except httpx.HTTPError:
+                    errors += 1
+                n += 1
+
+    await asyncio.gather(*(client(i) for i in range(concurrency)))
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "requests_per_sec": round(len(latencies) / seconds, 1),
+        "p50_ms": round(latencies[len(latencies) // 2], 2) if latencies else None,
+        "p99_ms": round(latencies[max(int(len(latencies) * 0.99) - 1, 0)], 2) if latencies else None,
+        "errors": errors,
+    }
+
+
+def _wait_up(base: str, timeout: float = 60):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if httpx.get(f"{base}/").status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise SystemExit("server did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--response-cache", action="store_true", help="leave the server's response cache on")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'load.db')}"
+        engine = make_engine(url)
+        init_db(engine)
+        db = sessionmaker(bind=engine)()
+        populate(db, args.rows)
+        db.close()
+        engine.dispose()
+
+        base = f"http://127.0.0.1:{args.port}"
+        for mode in ("0", "1"):
+            env = dict(
+                os.environ,
+                DATABASE_URL=url,
+                PREDICTION_CACHE_DB=os.path.join(tmp, "prediction_cache.db"),
+                UPLOAD_SPOOL_DIR=os.path.join(tmp, "uploads"),
+                DB_ASYNC=mode,
+                CLASSIFIER_WARMUP="0",
+            )
+            if not args.response_cache:
+                env["RESPONSE_CACHE_SIZE"] = "0"
+            proc = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "backend.app.main:app", "--port", str(args.port), "--log-level", "warning"],
+                env=env,
+            )
+            try:
+                _wait_up(base)
+                result = asyncio.run(_drive(base, args.concurrency, args.seconds))
+            finally:
+                proc.terminate()
+                proc.wait()
+            print(json.dumps({
+                "path": "async" if mode == "1" else "sync", "concurrency": args.concurrency,
+                "response_cache": args.response_cache, **result,
+            }))
+
+
+if __name__ == "__main__":
+    main()
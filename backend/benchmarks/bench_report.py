@@ -0,0 +1,65 @@
+# backend/benchmarks/bench_report.py
+"""
+Time-to-first-byte, total time and peak RSS of the streaming report exports.
+
+    python -m backend.benchmarks.bench_report --rows 1000000
+"""
+
+import argparse
+import json
+import os
+import resource
+import tempfile
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.db import init_db, make_engine
+from backend.app.reports import iter_csv, iter_parquet, iter_report_rows, parquet_available
+from backend.benchmarks.bench_summary import populate
+
+
+def measure(chunks):
+    start = time.perf_counter()
+    first = None
+    size = 0
+    for chunk in chunks:
+        if first is None:
+            first = time.perf_counter() - start
+        size += len(chunk)
+    return {
+        "ttfb_ms": round((first or 0) * 1000, 2),
+        "total_seconds": round(time.perf_counter() - start, 3),
+        "bytes": size,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        init_db(engine)
+        Session = sessionmaker(bind=engine)
+        db = Session()
+        populate(db, args.rows)
+        db.close()
+
+        cases = [
+            ("detailed", "csv", lambda rows: iter_csv(rows)),
+            ("detailed", "csv.gz", lambda rows: iter_csv(rows, compress=True)),
+            ("pivot", "csv", lambda rows: iter_csv(rows)),
+        ]
+        if parquet_available():
+            cases.append(("detailed", "parquet", lambda rows: iter_parquet(rows)))
+        for report, fmt, encode in cases:
+            result = measure(encode(iter_report_rows(report, session_factory=Session)))
+            print(json.dumps({"report": report, "format": fmt, "rows": args.rows, **result}))
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
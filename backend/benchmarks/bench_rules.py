@@ -0,0 +1,60 @@
+# backend/benchmarks/bench_rules.py
+"""
+Measure the keyword-rule tier: share of rows it answers and its throughput, and
+(with --model) end-to-end classify time with and without rules in front of the model.
+
+    python -m backend.benchmarks.bench_rules --rows 100000
+    python -m backend.benchmarks.bench_rules --rows 20000 --model
+"""
+
+import argparse
+import json
+import time
+
+from backend.app.models.merchant_rules import load_rules
+from backend.benchmarks.bench_classify import make_descriptions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--rules", default=None, help="rules JSON (default: MERCHANT_RULES_PATH)")
+    parser.add_argument("--model", action="store_true", help="also time the model with and without the rule tier")
+    args = parser.parse_args()
+
+    rules = load_rules(args.rules)
+    descriptions = make_descriptions(args.rows)
+
+    start = time.perf_counter()
+    matched = [rules.match(desc) for desc in descriptions]
+    rule_seconds = time.perf_counter() - start
+    unmatched = [desc for desc, category in zip(descriptions, matched) if category is None]
+
+    result = {
+        "rows": args.rows,
+        "keywords": len(rules),
+        "rules_fraction": round(1 - len(unmatched) / args.rows, 4),
+        "model_fraction": round(len(unmatched) / args.rows, 4),
+        "rules_rows_per_sec": round(args.rows / rule_seconds, 1),
+    }
+
+    if args.model:
+        from backend.app.models import category_model as cm
+
+        cm.load_classifier()
+        # Straight to predict_label_ids so the prediction cache does not hide the difference
+        start = time.perf_counter()
+        cm.predict_label_ids(descriptions)
+        result["model_only_rows_per_sec"] = round(args.rows / (time.perf_counter() - start), 1)
+
+        start = time.perf_counter()
+        [rules.match(desc) for desc in descriptions]
+        if unmatched:
+            cm.predict_label_ids(unmatched)
+        result["rules_then_model_rows_per_sec"] = round(args.rows / (time.perf_counter() - start), 1)
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# backend/benchmarks/bench_startup.py
+"""
+Measure API cold start and first-request latency.
+
+Starts uvicorn in a subprocess and records:
+  - time until GET / answers (process start -> serving)
+  - latency of the first GET /budgets/view
+  - time until GET /ready reports the classifier loaded
+  - latency of the first POST /categorize
+
+Run it on the baseline commit and on this one to get before/after numbers
+(/ready does not exist before lazy loading; that field is then reported as null).
+The server runs with the merchant rule tier and the on-disk prediction cache off,
+and the first /categorize uses descriptions no rule matches, so that request
+really goes to the model.
+
+    python -m backend.benchmarks.bench_startup --port 8765
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+# No merchant rule keyword in these, so the first /categorize has to load the model
+FIRST_DESCRIPTIONS = ["ACME HARDWARE STORE 0412", "CITY WATER UTILITY PAYMENT"]
+
+
+def _request(url, data=None, timeout=120):
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            resp.read()
+            status = resp.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return status, time.perf_counter() - start
+
+
+def _wait_until(url, deadline, want=200):
+    while time.perf_counter() < deadline:
+        try:
+            status, _ = _request(url, timeout=5)
+            if status == want:
+                return True
+            if status == 404:
+                return None
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(0.05)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=300)
+    args = parser.parse_args()
+    base = f"http://127.0.0.1:{args.port}"
+
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.app.main:app", "--port", str(args.port)],
+        env=dict(os.environ, MERCHANT_RULES_PATH="", PREDICTION_CACHE_DB=""),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = start + args.timeout
+    result = {}
+    try:
+        if not _wait_until(f"{base}/", deadline):
+            raise SystemExit("server did not start")
+        result["cold_start_seconds"] = round(time.perf_counter() - start, 3)
+
+        _, latency = _request(f"{base}/budgets/view")
+        result["first_view_latency_seconds"] = round(latency, 3)
+
+        ready = _wait_until(f"{base}/ready", deadline)
+        result["ready_after_seconds"] = round(time.perf_counter() - start, 3) if ready else None
+
+        body = json.dumps({"descriptions": FIRST_DESCRIPTIONS}).encode()
+        status, latency = _request(f"{base}/categorize", data=body)
+        result["first_categorize_status"] = status
+        result["first_categorize_latency_seconds"] = round(latency, 3)
+    finally:
+        proc.terminate()
+        proc.wait()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# backend/benchmarks/bench_summary.py
+"""
+Dashboard read latency from the spend summary vs scanning the transactions table.
+
+Loads --rows synthetic transactions (default 1M) into a throwaway SQLite file through
+the bulk insert path, which maintains the summary, then times each read both ways.
+
+    python -m backend.benchmarks.bench_summary --rows 1000000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import extract, func
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.db import init_db, make_engine
+from backend.app.models.transaction_model import Transaction
+from backend.app.models.transaction_store import bulk_insert_transactions
+from backend.app.spend_summary import category_totals, check_consistency, monthly_totals
+from backend.benchmarks.bench_insert import make_rows
+
+
+def raw_category_totals(db):
+    return db.query(Transaction.category, func.sum(Transaction.amount)).group_by(Transaction.category).all()
+
+
+def raw_monthly_totals(db):
+    return (
+        db.query(extract("year", Transaction.date), extract("month", Transaction.date), func.sum(Transaction.amount))
+        .group_by(extract("year", Transaction.date), extract("month", Transaction.date))
+        .all()
+    )
+
+
+def populate(db, rows: int):
+    # Insert in slices so the generator never holds all rows
+    for start in range(0, rows, 100_000):
+        batch = make_rows(min(100_000, rows - start), seed=start)
+        for i, row in enumerate(batch):
+            row["category"] = ("Food & Beverage", "Transport", "Shopping", "Bills")[i % 4]
+        bulk_insert_transactions(db, batch, commit=True)
+
+
+def timed(fn, db, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(db)
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        init_db(engine)
+        db = sessionmaker(bind=engine)()
+        populate(db, args.rows)
+
+        result = {
+            "rows": args.rows,
+            "category_totals_ms": {"raw": timed(raw_category_totals, db, args.repeat),
+                                   "summary": timed(category_totals, db, args.repeat)},
+            "monthly_totals_ms": {"raw": timed(raw_monthly_totals, db, args.repeat),
+                                  "summary": timed(monthly_totals, db, args.repeat)},
+            "consistent": check_consistency(db)["consistent"],
+        }
+        db.close()
+        engine.dispose()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# backend/benchmarks/bench_train.py
+"""
+Compare the original training setup (fixed max_length padding, batch 8) with the
+fast mode (dynamic padding, length grouping, larger batch) on CPU.
+
+Each mode trains into its own temporary directory in a subprocess, so the served
+model in backend/app/models/txn_classifier is left untouched.
+
+    python -m backend.benchmarks.bench_train --rows 5000 --epochs 1
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+from backend.benchmarks.bench_classify import make_descriptions
+
+LABELS = {
+    "UBER": "Transport", "OLA": "Transport", "HP PETROL": "Transport",
+    "SWIGGY": "Food & Beverage", "ZOMATO": "Food & Beverage", "BIGBASKET": "Groceries",
+    "DMART": "Groceries", "NETFLIX": "Entertainment", "PVR": "Entertainment",
+    "AMAZON": "Shopping", "APOLLO": "Health", "AIRTEL": "Utilities",
+}
+
+
+def write_labeled_csv(path: str, rows: int):
+    descriptions = make_descriptions(rows)
+    categories = [next(v for k, v in LABELS.items() if d.startswith(k)) for d in descriptions]
+    pd.DataFrame({"description": descriptions, "category": categories}).to_csv(path, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--epochs", type=float, default=1)
+    parser.add_argument("--batch-size", type=int, default=None, help="fast mode batch size")
+    args = parser.parse_args()
+
+    random.seed(7)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        data = os.path.join(tmp, "labeled.csv")
+        write_labeled_csv(data, args.rows)
+        env = dict(os.environ, TOKENIZED_CACHE_DIR=os.path.join(tmp, "tokenized"))
+        # fast twice: the second run reuses the tokenized dataset from the first
+        for mode in ["legacy", "fast", "fast"]:
+            cmd = [sys.executable, "-m", "backend.app.train_classifier", "--data", data, "--mode", mode,
+                   "--epochs", str(args.epochs), "--output-dir", os.path.join(tmp, f"out-{mode}")]
+            if mode == "fast" and args.batch_size:
+                cmd += ["--batch-size", str(args.batch_size)]
+            out = subprocess.run(cmd, capture_output=True, text=True, check=True, env=env).stdout
+            # The summary JSON is printed just before the final ✅ line
+            summary = out[out.rindex("\n{") + 1:out.rindex("}") + 1]
+            results.append(json.loads(summary))
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
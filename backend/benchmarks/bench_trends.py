@@ -0,0 +1,72 @@
+# backend/benchmarks/bench_trends.py
+"""
+Columnar analytics engine on a large history: snapshot export time, incremental
+refresh time and /budgets/trends query latency (unfiltered, date range, category).
+
+    python -m backend.benchmarks.bench_trends --rows 10000000
+    ANALYTICS_ENGINE=arrow python -m backend.benchmarks.bench_trends --rows 1000000
+"""
+
+import argparse
+import json
+import os
+import resource
+import tempfile
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.db import init_db, make_engine
+from backend.app.schemas import SpendFilters
+from backend.benchmarks.bench_summary import populate, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["ANALYTICS_SNAPSHOT_DIR"] = os.path.join(tmp, "analytics")
+        from backend.app import analytics_engine
+
+        analytics_engine.ANALYTICS_SNAPSHOT_DIR = os.environ["ANALYTICS_SNAPSHOT_DIR"]
+        engine = make_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        init_db(engine)
+        db = sessionmaker(bind=engine)()
+        populate(db, args.rows)
+
+        start = time.perf_counter()
+        analytics_engine.refresh_snapshot(db, force=True)
+        export_seconds = time.perf_counter() - start
+
+        populate(db, 10_000)
+        start = time.perf_counter()
+        analytics_engine.refresh_snapshot(db)
+        incremental_seconds = time.perf_counter() - start
+
+        scenarios = {
+            "all": None,
+            "one_year": SpendFilters(date_from="2023-01-01", date_to="2023-12-31"),
+            "one_category": SpendFilters(category="Transport"),
+        }
+        latency = {
+            name: timed(lambda session, f=filters: analytics_engine.trends(session, filters=f), db, args.repeat)
+            for name, filters in scenarios.items()
+        }
+        db.close()
+        engine.dispose()
+
+    print(json.dumps({
+        "rows": args.rows,
+        "engine": analytics_engine.engine_name(),
+        "export_seconds": round(export_seconds, 2),
+        "incremental_refresh_seconds_10k": round(incremental_seconds, 3),
+        "trends_ms": latency,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+# backend/benchmarks/suite.py
+"""
+Reproducible benchmark suite for the ingestion, classification and analytics paths.
+
+For each size (default 10k, 100k, 1M rows) a fresh subprocess gets its own throwaway
+SQLite database, prediction cache and upload spool, starts the real FastAPI app in
+process and runs:
+
+  upload          POST /budgets/upload-csv?wait=true with a synthetic statement
+  classify        classify_transactions over fresh rows in request-sized batches
+  compute_spend   GET /budgets/compute_spend
+  insights        GET /budgets/insights
+  analytics       GET /budgets/analytics
+  forecast        GET /budgets/forecast
+
+Each read is timed with the response cache (response_cache.py) off, so every request
+runs its queries, and again with it on as <name>_cached, where all but the first
+request are served from the in-process LRU.
+
+The classifier is the weightless stub backend (CLASSIFIER_BACKEND=stub) unless
+--classifier model is given, so the suite runs anywhere. Each scenario reports
+rows/sec (or requests/sec), p50/p99 latency and the process peak RSS after it ran.
+
+    python -m backend.benchmarks.suite --out results.json
+    python -m backend.benchmarks.suite --sizes 10000 --out new.json
+    python -m backend.benchmarks.suite --compare base.json new.json --threshold 0.15
+
+--compare exits with status 1 if any shared metric regressed by more than the threshold.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from backend.benchmarks.synthetic import iter_transactions, write_csv
+
+READ_PATHS = {
+    "compute_spend": "/budgets/compute_spend",
+    "insights": "/budgets/insights",
+    "analytics": "/budgets/analytics",
+    "forecast": "/budgets/forecast",
+}
+
+# metric -> True if higher is better
+METRICS = {
+    "rows_per_sec": True,
+    "requests_per_sec": True,
+    "p50_ms": False,
+    "p99_ms": False,
+    "peak_rss_mb": False,
+}
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _latency_stats(samples_ms):
+    return {
+        "p50_ms": round(statistics.median(samples_ms), 3),
+        "p99_ms": round(_percentile(samples_ms, 99), 3),
+    }
+
+
+def _peak_rss_mb():
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def run_size(rows: int, requests: int, classify_batch: int):
+    """
+    Runs inside the per-size subprocess; env already points the app at a scratch database.
+    """
+    from fastapi.testclient import TestClient
+    from backend.app import response_cache
+    from backend.app.main import app
+    from backend.app.models.category_model import classify_transactions
+
+    scenarios = {}
+    tmp = os.environ["BENCH_TMP"]
+    csv_path = os.path.join(tmp, "statement.csv")
+    write_csv(csv_path, rows)
+
+    with TestClient(app) as client:
+        start = time.perf_counter()
+        with open(csv_path, "rb") as fh:
+            resp = client.post("/budgets/upload-csv?wait=true", files={"file": ("statement.csv", fh, "text/csv")})
+        elapsed = time.perf_counter() - start
+        resp.raise_for_status()
+        saved = resp.json().get("rows_saved", rows)
+        scenarios["upload"] = {
+            "rows": saved,
+            "seconds": round(elapsed, 3),
+            "rows_per_sec": round(saved / elapsed, 1),
+            "peak_rss_mb": _peak_rss_mb(),
+        }
+
+        # A different seed: mostly repeat merchants, some never seen by the upload
+        descriptions = [d for d, _, _ in iter_transactions(rows, seed=11)]
+        samples = []
+        start = time.perf_counter()
+        for offset in range(0, len(descriptions), classify_batch):
+            t0 = time.perf_counter()
+            classify_transactions(descriptions[offset:offset + classify_batch])
+            samples.append((time.perf_counter() - t0) * 1000)
+        elapsed = time.perf_counter() - start
+        scenarios["classify"] = {
+            "rows": len(descriptions),
+            "batch_rows": classify_batch,
+            "seconds": round(elapsed, 3),
+            "rows_per_sec": round(len(descriptions) / elapsed, 1),
+            **_latency_stats(samples),
+            "peak_rss_mb": _peak_rss_mb(),
+        }
+
+        cache_size = response_cache.RESPONSE_CACHE_SIZE
+        for suffix, size in (("", 0), ("_cached", cache_size or 256)):
+            response_cache.RESPONSE_CACHE_SIZE = size
+            response_cache._bodies.clear()
+            for name, path in READ_PATHS.items():
+                client.get(path).raise_for_status()  # warm connection pool and caches
+                samples = []
+                start = time.perf_counter()
+                for _ in range(requests):
+                    t0 = time.perf_counter()
+                    client.get(path).raise_for_status()
+                    samples.append((time.perf_counter() - t0) * 1000)
+                elapsed = time.perf_counter() - start
+                scenarios[name + suffix] = {
+                    "requests": requests,
+                    "requests_per_sec": round(requests / elapsed, 1),
+                    **_latency_stats(samples),
+                    "peak_rss_mb": _peak_rss_mb(),
+                }
+        response_cache.RESPONSE_CACHE_SIZE = cache_size
+
+    print(json.dumps(scenarios))
+
+
+def run_suite(sizes, requests: int, classify_batch: int, classifier: str):
+    results = {}
+    for rows in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(
+                os.environ,
+                BENCH_TMP=tmp,
+                DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+                PREDICTION_CACHE_DB=os.path.join(tmp, "prediction_cache.db"),
+                UPLOAD_SPOOL_DIR=os.path.join(tmp, "uploads"),
+                CLASSIFIER_WARMUP="0",
+            )
+            if classifier == "stub":
+                env["CLASSIFIER_BACKEND"] = "stub"
+            proc = subprocess.run(
+                [sys.executable, "-m", "backend.benchmarks.suite", "--one", str(rows),
+                 "--requests", str(requests), "--classify-batch", str(classify_batch)],
+                env=env, capture_output=True, text=True,
+            )
+            if proc.returncode != 0:
+                results[str(rows)] = {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr else "failed"}
+            else:
+                results[str(rows)] = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(f"{rows} rows done", file=sys.stderr)
+
+    commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    return {
+        "meta": {
+            "commit": commit or None,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "classifier": classifier,
+            "requests": requests,
+            "classify_batch": classify_batch,
+        },
+        "results": results,
+    }
+
+
+def compare(base: dict, new: dict, threshold: float):
+    """
+    List of regressions: metrics that got worse by more than threshold (a fraction).
+    """
+    regressions = []
+    for size, scenarios in new["results"].items():
+        for scenario, metrics in scenarios.items():
+            before = base["results"].get(size, {}).get(scenario)
+            if not isinstance(metrics, dict) or not isinstance(before, dict):
+                continue
+            for metric, higher_is_better in METRICS.items():
+                if metric not in metrics or not before.get(metric):
+                    continue
+                change = (metrics[metric] - before[metric]) / before[metric]
+                worse = -change if higher_is_better else change
+                if worse > threshold:
+                    regressions.append({
+                        "size": size,
+                        "scenario": scenario,
+                        "metric": metric,
+                        "base": before[metric],
+                        "new": metrics[metric],
+                        "change_pct": round(change * 100, 1),
+                    })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--requests", type=int, default=50, help="requests per read endpoint")
+    parser.add_argument("--classify-batch", type=int, default=1000)
+    parser.add_argument("--classifier", choices=["stub", "model"], default="stub")
+    parser.add_argument("--out", help="write results JSON here (default: stdout)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="compare two result files")
+    parser.add_argument("--threshold", type=float, default=0.10, help="regression threshold, fraction")
+    parser.add_argument("--one", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.one:
+        run_size(args.one, args.requests, args.classify_batch)
+        return
+
+    if args.compare:
+        with open(args.compare[0]) as fh:
+            base = json.load(fh)
+        with open(args.compare[1]) as fh:
+            new = json.load(fh)
+        regressions = compare(base, new, args.threshold)
+        print(json.dumps({"threshold": args.threshold, "regressions": regressions}, indent=2))
+        sys.exit(1 if regressions else 0)
+
+    report = run_suite(args.sizes, args.requests, args.classify_batch, args.classifier)
+    if args.out:
+        with open(args.out, "w") as fh:
+            json.dump(report, fh, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
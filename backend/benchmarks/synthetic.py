@@ -0,0 +1,75 @@
+# backend/benchmarks/synthetic.py
+"""
+Synthetic bank-statement transactions with realistic shape:
+
+  - merchant popularity is Zipf-like, so a few merchants dominate (like real statements)
+    and repeated descriptions exercise the prediction cache and keyword index
+  - each merchant has its own typical amount (log-normal around a per-merchant mean)
+  - dates spread over --months months, weighted toward weekends and month starts
+  - a small share of long UPI-style narrations and unique one-off merchants
+
+Deterministic for a given seed.
+"""
+
+import csv
+import math
+import random
+from datetime import date, timedelta
+
+from backend.benchmarks.bench_classify import MERCHANTS
+
+BRANCHES = ["MUMBAI", "DELHI", "BANGALORE", "PUNE", "CHENNAI", "HYDERABAD", "KOLKATA", "ONLINE"]
+
+
+def merchant_pool(size: int, seed: int = 7):
+    """
+    (description prefix, mean amount) pairs; base merchants crossed with branches.
+    """
+    rng = random.Random(seed)
+    pool = []
+    for i in range(size):
+        base = MERCHANTS[i % len(MERCHANTS)]
+        branch = BRANCHES[(i // len(MERCHANTS)) % len(BRANCHES)]
+        pool.append((f"{base} {branch} {i // (len(MERCHANTS) * len(BRANCHES)) or ''}".strip(),
+                     math.exp(rng.uniform(math.log(50), math.log(5000)))))
+    return pool
+
+
+def iter_transactions(rows: int, seed: int = 7, merchants: int = 2000, months: int = 24,
+                      start: date = date(2023, 1, 1)):
+    """
+    Yield (description, amount, iso date) tuples.
+    """
+    rng = random.Random(seed)
+    pool = merchant_pool(merchants, seed)
+    # Zipf(s=1.1) popularity over the merchant pool
+    cum_weights, total = [], 0.0
+    for rank in range(1, merchants + 1):
+        total += 1 / rank ** 1.1
+        cum_weights.append(total)
+    days = months * 30
+    day_weights, total = [], 0.0
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        total += (1.6 if day.weekday() >= 5 else 1.0) * (1.4 if day.day <= 3 else 1.0)
+        day_weights.append(total)
+
+    for _ in range(rows):
+        roll = rng.random()
+        if roll < 0.02:
+            description = f"POS {rng.randint(10**7, 10**8)} LOCAL STORE"
+            mean = 300
+        else:
+            description, mean = rng.choices(pool, cum_weights=cum_weights)[0]
+            if roll < 0.03:
+                description += " UPI/P2M/" + "/".join(str(rng.randint(10**5, 10**9)) for _ in range(8))
+        amount = round(max(1.0, rng.lognormvariate(math.log(mean), 0.4)), 2)
+        day = start + timedelta(days=rng.choices(range(days), cum_weights=day_weights)[0])
+        yield description, amount, day.isoformat()
+
+
+def write_csv(path: str, rows: int, seed: int = 7, **kwargs):
+    with open(path, "w", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["description", "amount", "date"])
+        writer.writerows(iter_transactions(rows, seed=seed, **kwargs))
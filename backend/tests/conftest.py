@@ -0,0 +1,78 @@
+# backend/tests/conftest.py
+"""
+Shared fixtures. The app reads its configuration at import time, so point every
+data location at a throwaway directory before anything from backend.app is imported.
+"""
+
+import os
+import shutil
+import tempfile
+
+_DATA_DIR = tempfile.mkdtemp(prefix="smart-budget-tests-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(_DATA_DIR, 'app.db')}",
+    "PREDICTION_CACHE_DB": "",
+    "CLASSIFIER_BACKEND": "stub",
+    "CLASSIFIER_WARMUP": "0",
+    "MERCHANT_RULES_PATH": "",
+    "UPLOAD_SPOOL_DIR": os.path.join(_DATA_DIR, "uploads"),
+    "ANALYTICS_SNAPSHOT_DIR": os.path.join(_DATA_DIR, "analytics"),
+    "TOKENIZED_CACHE_DIR": os.path.join(_DATA_DIR, "tokenized"),
+    "PROFILE_DIR": os.path.join(_DATA_DIR, "profiles"),
+})
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app import analytics_engine, budget_matching, response_cache
+from backend.app.db import Base, SessionLocal, engine
+from backend.app.main import app
+
+
+def pytest_sessionfinish(session, exitstatus):
+    engine.dispose()
+    shutil.rmtree(_DATA_DIR, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def empty_database():
+    """
+    Every test starts from empty tables and empty in-process caches.
+    """
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+    response_cache._bodies.clear()
+    budget_matching._matches.clear()
+    shutil.rmtree(analytics_engine.ANALYTICS_SNAPSHOT_DIR, ignore_errors=True)
+    yield
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def upload(client):
+    """
+    POST a CSV string to /budgets/upload-csv, inline, as an optional tenant.
+    """
+    def _upload(content: str, tenant: str = None, filename: str = "statement.csv"):
+        headers = {"X-Tenant-ID": tenant} if tenant else {}
+        return client.post(
+            "/budgets/upload-csv?wait=true",
+            files={"file": (filename, content.encode(), "text/csv")},
+            headers=headers,
+        )
+    return _upload
@@ -0,0 +1,111 @@
+# backend/tests/test_analytics_engine.py
+import multiprocessing
+import os
+import threading
+from datetime import date
+
+from backend.app import analytics_engine
+from backend.app.analytics_engine import reading_snapshot, refresh_snapshot, snapshot_dir, trends
+from backend.app.db import SessionLocal
+from backend.app.models.transaction_store import bulk_insert_transactions
+
+
+def _add(db, n, day=1):
+    bulk_insert_transactions(db, [
+        {"description": f"purchase {i}", "amount": 10.0 + i, "date": date(2026, 9, day), "category": "Food"}
+        for i in range(n)
+    ], commit=True)
+
+
+def _parts(manifest):
+    return [os.path.join(snapshot_dir("default"), name) for name in manifest["files"]]
+
+
+def test_rebuild_keeps_parts_a_query_is_reading(db):
+    _add(db, 3)
+    first = refresh_snapshot(db)
+    with reading_snapshot() as manifest:
+        assert manifest["files"] == first["files"]
+        rebuilt = refresh_snapshot(db, force=True)
+        # The reader's parts survive the rebuild and are queued for deletion
+        assert all(os.path.exists(path) for path in _parts(manifest))
+        assert rebuilt["stale"] == first["files"]
+    _add(db, 1)
+    later = refresh_snapshot(db)
+    assert later["stale"] == []
+    assert not any(os.path.exists(path) for path in _parts(first))
+
+
+def _hold_snapshot(started, release):
+    with reading_snapshot():
+        started.set()
+        release.wait(10)
+
+
+def test_parts_are_kept_while_another_process_reads(db):
+    _add(db, 3)
+    first = refresh_snapshot(db)
+    context = multiprocessing.get_context("fork")
+    started, release = context.Event(), context.Event()
+    reader = context.Process(target=_hold_snapshot, args=(started, release))
+    reader.start()
+    try:
+        assert started.wait(10)
+        rebuilt = refresh_snapshot(db, force=True)
+        assert rebuilt["stale"] == first["files"]
+        assert all(os.path.exists(path) for path in _parts(first))
+    finally:
+        release.set()
+        reader.join(10)
+    assert refresh_snapshot(db, force=True)["stale"] == []
+    assert not any(os.path.exists(path) for path in _parts(first))
+
+
+def test_queries_survive_concurrent_rebuilds(db):
+    _add(db, 50)
+    errors = []
+    stop = threading.Event()
+
+    def query():
+        session = SessionLocal()
+        try:
+            while not stop.is_set():
+                assert trends(session)["snapshot_rows"] >= 50
+        except Exception as e:
+            errors.append(e)
+        finally:
+            session.close()
+
+    readers = [threading.Thread(target=query) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    try:
+        for i in range(20):
+            _add(db, 1, day=2)
+            refresh_snapshot(db, force=True)
+    finally:
+        stop.set()
+        for thread in readers:
+            thread.join(10)
+    assert errors == []
+    manifest = refresh_snapshot(db, force=True)
+    on_disk = set(os.listdir(snapshot_dir("default"))) - {
+        analytics_engine.MANIFEST, analytics_engine.REFRESH_LOCK, analytics_engine.READ_LOCK,
+    }
+    # Every part dropped along the way was deleted once nothing was reading it
+    assert manifest["stale"] == []
+    assert on_disk == set(manifest["files"])
+    assert trends(db)["snapshot_rows"] == 70
+
+
+def test_clear_then_same_size_upload_is_not_served_from_the_old_snapshot(client, upload):
+    upload("description,amount,date\nstarbucks coffee,5,2024-01-03\nuber ride,12,2024-01-04\n")
+    assert [row["month"] for row in client.get("/budgets/trends").json()["monthly"]] == ["2024-01", "2024-01"]
+    client.delete("/budgets/transactions/clear")
+
+    # The table is empty again, so the new rows get the old ids back
+    upload("description,amount,date\nrent payment,1000,2024-03-01\nnetflix,15,2024-03-02\n")
+    body = client.get("/budgets/trends").json()
+    assert body["snapshot_rows"] == 2
+    assert {row["month"] for row in body["monthly"]} == {"2024-03"}
+    assert sum(row["total"] for row in body["monthly"]) == 1015
@@ -0,0 +1,62 @@
+# backend/tests/test_budget_store.py
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from backend.app.data_version import read_data_version
+from backend.app.db import dialect_insert
+from backend.app.models.budget_model import Budget
+from backend.app.models.budget_store import delete_budgets, replace_budgets, upsert_budgets
+
+
+def _limits(db, tenant_id="default"):
+    return {b.category: b.limit for b in db.query(Budget).filter(Budget.tenant_id == tenant_id)}
+
+
+def test_upsert_inserts_and_updates_in_one_call(db):
+    upsert_budgets(db, [("Food", 100.0), ("Bills", 900.0)])
+    db.commit()
+    food_id = db.query(Budget).filter(Budget.category == "Food").one().id
+
+    saved = upsert_budgets(db, [("Travel", 50.0), ("Food", 150.0), ("Travel", 75.0)])
+    db.commit()
+    # Input order, one row per repeat, last limit wins; updates keep the row
+    assert [(b.category, b.limit) for b in saved] == [("Travel", 75.0), ("Food", 150.0), ("Travel", 75.0)]
+    assert saved[1].id == food_id
+    assert _limits(db) == {"Food": 150.0, "Bills": 900.0, "Travel": 75.0}
+
+
+def test_writes_bump_the_version_and_stay_in_tenant(db):
+    assert upsert_budgets(db, []) == []
+    assert read_data_version(db) == 0
+
+    upsert_budgets(db, [("Food", 100.0)], tenant_id="acme")
+    upsert_budgets(db, [("Food", 10.0)])
+    db.commit()
+    assert (read_data_version(db, "acme"), read_data_version(db)) == (1, 1)
+
+    assert delete_budgets(db, ["Food", "Food"]) == 1
+    replace_budgets(db, [("Bills", 5.0)], tenant_id="acme")
+    db.commit()
+    assert _limits(db) == {}
+    assert _limits(db, "acme") == {"Bills": 5.0}
+    assert read_data_version(db, "acme") > 1
+
+
+def test_bulk_endpoint_upserts(client):
+    client.post("/budgets/bulk", json=[{"category": "Food", "limit": 100}])
+    response = client.post("/budgets/bulk", json=[{"category": "Food", "limit": 120}, {"category": "Bills", "limit": 9}])
+    assert [(b["category"], b["limit"]) for b in response.json()] == [("Food", 120.0), ("Bills", 9.0)]
+    assert sorted(b["category"] for b in client.get("/budgets/view").json()) == ["Bills", "Food"]
+
+
+def test_dialect_insert_follows_the_bound_database(db):
+    assert db.get_bind().dialect.name == "sqlite"
+    for module in (sqlite, postgresql):
+        dialect = module.dialect()
+        bound = SimpleNamespace(get_bind=lambda dialect=dialect: SimpleNamespace(dialect=dialect))
+        stmt = dialect_insert(bound, Budget.__table__)
+        assert isinstance(stmt, module.Insert)
+        stmt = stmt.on_conflict_do_update(index_elements=["tenant_id", "category"], set_={"limit": stmt.excluded.limit})
+        sql = str(stmt.compile(dialect=dialect))
+        assert "ON CONFLICT (tenant_id, category) DO UPDATE" in sql
@@ -0,0 +1,94 @@
+# backend/tests/test_dedupe.py
+import io
+from datetime import date, datetime
+
+import pandas as pd
+
+from backend.app import ingest
+from backend.app.dedupe import fingerprint_rows
+from backend.app.ingest import ingest_csv, parse_chunk
+from backend.app.models.transaction_model import Transaction
+
+
+def classify(descriptions):
+    return ["Misc"] * len(descriptions)
+
+
+def _clean(rows, today=date(2026, 10, 16)):
+    chunk = pd.DataFrame(rows, columns=["description", "amount", "date"], dtype=object)
+    clean, errors = parse_chunk(chunk, 1, today)
+    assert errors == []
+    return clean
+
+
+def test_identical_rows_get_distinct_occurrence_fingerprints():
+    rows = [["Coffee", "4.50", "2026-10-01"], ["coffee ", "4.5", "2026-10-01"], ["Coffee", "4.50", "2026-10-02"]]
+    fingerprints = fingerprint_rows(_clean(rows), {})
+    # Same normalized (description, amount, date) twice: kept apart by occurrence number
+    assert len(set(fingerprints)) == 3
+    # ...and numbered the same way on every upload
+    assert fingerprint_rows(_clean(rows), {}) == fingerprints
+
+
+def test_occurrence_counts_carry_across_chunks():
+    rows = [["Coffee", "4.50", "2026-10-01"]] * 3
+    whole = fingerprint_rows(_clean(rows), {})
+    occurrences = {}
+    split = fingerprint_rows(_clean(rows[:2]), occurrences) + fingerprint_rows(_clean(rows[2:]), occurrences)
+    assert split == whole
+
+
+def test_equivalent_date_formats_share_a_fingerprint():
+    assert fingerprint_rows(_clean([["Rent", "1000", "2026-10-01"]]), {}) == \
+        fingerprint_rows(_clean([["Rent", "1000", "01/10/2026"]]), {})
+
+
+def test_missing_date_is_not_fingerprinted_as_the_upload_day():
+    undated = [["RENT", "1000", None]]
+    monday = fingerprint_rows(_clean(undated, today=date(2026, 10, 12)), {})
+    tuesday = fingerprint_rows(_clean(undated, today=date(2026, 10, 13)), {})
+    assert monday == tuesday
+    # The stored date still falls back to the upload day
+    assert _clean(undated, today=date(2026, 10, 12))["date"].tolist() == [date(2026, 10, 12)]
+
+
+def test_undated_row_reuploaded_next_day_is_a_duplicate(db, monkeypatch):
+    class NextDay(datetime):
+        @classmethod
+        def utcnow(cls):
+            return datetime(2026, 10, 13, 9, 0)
+
+    first = ingest_csv(io.BytesIO(b"description,amount\nRENT,1000\n"), db, classify)
+    monkeypatch.setattr(ingest, "datetime", NextDay)
+    second = ingest_csv(io.BytesIO(b"description,amount\nRENT,1000\nCOFFEE,4\n"), db, classify)
+    assert first["rows_saved"] == 1
+    assert (second["rows_saved"], second["rows_duplicate"]) == (1, 1)
+
+
+def test_overlap_spanning_chunks_is_skipped(db):
+    rows = "".join("Coffee,4.50,2026-10-01\n" for _ in range(5))
+    first = ingest_csv(io.BytesIO(("description,amount,date\n" + rows).encode()), db, classify, chunk_rows=2)
+    # The same five purchases plus a sixth identical one, chunked differently
+    again = "description,amount,date\n" + rows + "Coffee,4.50,2026-10-01\n"
+    second = ingest_csv(io.BytesIO(again.encode()), db, classify, chunk_rows=3)
+    assert first["rows_saved"] == 5
+    assert (second["rows_saved"], second["rows_duplicate"]) == (1, 5)
+    assert db.query(Transaction).count() == 6
+
+
+def test_rows_stored_concurrently_are_skipped_on_integrity_error(db, monkeypatch):
+    content = b"description,amount,date\nCoffee,4.50,2026-10-01\nRent,1000,2026-10-01\n"
+    ingest_csv(io.BytesIO(b"description,amount,date\nCoffee,4.50,2026-10-01\n"), db, classify)
+    # Pretend the lookup ran before another upload committed Coffee
+    monkeypatch.setattr(ingest, "_drop_known", lambda db, clean, tenant_id: (clean, 0))
+    summary = ingest_csv(io.BytesIO(content), db, classify)
+    assert (summary["rows_saved"], summary["rows_duplicate"]) == (1, 1)
+    assert sorted(d for (d,) in db.query(Transaction.description)) == ["Coffee", "Rent"]
+
+
+def test_identical_file_is_refused(upload):
+    content = "description,amount,date\nCoffee,4.50,2026-10-01\n"
+    assert upload(content).status_code == 200
+    again = upload(content, filename="renamed.csv")
+    assert again.status_code == 409
+    assert "already uploaded" in again.json()["detail"]
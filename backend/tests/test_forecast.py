@@ -0,0 +1,126 @@
+# backend/tests/test_forecast.py
+"""
+Hand-computed projections. October 2026 has 31 days; on the 10th, 10 days have
+elapsed and 21 are left, so the run rate gets weight 10/31 against the seasonal
+estimate.
+"""
+
+from datetime import date
+
+import pytest
+
+from backend.app.forecast import forecast
+from backend.app.models.budget_store import upsert_budgets
+from backend.app.models.transaction_store import bulk_insert_transactions
+
+
+def _spend(db, *rows):
+    bulk_insert_transactions(db, [
+        {"description": f"{category} purchase", "amount": amount, "date": day, "category": category}
+        for category, amount, day in rows
+    ], commit=True)
+
+
+def _budgets(db, **limits):
+    upsert_budgets(db, list(limits.items()))
+    db.commit()
+
+
+def _by_category(result):
+    return {row["category"]: row for row in result["forecast"]}
+
+
+@pytest.fixture
+def current_month(db):
+    _spend(
+        db,
+        *[("Food", 10.0, date(2026, 10, day)) for day in range(1, 11)],  # 100 so far, 10/day
+        ("Bills", 500.0, date(2026, 10, 3)),
+        ("Travel", 20.0, date(2026, 10, 2)),
+        ("Misc", 30.0, date(2026, 10, 4)),
+        ("Food", 999.0, date(2026, 11, 1)),  # after as_of: ignored
+    )
+    _budgets(db, Food=200.0, Bills=400.0, Travel=1000.0)
+
+
+def test_run_rate_projection_and_statuses(db, current_month):
+    result = forecast(db, as_of=date(2026, 10, 10), history_months=0)
+    assert (result["days_elapsed"], result["days_in_month"]) == (10, 31)
+    rows = _by_category(result)
+
+    # 100 + 10/day * 21 = 310 > 200; crosses when 100 more is spent at 10/day: day 20
+    food = rows["Food"]
+    assert food["status"] == "projected to overspend"
+    assert (food["daily_run_rate"], food["projected_month_end"]) == (10.0, 310.0)
+    assert food["overspend_date"] == "2026-10-20"
+    assert (food["projected_remaining"], food["projected_percent"]) == (-110.0, 155.0)
+    assert food["seasonal_month_total"] is None
+
+    # Already over: 500 > 400, crossed at 400 / (500/10 per day) = day 8
+    bills = rows["Bills"]
+    assert bills["status"] == "overspent"
+    assert bills["projected_month_end"] == 500.0 + 50.0 * 21
+    assert bills["overspend_date"] == "2026-10-08"
+
+    travel = rows["Travel"]
+    assert travel["status"] == "on track"
+    assert (travel["projected_month_end"], travel["projected_percent"]) == (62.0, 6.2)
+    assert travel["overspend_date"] is None
+
+    misc = rows["Misc"]
+    assert misc["status"] == "no budget set"
+    assert (misc["budget_limit"], misc["projected_remaining"], misc["projected_percent"]) == (0.0, None, None)
+
+    # Sorted by projected month-end, largest first (Misc: 30 + 3/day * 21 = 93)
+    assert misc["projected_month_end"] == 93.0
+    assert [row["category"] for row in result["forecast"]] == ["Bills", "Food", "Misc", "Travel"]
+
+
+def test_month_end_has_nothing_left_to_project(db, current_month):
+    _spend(db, ("Food", 50.0, date(2026, 10, 31)))
+    rows = _by_category(forecast(db, as_of=date(2026, 10, 31), history_months=0))
+
+    # days_left == 0: the projection is exactly the spend, no division blow-ups
+    assert rows["Food"]["projected_month_end"] == 150.0
+    assert rows["Food"]["status"] == "on track"
+    assert rows["Food"]["overspend_date"] is None
+    # 400 at 500/31 per day: ceil(24.8) = day 25
+    assert rows["Bills"]["status"] == "overspent"
+    assert rows["Bills"]["overspend_date"] == "2026-10-25"
+    assert rows["Travel"]["projected_month_end"] == 20.0
+
+
+def test_seasonal_estimate_blends_with_run_rate(db):
+    history = []
+    for months_back in range(1, 13):
+        year, month = divmod(2026 * 12 + 9 - months_back, 12)
+        first = date(year, month + 1, 1)
+        history.append(("Rent", 1000.0, first))
+        # Gifts: 100 a month, but 300 last October
+        history.append(("Gifts", 300.0 if first.month == 10 else 100.0, first))
+    _spend(db, *history, ("Rent", 1000.0, date(2026, 10, 1)), ("Gifts", 50.0, date(2026, 10, 5)))
+    _budgets(db, Rent=1500.0, Gifts=200.0)
+    rows = _by_category(forecast(db, as_of=date(2026, 10, 10), history_months=12))
+
+    # Rent: typical month 1000, all paid already. 1000 + 10/31 * (100/day * 21) + 21/31 * 0
+    rent = rows["Rent"]
+    assert rent["seasonal_month_total"] == 1000.0
+    assert rent["projected_month_end"] == round(1000 + 10 / 31 * 2100, 2)
+    assert rent["status"] == "projected to overspend"
+
+    # Gifts: mean 1400/12, October factor 300 / (1400/12), so the seasonal month is 300.
+    # 50 + 10/31 * (5/day * 21) + 21/31 * (300 - 50)
+    gifts = rows["Gifts"]
+    assert gifts["seasonal_month_total"] == 300.0
+    assert gifts["projected_month_end"] == round(50 + 10 / 31 * 105 + 21 / 31 * 250, 2)
+    # 200 reached after 150 more at the blended pace of 203.23 over 21 days: day 10 + ceil(15.5)
+    assert gifts["status"] == "projected to overspend"
+    assert gifts["overspend_date"] == "2026-10-26"
+
+
+def test_categories_fold_into_fuzzy_matched_budgets(db):
+    _spend(db, ("Food & Beverage", 60.0, date(2026, 10, 2)), ("Food", 40.0, date(2026, 10, 3)))
+    _budgets(db, Food=150.0)
+    rows = _by_category(forecast(db, as_of=date(2026, 10, 10), history_months=0))
+    assert list(rows) == ["Food"]
+    assert rows["Food"]["spent_to_date"] == 100.0
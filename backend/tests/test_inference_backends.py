@@ -0,0 +1,21 @@
+# backend/tests/test_inference_backends.py
+from backend.app.models import category_model
+from backend.app.models.inference_backends import stub_classifier
+from backend.benchmarks.bench_classify import make_descriptions
+
+
+def test_stub_tokenizer_pads_like_the_real_one():
+    clf = stub_classifier()
+    texts = ["uber trip", "netflix", "apollo pharmacy order 1234"]
+    padded = clf.tokenizer(texts, padding=True, truncation=True, return_tensors=clf.runner.tensor_type)
+    assert {len(ids) for ids in padded["input_ids"]} == {4}
+    assert padded["attention_mask"][1] == [1, 0, 0, 0]
+    assert clf.tokenizer(texts, truncation=True)["input_ids"][1] == padded["input_ids"][1][:1]
+
+
+def test_single_shot_and_micro_batched_agree_on_the_stub():
+    clf = stub_classifier()
+    descriptions = make_descriptions(300)
+    inputs = clf.tokenizer(descriptions, padding=True, truncation=True, return_tensors=clf.runner.tensor_type)
+    single_shot = clf.runner.run(dict(inputs))
+    assert category_model.predict_label_ids(descriptions, batch_size=16, clf=clf) == single_shot
@@ -0,0 +1,93 @@
+# backend/tests/test_ingest.py
+import io
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from backend.app import ingest
+from backend.app.ingest import CSVFormatError, ingest_csv, parse_chunk
+from backend.app.models.transaction_model import Transaction
+
+
+def _classify(descriptions):
+    return ["Misc"] * len(descriptions)
+
+
+def _ingest(db, content, chunk_rows=3, **kwargs):
+    return ingest_csv(io.BytesIO(content.encode()), db, classify=_classify, chunk_rows=chunk_rows, **kwargs)
+
+
+def test_parse_chunk_numbers_rows_from_first_row():
+    chunk = pd.DataFrame({
+        "description": ["coffee", "", "rent", None],
+        "amount": ["5", "7", "abc", "1"],
+        "date": ["2026-10-01", "2026-10-02", "bad", None],
+    })
+    clean, errors = parse_chunk(chunk, 41, today=date(2026, 10, 16))
+    assert errors == [
+        {"row": 42, "error": "missing description"},
+        {"row": 43, "error": "invalid amount 'abc'"},
+        {"row": 44, "error": "missing description"},
+    ]
+    assert list(clean.index) == [41]
+    assert clean.loc[41, "date"] == date(2026, 10, 1)
+
+
+def test_undated_and_unparseable_rows_get_today():
+    chunk = pd.DataFrame({"description": ["a", "b", "c"], "amount": ["1", "2", "3"],
+                          "Date": ["16/09/2026", "someday", None]})
+    clean, errors = parse_chunk(chunk, 1, today=date(2026, 10, 16))
+    assert errors == []
+    assert list(clean["date"]) == [date(2026, 9, 16), date(2026, 10, 16), date(2026, 10, 16)]
+    assert list(clean["date_key"]) == ["2026-09-16", "someday", ""]
+
+
+def test_row_numbers_run_across_chunks(db):
+    content = "description,amount,date\n" + "".join(
+        f"{'' if i in (2, 7) else f'item {i}'},{'x' if i == 5 else i},2026-10-01\n" for i in range(1, 9)
+    )
+    progress = []
+    summary = _ingest(db, content, on_progress=lambda s: progress.append(s["rows_total"]))
+    assert progress == [3, 6, 8]
+    assert summary["chunks"] == 3
+    assert (summary["rows_total"], summary["rows_saved"], summary["rows_failed"]) == (8, 5, 3)
+    assert summary["errors"] == [
+        {"row": 2, "error": "missing description"},
+        {"row": 5, "error": "invalid amount 'x'"},
+        {"row": 7, "error": "missing description"},
+    ]
+    assert db.query(Transaction).count() == 5
+
+
+def test_reported_errors_are_capped_but_counted(db, monkeypatch):
+    monkeypatch.setattr(ingest, "MAX_REPORTED_ERRORS", 4)
+    content = "description,amount\n" + "".join(f"row {i},oops\n" for i in range(10))
+    summary = _ingest(db, content)
+    assert summary["rows_failed"] == 10
+    assert [e["row"] for e in summary["errors"]] == [1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("content", [
+    "",
+    "name,value\nx,1\n",
+    "description\ncoffee\n",
+])
+def test_missing_columns_are_a_format_error(db, content):
+    with pytest.raises(CSVFormatError):
+        _ingest(db, content)
+
+
+def test_malformed_csv_midway_keeps_earlier_chunks(db):
+    content = "description,amount\n" + "a,1\nb,2\nc,3\n" + 'd,4\n"e,5\n'
+    with pytest.raises(CSVFormatError, match="after row 3"):
+        _ingest(db, content)
+    # Chunks are committed as they go
+    assert db.query(Transaction).count() == 3
+
+
+def test_upload_reports_bad_rows(upload):
+    body = upload("description,amount,date\nstarbucks coffee,5,2026-10-01\n,3,2026-10-01\nuber,lots,\n").json()
+    assert (body["rows_saved"], body["rows_failed"]) == (1, 2)
+    assert [e["row"] for e in body["errors"]] == [2, 3]
+    assert upload("just,some,text\n1,2,3\n").status_code == 400
@@ -0,0 +1,112 @@
+# backend/tests/test_jobs.py
+import io
+import os
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from backend.app import jobs
+from backend.app.jobs import JobQueueFull, mark_interrupted_jobs, submit_csv_job
+from backend.app.models.job_model import IngestJob
+
+STATEMENT = "description,amount,date\nstarbucks coffee,5,2026-10-01\n,3,2026-10-02\nrent,1000,2026-10-01\n"
+
+
+def _wait_for_job(client, job_id):
+    for _ in range(200):
+        job = client.get(f"/budgets/jobs/{job_id}").json()
+        if job["status"] not in ("queued", "running"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def _spooled():
+    return os.listdir(jobs.UPLOAD_SPOOL_DIR) if os.path.isdir(jobs.UPLOAD_SPOOL_DIR) else []
+
+
+def test_upload_runs_as_a_job_to_completion(client):
+    queued = client.post("/budgets/upload-csv", files={"file": ("s.csv", STATEMENT.encode())})
+    assert queued.status_code == 202
+    assert queued.json()["status"] == "queued"
+
+    job = _wait_for_job(client, queued.json()["job_id"])
+    assert job["status"] == "completed"
+    assert (job["filename"], job["rows_total"], job["rows_done"], job["rows_failed"]) == ("s.csv", 3, 2, 1)
+    assert job["errors"] == [{"row": 2, "error": "missing description"}]
+    assert job["finished_at"] is not None and job["elapsed_seconds"] is not None
+    assert client.get("/budgets/insights").json()["total_spent"] == 1005
+    assert _spooled() == []
+
+
+def test_job_is_running_while_it_classifies(client):
+    release = threading.Event()
+    seen = []
+
+    def classify(descriptions):
+        seen.append(client.get(f"/budgets/jobs/{job_id}").json()["status"])
+        release.wait(10)
+        return ["Misc"] * len(descriptions)
+
+    job_id = submit_csv_job(io.BytesIO(STATEMENT.encode()), "s.csv", classify)
+    try:
+        for _ in range(200):
+            if seen:
+                break
+            time.sleep(0.02)
+    finally:
+        release.set()
+    assert seen == ["running"]
+    assert _wait_for_job(client, job_id)["status"] == "completed"
+
+
+def test_rejected_file_fails_the_job(client):
+    queued = client.post("/budgets/upload-csv", files={"file": ("s.csv", b"name,value\nx,1\n")})
+    job = _wait_for_job(client, queued.json()["job_id"])
+    assert job["status"] == "failed"
+    assert "description" in job["error"]
+    assert _spooled() == []
+    # A failed file is not recorded, so it can be fixed up and sent again
+    assert client.post("/budgets/upload-csv?wait=true", files={"file": ("s.csv", b"name,value\nx,1\n")}
+                       ).status_code == 400
+
+
+def test_duplicate_file_is_refused_before_queueing(client, upload):
+    upload(STATEMENT)
+    response = client.post("/budgets/upload-csv", files={"file": ("s.csv", STATEMENT.encode())})
+    assert response.status_code == 409
+    assert _spooled() == []
+
+
+def test_full_queue_is_refused(client, monkeypatch):
+    slots = threading.BoundedSemaphore(1)
+    slots.acquire()
+    monkeypatch.setattr(jobs, "_slots", slots)
+    with pytest.raises(JobQueueFull):
+        submit_csv_job(io.BytesIO(STATEMENT.encode()), "s.csv", lambda d: ["Misc"] * len(d))
+    assert client.post("/budgets/upload-csv", files={"file": ("s.csv", STATEMENT.encode())}).status_code == 429
+
+
+def test_unfinished_jobs_of_dead_workers_are_marked_interrupted(db):
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    now = datetime.utcnow()
+    for job_id, status, pid in [
+        ("ours", "running", os.getpid()),
+        ("orphan", "queued", exited.pid),
+        ("sibling", "running", os.getppid()),
+        ("done", "completed", exited.pid),
+    ]:
+        db.add(IngestJob(id=job_id, status=status, worker_pid=pid, created_at=now))
+    db.commit()
+
+    assert mark_interrupted_jobs() == 2
+    db.expire_all()
+    statuses = {job.id: job.status for job in db.query(IngestJob)}
+    assert statuses == {"ours": "interrupted", "orphan": "interrupted", "sibling": "running", "done": "completed"}
+    assert db.get(IngestJob, "orphan").error.startswith("Server restarted")
+    assert db.get(IngestJob, "orphan").finished_at is not None
@@ -0,0 +1,78 @@
+# backend/tests/test_merchant_rules.py
+import json
+
+import pytest
+
+from backend.app.models import category_model
+from backend.app.models.merchant_rules import MerchantRules, load_rules
+from backend.app.models.prediction_cache import PredictionCache
+
+RULES = {
+    "Transport": ["uber", "metro"],
+    "Entertainment": ["prime video"],
+    "Shopping": ["amazon", "prime"],
+}
+
+
+def test_keywords_match_whole_words_longest_first():
+    rules = MerchantRules(RULES)
+    assert rules.match("UBER *TRIP 1234") == "Transport"
+    assert rules.match("Prime   Video renewal") == "Entertainment"
+    assert rules.match("prime membership") == "Shopping"
+    # The earliest keyword in the description wins
+    assert rules.match("amazon prime video") == "Shopping"
+    assert rules.match("ubereats order") is None
+    assert rules.match("") is None
+    assert len(rules) == 5
+
+
+def test_rules_table_is_optional(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(RULES))
+    assert load_rules(str(path)).match("metro card") == "Transport"
+    assert len(load_rules("")) == 0
+    assert len(load_rules(str(tmp_path / "missing.json"))) == 0
+
+
+@pytest.fixture
+def tiers(monkeypatch):
+    """
+    Rules, an empty cache and a model call log in place of the module's own.
+    """
+    monkeypatch.setattr(category_model, "merchant_rules", MerchantRules(RULES))
+    monkeypatch.setattr(category_model, "prediction_cache", PredictionCache())
+    monkeypatch.setattr(category_model, "tier_counts", {"rules": 0, "cache": 0, "model": 0})
+    calls = []
+    predict = category_model.predict_label_ids
+
+    def counting_predict(descriptions, **kwargs):
+        calls.append(list(descriptions))
+        return predict(descriptions, **kwargs)
+
+    monkeypatch.setattr(category_model, "predict_label_ids", counting_predict)
+    return calls
+
+
+def test_rules_answer_before_cache_and_model(tiers):
+    version = category_model.load_classifier().version
+    category_model.prediction_cache.put_many(version, [("uber trip", "Cached"), ("rent", "Cached")])
+
+    results = category_model.classify_transactions(["uber trip", "rent", "netflix", "Metro card"])
+    assert [r["predicted_category"] for r in results] == ["Transport", "Cached", "Shopping", "Transport"]
+    assert [r["description"] for r in results] == ["uber trip", "rent", "netflix", "Metro card"]
+    # A rule hit never consults the model; only the uncached, unmatched row does
+    assert tiers == [["netflix"]]
+    assert category_model.tier_counts == {"rules": 2, "cache": 1, "model": 1}
+
+
+def test_all_rule_hits_skip_loading_the_model(tiers, monkeypatch):
+    monkeypatch.setattr(category_model, "load_classifier", lambda: pytest.fail("model was loaded"))
+    results = category_model.classify_transactions(["UBER TRIP", "amazon"])
+    assert [r["predicted_category"] for r in results] == ["Transport", "Shopping"]
+
+
+def test_rules_can_be_bypassed(tiers):
+    results = category_model.classify_transactions(["uber trip"], use_rules=False)
+    assert results[0]["predicted_category"] == "Bills"
+    assert tiers == [["uber trip"]]
+    assert category_model.tier_counts["rules"] == 0
@@ -0,0 +1,148 @@
+# backend/tests/test_migrations.py
+"""
+init_db() against databases created by earlier versions of the app: the original
+two-table schema, and the last schema before tenant_id.
+"""
+
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.db import RETIRED_INDEXES, init_db, make_engine
+from backend.app.merchant_tokens import bootstrap_tokens, top_tokens
+from backend.app.spend_summary import bootstrap_summary, category_totals, check_consistency
+
+BASELINE_SCHEMA = """
+CREATE TABLE transactions (
+    id INTEGER NOT NULL, description VARCHAR NOT NULL, category VARCHAR, amount FLOAT NOT NULL, date DATE,
+    PRIMARY KEY (id)
+);
+CREATE INDEX ix_transactions_id ON transactions (id);
+CREATE TABLE budgets (
+    id INTEGER NOT NULL, category VARCHAR NOT NULL, "limit" FLOAT NOT NULL, PRIMARY KEY (id)
+);
+CREATE UNIQUE INDEX ix_budgets_category ON budgets (category);
+CREATE INDEX ix_budgets_id ON budgets (id);
+INSERT INTO transactions VALUES (1, 'starbucks coffee', 'Food', 5.0, '2026-09-01');
+INSERT INTO transactions VALUES (2, 'uber ride', 'Transport', 12.0, '2026-09-02');
+INSERT INTO transactions VALUES (3, 'rent', 'Bills', 1000.0, NULL);
+INSERT INTO budgets VALUES (1, 'Food', 100.0);
+"""
+
+PRE_TENANCY_SCHEMA = """
+CREATE TABLE data_version (id INTEGER NOT NULL, version INTEGER NOT NULL, PRIMARY KEY (id));
+CREATE TABLE budgets (id INTEGER NOT NULL, category VARCHAR NOT NULL, "limit" FLOAT NOT NULL, PRIMARY KEY (id));
+CREATE UNIQUE INDEX ix_budgets_category ON budgets (category);
+CREATE INDEX ix_budgets_id ON budgets (id);
+CREATE TABLE transactions (
+    id INTEGER NOT NULL, description VARCHAR NOT NULL, category VARCHAR, amount FLOAT NOT NULL, date DATE,
+    fingerprint VARCHAR, PRIMARY KEY (id)
+);
+CREATE UNIQUE INDEX ux_transactions_fingerprint ON transactions (fingerprint);
+CREATE INDEX ix_transactions_category_date_id ON transactions (category, date, id);
+CREATE INDEX ix_transactions_date_id ON transactions (date, id);
+CREATE INDEX ix_transactions_id ON transactions (id);
+CREATE INDEX ix_transactions_date_category ON transactions (date, category);
+CREATE TABLE uploaded_files (
+    sha256 VARCHAR NOT NULL, filename VARCHAR, rows_saved INTEGER NOT NULL, rows_duplicate INTEGER NOT NULL,
+    created_at DATETIME NOT NULL, PRIMARY KEY (sha256)
+);
+CREATE TABLE merchant_tokens (token VARCHAR NOT NULL, count INTEGER NOT NULL, PRIMARY KEY (token));
+CREATE INDEX ix_merchant_tokens_count ON merchant_tokens (count);
+CREATE TABLE spend_summary (
+    year INTEGER NOT NULL, month INTEGER NOT NULL, category VARCHAR NOT NULL, total FLOAT NOT NULL,
+    count INTEGER NOT NULL, PRIMARY KEY (year, month, category)
+);
+CREATE TABLE ingest_jobs (
+    id VARCHAR NOT NULL, status VARCHAR NOT NULL, filename VARCHAR, rows_total INTEGER NOT NULL,
+    rows_done INTEGER NOT NULL, rows_failed INTEGER NOT NULL, rows_duplicate INTEGER, rows_per_sec FLOAT,
+    errors TEXT, error TEXT, worker_pid INTEGER, created_at DATETIME NOT NULL, started_at DATETIME,
+    finished_at DATETIME, PRIMARY KEY (id)
+);
+CREATE INDEX ix_ingest_jobs_id ON ingest_jobs (id);
+INSERT INTO data_version VALUES (1, 7);
+INSERT INTO budgets VALUES (1, 'Food', 100.0), (2, 'Bills', 900.0);
+INSERT INTO transactions VALUES (1, 'starbucks coffee', 'Food', 5.0, '2026-09-01', 'fp1');
+INSERT INTO transactions VALUES (2, 'starbucks latte', 'Food', 6.0, '2026-09-03', 'fp2');
+INSERT INTO transactions VALUES (3, 'rent', 'Bills', 1000.0, '2026-09-01', 'fp3');
+INSERT INTO uploaded_files VALUES ('abc123', 's.csv', 3, 0, '2026-09-05 10:00:00');
+INSERT INTO merchant_tokens VALUES ('starbucks', 2), ('coffee', 1), ('latte', 1), ('rent', 1);
+INSERT INTO spend_summary VALUES (2026, 9, 'Food', 11.0, 2), (2026, 9, 'Bills', 1000.0, 1);
+INSERT INTO ingest_jobs VALUES ('job1', 'completed', 's.csv', 3, 3, 0, 0, 100.0, '[]', NULL, NULL,
+    '2026-09-05 10:00:00', NULL, NULL);
+"""
+
+
+def _legacy_database(tmp_path, script):
+    path = tmp_path / "legacy.db"
+    engine = make_engine(f"sqlite:///{path}")
+    raw = engine.raw_connection()
+    try:
+        raw.executescript(script)
+        raw.commit()
+    finally:
+        raw.close()
+    return engine
+
+
+def _rows(engine, sql):
+    with engine.connect() as conn:
+        return conn.execute(text(sql)).all()
+
+
+def _index_names(engine):
+    return {name for table in inspect(engine).get_table_names() for name in
+            (index["name"] for index in inspect(engine).get_indexes(table))}
+
+
+def test_baseline_database_is_upgraded(tmp_path):
+    engine = _legacy_database(tmp_path, BASELINE_SCHEMA)
+    init_db(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        assert bootstrap_summary(db) and bootstrap_tokens(db)
+        assert _rows(engine, "SELECT id, tenant_id, amount FROM transactions ORDER BY id") == [
+            (1, "default", 5.0), (2, "default", 12.0), (3, "default", 1000.0),
+        ]
+        assert _rows(engine, "SELECT tenant_id, category, \"limit\" FROM budgets") == [("default", "Food", 100.0)]
+        assert dict(category_totals(db)) == {"Food": 5.0, "Transport": 12.0, "Bills": 1000.0}
+        assert check_consistency(db)["consistent"]
+        assert not _index_names(engine) & set(RETIRED_INDEXES)
+        # Budget names are now unique per tenant only
+        db.execute(text("INSERT INTO budgets (tenant_id, category, \"limit\") VALUES ('acme', 'Food', 1)"))
+        db.commit()
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def test_pre_tenancy_database_is_upgraded(tmp_path):
+    engine = _legacy_database(tmp_path, PRE_TENANCY_SCHEMA)
+    init_db(engine)
+    # Running it again on the upgraded database changes nothing
+    init_db(engine)
+    inspector = inspect(engine)
+    for table in ("spend_summary", "merchant_tokens", "uploaded_files", "data_version"):
+        assert "tenant_id" in inspector.get_pk_constraint(table)["constrained_columns"], table
+    assert not [t for t in inspector.get_table_names() if t.endswith("__old")]
+    assert not _index_names(engine) & set(RETIRED_INDEXES)
+    assert {"ux_transactions_tenant_fingerprint", "ux_budgets_tenant_category"} <= _index_names(engine)
+
+    assert _rows(engine, "SELECT tenant_id, COUNT(*) FROM transactions GROUP BY tenant_id") == [("default", 3)]
+    assert _rows(engine, "SELECT tenant_id, category FROM budgets ORDER BY id") == [
+        ("default", "Food"), ("default", "Bills"),
+    ]
+    assert _rows(engine, "SELECT tenant_id, sha256 FROM uploaded_files") == [("default", "abc123")]
+    assert _rows(engine, "SELECT tenant_id, version FROM data_version") == [("default", 7)]
+    assert _rows(engine, "SELECT tenant_id, id FROM ingest_jobs") == [("default", "job1")]
+
+    db = sessionmaker(bind=engine)()
+    try:
+        # Existing aggregates are kept, not rebuilt, and read back under the default tenant
+        assert not bootstrap_summary(db) and not bootstrap_tokens(db)
+        assert dict(category_totals(db)) == {"Food": 11.0, "Bills": 1000.0}
+        assert top_tokens(db, limit=1) == [("starbucks", 2)]
+        assert check_consistency(db)["consistent"]
+        assert category_totals(db, tenant_id="acme") == []
+    finally:
+        db.close()
+        engine.dispose()
@@ -0,0 +1,60 @@
+# backend/tests/test_prediction_cache.py
+from backend.app.models import category_model
+from backend.app.models.prediction_cache import PredictionCache, normalize_description
+
+
+def test_normalized_forms_share_an_entry():
+    assert normalize_description("  UBER   Trip\t") == normalize_description("uber trip") == "uber trip"
+
+
+def test_lru_evicts_least_recently_used():
+    cache = PredictionCache(max_size=2)
+    cache.put_many("v1", [("a", "Food"), ("b", "Bills")])
+    assert cache.get_many("v1", ["a"]) == {"a": "Food"}
+    cache.put_many("v1", [("c", "Travel")])
+    assert cache.get_many("v1", ["a", "b", "c"]) == {"a": "Food", "c": "Travel"}
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["misses"], stats["memory_entries"]) == (3, 1, 2)
+
+
+def test_disk_tier_survives_a_restart_and_refills_memory(tmp_path):
+    path = str(tmp_path / "cache" / "predictions.db")
+    PredictionCache(disk_path=path).put_many("v1", [("netflix", "Shopping")])
+
+    restarted = PredictionCache(disk_path=path)
+    assert restarted.get_many("v1", ["netflix", "netflix", "rent"]) == {"netflix": "Shopping"}
+    assert restarted.get_many("v1", ["netflix"]) == {"netflix": "Shopping"}
+    stats = restarted.stats()
+    assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_predictions_are_per_model_version(tmp_path):
+    cache = PredictionCache(disk_path=str(tmp_path / "predictions.db"))
+    cache.put_many("v1", [("rent", "Bills")])
+    assert cache.get_many("v2", ["rent"]) == {}
+
+    cache.put_many("v2", [("rent", "Housing")])
+    cache.invalidate(keep_version="v2")
+    assert cache.get_many("v1", ["rent"]) == {}
+    assert cache.get_many("v2", ["rent"]) == {"rent": "Housing"}
+    cache.invalidate()
+    assert PredictionCache(disk_path=str(tmp_path / "predictions.db")).get_many("v2", ["rent"]) == {}
+
+
+def test_only_distinct_misses_reach_the_model(monkeypatch):
+    monkeypatch.setattr(category_model, "prediction_cache", PredictionCache())
+    calls = []
+    predict = category_model.predict_label_ids
+
+    def counting_predict(descriptions, **kwargs):
+        calls.append(list(descriptions))
+        return predict(descriptions, **kwargs)
+
+    monkeypatch.setattr(category_model, "predict_label_ids", counting_predict)
+    first = category_model.classify_locally(["Uber ride", "uber  RIDE", "rent"])
+    assert calls == [["Uber ride", "rent"]]
+    assert first[0]["predicted_category"] == first[1]["predicted_category"]
+
+    again = category_model.classify_locally(["UBER RIDE", "rent", "netflix"])
+    assert calls[1:] == [["netflix"]]
+    assert [r["predicted_category"] for r in again[:2]] == [first[0]["predicted_category"], first[2]["predicted_category"]]
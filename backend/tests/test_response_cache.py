@@ -0,0 +1,99 @@
+# backend/tests/test_response_cache.py
+import pytest
+
+from backend.app import analytics_engine, response_cache
+from backend.app.data_version import read_data_version
+
+STATEMENT = "description,amount,date\nstarbucks coffee,5,2026-10-01\nrent,1000,2026-10-01\n"
+READS = ["/budgets/view", "/budgets/compute_spend", "/budgets/insights", "/budgets/analytics"]
+
+
+@pytest.mark.parametrize("path", READS)
+def test_matching_if_none_match_gets_304(client, upload, path):
+    upload(STATEMENT)
+    first = client.get(path)
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"] == "no-cache"
+
+    again = client.get(path, headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["ETag"] == first.headers["ETag"]
+    # Weak and listed validators match too
+    listed = f'"other", W/{first.headers["ETag"]}'
+    assert client.get(path, headers={"If-None-Match": listed}).status_code == 304
+
+
+def test_query_string_is_part_of_the_etag(client, upload):
+    upload(STATEMENT)
+    etag = client.get("/budgets/insights").headers["ETag"]
+    filtered = client.get("/budgets/insights?category=Bills", headers={"If-None-Match": etag})
+    assert filtered.status_code == 200
+    assert filtered.headers["ETag"] != etag
+
+
+@pytest.mark.parametrize("write", [
+    lambda client, upload: upload("description,amount,date\nnetflix,15,2026-10-03\n"),
+    lambda client, upload: client.post("/budgets/", json={"category": "Bills", "limit": 900}),
+    lambda client, upload: client.put("/budgets/bulk", json=[{"category": "Food", "limit": 10}]),
+    lambda client, upload: client.delete("/budgets/clear-limits"),
+    lambda client, upload: client.delete("/budgets/transactions/clear"),
+])
+def test_write_bumps_version_and_invalidates_etag(client, upload, db, write):
+    upload(STATEMENT)
+    client.post("/budgets/bulk", json=[{"category": "Shop", "limit": 100}])
+    before_version = read_data_version(db)
+    first = client.get("/budgets/compute_spend")
+    etag = first.headers["ETag"]
+
+    write(client, upload)
+    db.expire_all()
+    assert read_data_version(db) > before_version
+
+    after = client.get("/budgets/compute_spend", headers={"If-None-Match": etag})
+    assert after.status_code == 200
+    assert after.headers["ETag"] != etag
+
+
+def test_cached_body_matches_a_fresh_computation(client, upload):
+    upload(STATEMENT)
+    cached = client.get("/budgets/insights")
+    assert client.get("/budgets/insights").content == cached.content
+    upload("description,amount,date\nnetflix,15,2026-10-03\n")
+    assert client.get("/budgets/insights").json()["total_spent"] == 1020
+
+
+def test_tenants_have_separate_versions_and_etags(client, upload, db):
+    upload(STATEMENT, tenant="alice")
+    alice = client.get("/budgets/insights", headers={"X-Tenant-ID": "alice"})
+    bob = client.get("/budgets/insights", headers={"X-Tenant-ID": "bob"})
+    assert alice.headers["ETag"] != bob.headers["ETag"]
+    assert bob.json()["total_spent"] == 0
+
+    upload(STATEMENT, tenant="bob")
+    db.expire_all()
+    assert read_data_version(db, "bob") > 0
+    # Bob's write leaves Alice's version, and so her ETag, alone
+    assert client.get("/budgets/insights", headers={"X-Tenant-ID": "alice", "If-None-Match": alice.headers["ETag"]}
+                      ).status_code == 304
+    assert client.get("/budgets/insights", headers={"X-Tenant-ID": "bob", "If-None-Match": bob.headers["ETag"]}
+                      ).status_code == 200
+
+
+def test_throttled_snapshot_is_not_cached_under_the_new_version(client, upload, monkeypatch):
+    upload(STATEMENT)
+    first = client.get("/budgets/trends")
+    monkeypatch.setattr(analytics_engine, "ANALYTICS_REFRESH_SECONDS", 3600)
+    upload("description,amount,date\nnetflix,15,2026-10-03\n")
+
+    # Inside the throttle window the old snapshot answers, tagged with its own version
+    stale = client.get("/budgets/trends")
+    assert stale.json()["snapshot_rows"] == 2
+    assert stale.headers["ETag"] == first.headers["ETag"]
+    assert len(response_cache._bodies) == 1
+
+    monkeypatch.setattr(analytics_engine, "ANALYTICS_REFRESH_SECONDS", 0)
+    fresh = client.get("/budgets/trends", headers={"If-None-Match": stale.headers["ETag"]})
+    assert fresh.status_code == 200
+    assert fresh.json()["snapshot_rows"] == 3
+    assert fresh.headers["ETag"] != first.headers["ETag"]
@@ -0,0 +1,133 @@
+# backend/tests/test_tenancy.py
+import time
+
+import pytest
+
+from backend.app.tenancy import validate_tenant
+
+STATEMENT = (
+    "description,amount,date\n"
+    "starbucks coffee,5,2026-10-01\n"
+    "uber ride,12,2026-10-02\n"
+    "rent payment,1000,2026-10-01\n"
+)
+ALICE = {"X-Tenant-ID": "alice"}
+BOB = {"X-Tenant-ID": "bob"}
+
+
+def _wait_for_job(client, job_id, headers):
+    for _ in range(200):
+        job = client.get(f"/budgets/jobs/{job_id}", headers=headers).json()
+        if job["status"] not in ("queued", "running"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_same_statement_uploads_once_per_tenant(upload):
+    assert upload(STATEMENT, tenant="alice").json()["rows_saved"] == 3
+    # Another tenant's copy of the same file is new to them, file- and row-wise
+    assert upload(STATEMENT, tenant="bob").json()["rows_saved"] == 3
+    assert upload(STATEMENT, tenant="alice").status_code == 409
+    overlap = upload(STATEMENT + "netflix,15,2026-10-03\n", tenant="bob").json()
+    assert (overlap["rows_saved"], overlap["rows_duplicate"]) == (1, 3)
+
+
+def test_reads_only_see_own_tenant(client, upload):
+    upload(STATEMENT, tenant="alice")
+    upload("description,amount,date\nnetflix,15,2026-10-03\n", tenant="bob")
+
+    alice = client.get("/budgets/transactions", headers=ALICE).json()["items"]
+    bob = client.get("/budgets/transactions", headers=BOB).json()["items"]
+    assert len(alice) == 3
+    assert [t["description"] for t in bob] == ["netflix"]
+
+    assert client.get("/budgets/insights", headers=ALICE).json()["total_spent"] == 1017
+    assert client.get("/budgets/insights", headers=BOB).json()["total_spent"] == 15
+    bob_merchants = client.get("/budgets/analytics", headers=BOB).json()["top_merchants"]
+    assert [m["merchant"] for m in bob_merchants] == ["netflix"]
+    assert client.get("/budgets/trends", headers=BOB).json()["snapshot_rows"] == 1
+    assert client.get("/budgets/trends", headers=ALICE).json()["snapshot_rows"] == 3
+    forecast = client.get("/budgets/forecast?as_of=2026-10-05", headers=BOB).json()["forecast"]
+    assert sum(row["spent_to_date"] for row in forecast) == 15
+
+    report = client.get("/budgets/download-report?report=detailed", headers=BOB).text
+    assert "netflix" in report and "starbucks" not in report
+    # No header is the default tenant, which has nothing
+    assert client.get("/budgets/transactions").json()["items"] == []
+
+
+def test_budget_writes_stay_in_tenant(client):
+    client.post("/budgets/bulk", json=[{"category": "Food", "limit": 100}], headers=ALICE)
+    client.post("/budgets/bulk", json=[{"category": "Food", "limit": 300}, {"category": "Bills", "limit": 50}], headers=BOB)
+    assert client.get("/budgets/view", headers=ALICE).json() == [{"category": "Food", "budget_limit": 100.0}]
+
+    client.put("/budgets/bulk", json=[{"category": "Travel", "limit": 20}], headers=ALICE)
+    client.delete("/budgets/bulk?category=Bills", headers=ALICE)
+    assert client.get("/budgets/view", headers=ALICE).json() == [{"category": "Travel", "budget_limit": 20.0}]
+    assert sorted(b["category"] for b in client.get("/budgets/view", headers=BOB).json()) == ["Bills", "Food"]
+
+    client.delete("/budgets/clear-limits", headers=ALICE)
+    assert client.get("/budgets/view", headers=ALICE).json() == []
+    assert len(client.get("/budgets/view", headers=BOB).json()) == 2
+
+
+def test_clear_transactions_leaves_other_tenant(client, upload):
+    upload(STATEMENT, tenant="alice")
+    upload(STATEMENT, tenant="bob")
+    client.get("/budgets/trends", headers=ALICE)
+    client.delete("/budgets/transactions/clear", headers=ALICE)
+
+    assert client.get("/budgets/insights", headers=ALICE).json()["total_spent"] == 0
+    assert client.get("/budgets/trends", headers=ALICE).json()["snapshot_rows"] == 0
+    assert client.get("/budgets/insights", headers=BOB).json()["total_spent"] == 1017
+    # Alice's uploaded-file record went with her data; Bob's did not
+    assert client.post("/budgets/upload-csv?wait=true", files={"file": ("s.csv", STATEMENT.encode())},
+                       headers=ALICE).status_code == 200
+    assert client.post("/budgets/upload-csv?wait=true", files={"file": ("s.csv", STATEMENT.encode())},
+                       headers=BOB).status_code == 409
+
+
+def test_jobs_are_private(client):
+    queued = client.post("/budgets/upload-csv", files={"file": ("s.csv", STATEMENT.encode())}, headers=ALICE)
+    assert queued.status_code == 202
+    job_id = queued.json()["job_id"]
+    assert _wait_for_job(client, job_id, ALICE)["status"] == "completed"
+    assert client.get(f"/budgets/jobs/{job_id}", headers=BOB).status_code == 404
+    assert client.get(f"/budgets/jobs/{job_id}").status_code == 404
+
+
+def test_etags_are_per_tenant(client, upload):
+    upload(STATEMENT, tenant="alice")
+    first = client.get("/budgets/insights", headers=ALICE)
+    etag = first.headers["ETag"]
+    assert "X-Tenant-ID" in first.headers["Vary"]
+
+    # Bob presenting Alice's ETag gets his own data, not a 304
+    bob = client.get("/budgets/insights", headers={**BOB, "If-None-Match": etag})
+    assert bob.status_code == 200 and bob.json()["total_spent"] == 0
+    assert bob.headers["ETag"] != etag
+
+    # A write by Bob does not invalidate Alice's cached view
+    upload(STATEMENT, tenant="bob")
+    assert client.get("/budgets/insights", headers={**ALICE, "If-None-Match": etag}).status_code == 304
+
+
+def test_budget_rename_is_matched_afresh(client, upload):
+    upload(STATEMENT, tenant="alice")
+
+    def spend_keys():
+        return {row["category"] for row in client.get("/budgets/compute_spend", headers=ALICE).json()["summary"]}
+
+    client.put("/budgets/bulk", json=[{"category": "Shop", "limit": 100}], headers=ALICE)
+    assert spend_keys() == {"Shop", "Bills"}
+    # Renaming the budget must not keep folding Shopping into the old name
+    client.put("/budgets/bulk", json=[{"category": "Bill", "limit": 900}], headers=ALICE)
+    assert spend_keys() == {"Shopping", "Bill"}
+
+
+@pytest.mark.parametrize("tenant", ["../etc", ".hidden", "a/b", "x" * 65, "spaces here"])
+def test_invalid_tenant_is_rejected(client, tenant):
+    assert client.get("/budgets/view", headers={"X-Tenant-ID": tenant}).status_code == 400
+    with pytest.raises(ValueError):
+        validate_tenant(tenant)
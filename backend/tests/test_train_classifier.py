@@ -0,0 +1,48 @@
+# backend/tests/test_train_classifier.py
+import json
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("datasets")
+pytest.importorskip("transformers")
+pytest.importorskip("sklearn")
+
+from backend.app import train_classifier  # noqa: E402
+
+
+def _tokenizer(texts, **kwargs):
+    return {"input_ids": [[len(text)] for text in texts]}
+
+
+@pytest.fixture
+def labeled():
+    return pd.DataFrame({"description": [f"merchant {i}" for i in range(20)], "label": [i % 2 for i in range(20)]})
+
+
+def test_complete_cache_entry_is_reused(tmp_path, labeled):
+    cache_dir = str(tmp_path / "entry")
+    train_ds, test_ds = train_classifier.tokenized_datasets(labeled, _tokenizer, "fast", cache_dir, "key")
+    with open(os.path.join(cache_dir, train_classifier.CACHE_MANIFEST)) as fh:
+        assert json.load(fh) == {"key": "key", "train_rows": len(train_ds), "test_rows": len(test_ds)}
+    cached = train_classifier._load_cached(cache_dir, "key")
+    assert [len(ds) for ds in cached] == [len(train_ds), len(test_ds)]
+    assert [p for p in os.listdir(tmp_path) if ".tmp-" in p] == []
+
+
+@pytest.mark.parametrize("damage", ["no_manifest", "other_key", "missing_split"])
+def test_partial_or_foreign_cache_entry_is_rebuilt(tmp_path, labeled, damage):
+    cache_dir = str(tmp_path / "entry")
+    train_classifier.tokenized_datasets(labeled, _tokenizer, "fast", cache_dir, "key")
+    if damage == "no_manifest":
+        os.remove(os.path.join(cache_dir, train_classifier.CACHE_MANIFEST))
+    elif damage == "missing_split":
+        import shutil
+        shutil.rmtree(os.path.join(cache_dir, "test"))
+    key = "other" if damage == "other_key" else "key"
+
+    assert train_classifier._load_cached(cache_dir, key) is None
+    assert not os.path.exists(cache_dir)
+    train_classifier.tokenized_datasets(labeled, _tokenizer, "fast", cache_dir, key)
+    assert train_classifier._load_cached(cache_dir, key) is not None
@@ -0,0 +1,90 @@
+# backend/tests/test_transactions_listing.py
+from datetime import date
+
+import pytest
+
+from backend.app.models.transaction_store import bulk_insert_transactions
+
+
+def _seed(db):
+    # Eight purchases on one day so page boundaries fall between equal dates
+    rows = [{"description": f"same day {i}", "amount": 1.0 + i, "date": date(2026, 10, 5), "category": "Food"}
+            for i in range(8)]
+    rows += [{"description": f"earlier {i}", "amount": 2.0, "date": date(2026, 10, 1), "category": "Bills"}
+             for i in range(3)]
+    rows.append({"description": "later", "amount": 3.0, "date": date(2026, 10, 9), "category": "Food"})
+    rows.append({"description": "undated", "amount": 4.0, "date": None, "category": "Food"})
+    bulk_insert_transactions(db, rows, commit=True)
+
+
+def _all_pages(client, limit, **params):
+    pages, cursor = [], None
+    while True:
+        query = {"limit": limit, **params, **({"cursor": cursor} if cursor else {})}
+        body = client.get("/budgets/transactions", params=query).json()
+        pages.append(body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def _all_pages_from(client, cursor, limit):
+    items = []
+    while cursor:
+        body = client.get("/budgets/transactions", params={"limit": limit, "cursor": cursor}).json()
+        items += body["items"]
+        cursor = body["next_cursor"]
+    return items
+
+
+@pytest.mark.parametrize("limit", [1, 3, 5, 12, 100])
+def test_pages_are_contiguous_across_equal_dates(client, db, limit):
+    _seed(db)
+    pages = _all_pages(client, limit)
+    items = [item for page in pages for item in page]
+    ids = [item["id"] for item in items]
+
+    assert len(ids) == len(set(ids)) == 12  # no repeats, no gaps; the undated row is not listed
+    assert [(item["date"], item["id"]) for item in items] == sorted(
+        ((item["date"], item["id"]) for item in items), reverse=True
+    )
+    assert all(len(page) == limit for page in pages[:-1])
+
+
+def test_cursor_pagination_respects_filters(client, db):
+    _seed(db)
+    pages = _all_pages(client, 2, category="Food", date_to="2026-10-05")
+    items = [item for page in pages for item in page]
+    assert len(items) == 8
+    assert {item["category"] for item in items} == {"Food"}
+
+
+def test_cursor_continues_after_new_rows_arrive(client, db):
+    _seed(db)
+    first = client.get("/budgets/transactions", params={"limit": 4}).json()
+    bulk_insert_transactions(db, [{"description": "new", "amount": 1.0, "date": date(2026, 10, 9), "category": "Food"}],
+                             commit=True)
+    rest = _all_pages_from(client, first["next_cursor"], 4)
+    ids = [item["id"] for item in first["items"]] + [item["id"] for item in rest]
+    # Rows newer than the cursor do not shift later pages
+    assert len(ids) == len(set(ids)) == 12
+
+
+@pytest.mark.parametrize("cursor", [
+    "garbage",
+    "_",
+    "2026-10-05",
+    "2026-10-05_",
+    "2026-13-01_5",
+    "2026-10-05_abc",
+    "2026-10-05_-1",
+    "2026-10-05_1e3",
+    "2026-10-05_ 5",
+    "2026-10-05_99999999999999999999999",
+    "2026-10-05_5; DROP TABLE transactions",
+])
+def test_invalid_cursor_is_a_client_error(client, db, cursor):
+    _seed(db)
+    response = client.get("/budgets/transactions", params={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
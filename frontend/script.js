@@ -11,8 +11,34 @@ async function uploadCSV() {
     body: formData,
   });
   const data = await res.json();
-  document.getElementById("uploadStatus").textContent =
-    data.message || JSON.stringify(data);
+  const status = document.getElementById("uploadStatus");
+  status.textContent = data.message || data.detail || JSON.stringify(data);
+  if (data.job_id) pollUploadJob(data.job_id, status);
+}
+
+// Uploads run as background jobs; poll until the job finishes
+async function pollUploadJob(jobId, status) {
+  while (true) {
+    await new Promise((resolve) => setTimeout(resolve, 1000));
+    const res = await fetch(`${API_BASE}/jobs/${jobId}`);
+    if (!res.ok) {
+      status.textContent = "Lost track of upload job.";
+      return;
+    }
+    const job = await res.json();
+    if (job.status === "queued" || job.status === "running") {
+      status.textContent = `Processing... ${job.rows_done} rows saved, ${job.rows_duplicate} duplicates, ${job.rows_failed} skipped`;
+      continue;
+    }
+    if (job.status === "completed") {
+      status.textContent = `${job.rows_done} transactions uploaded, classified and saved.` +
+        (job.rows_duplicate ? ` ${job.rows_duplicate} duplicates of earlier uploads skipped.` : "") +
+        (job.rows_failed ? ` ${job.rows_failed} rows skipped due to errors.` : "");
+    } else {
+      status.textContent = `Upload ${job.status}: ${job.error || ""}`;
+    }
+    return;
+  }
 }
 
 // === Clear Transactions ===